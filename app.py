@@ -1,282 +1,163 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import numpy as np
-from datetime import datetime, timedelta
-import math
+import pandas as pd
 import calendar
+import hashlib
+import os
+import time
+from datetime import datetime
 
-# Configuración de la página
-st.set_page_config(
-    page_title="Planificador Financiero 50-30-20",
-    page_icon="💰",
-    layout="wide",
-    initial_sidebar_state="expanded"
+from financeflow import (
+    FinancialPlanner,
+    InvestmentAdvisor,
+    hourly_rate,
+    purchase_plan,
+    DEFAULT_ANNUAL_RATE,
+    DEFAULT_MAX_LOAN_MONTHS,
+    target_date,
+)
+from financeflow.amortization import compare_offers, early_payoff
+from financeflow.store import MIN_SECRET_LENGTH, account_key, default_store
+from financeflow.charts import emergency_figure, forecast_figure, progress_figure, projection_figure, scenario_figure, schedule_figure
+from financeflow.montecarlo import project_option, simulable_options
+from financeflow.profiling import PROFILER, profiled
+from financeflow.scenarios import evaluate_scenarios, scenario_grid, scenario_inputs
+from financeflow.emergency import (
+    INCOME_SHOCK_RATE, JOB_LOSS_RATE, MEDICAL_RATE, UNEMPLOYMENT_MONTHS, simulate_emergency_fund
 )
+from financeflow.forecast import (
+    MINIMUM_WAGE, MINIMUM_WAGE_YEAR, annual_totals, first_high_risk_month, forecast_bands, forecast_budget
+)
+from financeflow.ledger import cash_flow_ledger, ledger_frame
+from financeflow.scheduler import priority_labels, schedule_plans
+from financeflow.view import PlannerView
 
-# CSS personalizado
-st.markdown("""
-<style>
-    .main-header {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 2rem;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-        color: white;
-        text-align: center;
-        box-shadow: 0 10px 20px rgba(0,0,0,0.1);
-    }
-    
-    .metric-card {
-        background: white;
-        padding: 1.5rem;
-        border-radius: 10px;
-        box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-        border-left: 5px solid #667eea;
-        margin: 1rem 0;
-        transition: transform 0.3s ease;
-    }
-    
-    .metric-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 10px 25px rgba(0,0,0,0.15);
-    }
-    
-    .warning-card {
-        background: #fff3cd;
-        border: 1px solid #ffeaa7;
-        border-left: 5px solid #fdcb6e;
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 1rem 0;
-    }
-    
-    .success-card {
-        background: #d4edda;
-        border: 1px solid #c3e6cb;
-        border-left: 5px solid #00b894;
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 1rem 0;
-    }
-    
-    .danger-card {
-        background: #f8d7da;
-        border: 1px solid #f5c6cb;
-        border-left: 5px solid #e17055;
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 1rem 0;
-    }
-    
-    .investment-option {
-        background: #f8f9fa;
-        border: 1px solid #dee2e6;
-        border-radius: 8px;
-        padding: 1rem;
-        margin: 0.5rem 0;
-        transition: all 0.3s ease;
-    }
-    
-    .investment-option:hover {
-        background: #e9ecef;
-        border-color: #667eea;
-        transform: scale(1.02);
-    }
-    
-    .sidebar .sidebar-content {
-        background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-    }
-    
-    .stTab > div > div > div > div {
-        padding: 2rem;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Escenarios por proyección Monte Carlo en la interfaz
+MONTE_CARLO_PATHS = 20_000
+# Trayectorias de la simulación del fondo de emergencia
+EMERGENCY_PATHS = 10_000
 
-# Clases para el manejo de datos
-class FinancialPlanner:
-    def __init__(self):
-        self.income = 0
-        self.needs = {}
-        self.wants = {}
-        self.savings_investments = 0
-        self.family_info = {}
-        
-    def calculate_percentages(self):
-        return {
-            'needs_budget': self.income * 0.50,
-            'wants_budget': self.income * 0.30,
-            'savings_budget': self.income * 0.20
-        }
-    
-    def calculate_needs_total(self):
-        return sum(self.needs.values())
-    
-    def calculate_wants_total(self):
-        return sum(self.wants.values())
-    
-    def get_risk_analysis(self):
-        budgets = self.calculate_percentages()
-        needs_total = self.calculate_needs_total()
-        
-        risk_level = "Bajo"
-        risk_color = "#00b894"
-        recommendations = []
-        
-        if needs_total > budgets['needs_budget']:
-            excess = needs_total - budgets['needs_budget']
-            excess_percent = (excess / self.income) * 100
-            
-            if excess_percent > 20:
-                risk_level = "Alto"
-                risk_color = "#e17055"
-                recommendations.extend([
-                    "🚨 Urgente: Reducir gastos básicos o aumentar ingresos",
-                    "📊 Revisar todos los gastos y eliminar los no esenciales",
-                    "💼 Considerar fuentes de ingresos adicionales"
-                ])
-            elif excess_percent > 10:
-                risk_level = "Medio"
-                risk_color = "#fdcb6e"
-                recommendations.extend([
-                    "⚠️ Advertencia: Gastos básicos exceden el presupuesto",
-                    "🔍 Identificar gastos reducibles",
-                    "📈 Planificar aumento de ingresos"
-                ])
-        else:
-            recommendations.extend([
-                "✅ Gastos básicos bajo control",
-                "💡 Considerar optimizar aún más para aumentar ahorros",
-                "🎯 Mantener disciplina financiera"
-            ])
-        
-        return {
-            'level': risk_level,
-            'color': risk_color,
-            'recommendations': recommendations,
-            'needs_excess': max(0, needs_total - budgets['needs_budget'])
-        }
+# Series de la proyección mensual que se pueden graficar
+FORECAST_SERIES = {
+    "Sobrante mensual": 'remaining_income',
+    "Ingreso mensual": 'income',
+    "Gastos básicos": 'needs_total',
+    "Ahorro recomendado": 'savings_budget'
+}
 
-class InvestmentAdvisor:
-    @staticmethod
-    def get_investment_options(amount):
-        options = []
-        
-        if amount >= 50000:  # Monto alto
-            options.extend([
-                {
-                    'name': 'CDT a Largo Plazo',
-                    'risk': 'Bajo',
-                    'return': '8-12%',
-                    'description': 'Certificados de depósito a término con excelente rentabilidad',
-                    'min_amount': 50000,
-                    'liquidity': 'Baja'
-                },
-                {
-                    'name': 'Fondos de Inversión Diversificados',
-                    'risk': 'Medio',
-                    'return': '12-18%',
-                    'description': 'Portafolio diversificado gestionado profesionalmente',
-                    'min_amount': 50000,
-                    'liquidity': 'Media'
-                },
-                {
-                    'name': 'Acciones Blue Chip',
-                    'risk': 'Medio-Alto',
-                    'return': '15-25%',
-                    'description': 'Acciones de empresas establecidas con dividendos',
-                    'min_amount': 100000,
-                    'liquidity': 'Alta'
-                }
-            ])
-        
-        if amount >= 20000:  # Monto medio
-            options.extend([
-                {
-                    'name': 'Fondos Mutuos',
-                    'risk': 'Medio',
-                    'return': '10-15%',
-                    'description': 'Inversión colectiva con diversificación automática',
-                    'min_amount': 20000,
-                    'liquidity': 'Media'
-                },
-                {
-                    'name': 'CDT a Mediano Plazo',
-                    'risk': 'Bajo',
-                    'return': '6-10%',
-                    'description': 'Inversión segura con rentabilidad fija',
-                    'min_amount': 20000,
-                    'liquidity': 'Baja'
-                }
-            ])
-        
-        if amount >= 5000:  # Monto básico
-            options.extend([
-                {
-                    'name': 'Cuenta de Ahorros Premium',
-                    'risk': 'Muy Bajo',
-                    'return': '4-6%',
-                    'description': 'Alta liquidez con mejor rentabilidad que cuentas tradicionales',
-                    'min_amount': 5000,
-                    'liquidity': 'Alta'
-                },
-                {
-                    'name': 'Fondos de Renta Fija',
-                    'risk': 'Bajo',
-                    'return': '6-9%',
-                    'description': 'Inversión conservadora en bonos y títulos de deuda',
-                    'min_amount': 10000,
-                    'liquidity': 'Media'
-                }
-            ])
-        
-        # Opciones para montos pequeños
-        if amount < 20000:
-            options.extend([
-                {
-                    'name': 'Micro-inversiones',
-                    'risk': 'Medio',
-                    'return': '8-15%',
-                    'description': 'Plataformas digitales para pequeños inversionistas',
-                    'min_amount': 1000,
-                    'liquidity': 'Alta'
-                },
-                {
-                    'name': 'Educación Financiera',
-                    'risk': 'Nulo',
-                    'return': 'Invaluable',
-                    'description': 'Inversión en conocimiento para mejores decisiones futuras',
-                    'min_amount': 0,
-                    'liquidity': 'Inmediata'
-                }
-            ])
-        
-        return options
+TAB_LABELS = [
+    "🏠 Necesidades (50%)",
+    "🎯 Deseos (30%)",
+    "💰 Ahorros e Inversiones (20%)",
+    "📊 Análisis Completo",
+    "📈 Plan de Compras"
+]
 
-# Función principal de la aplicación
-def main():
-    # Header principal
-    st.markdown("""
-    <div class="main-header">
-        <h1>💰FinanceFlow-Pro</h1>
-        <h2>Planificador Financiero Inteligente</h1>
-        <p>Basado en el Modelo 50-30-20 | Análisis de Riesgo Personalizado</p>
-    </div>
-    """, unsafe_allow_html=True)
+# Hoja de estilos de la app, leída una vez por proceso
+STYLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'styles.css')
+
+# Recursos de solo lectura compartidos por todas las sesiones del servidor.
+# st.cache_resource guarda una sola copia por proceso sin copiarla en cada
+# sesión; se invalida con <función>.clear() o reiniciando el servidor. La hoja
+# de estilos usa la fecha de modificación como parte de la clave, así que
+# editar el archivo la recarga sin reiniciar.
+@st.cache_resource(show_spinner=False)
+def page_styles(path, modified):
+    with open(path, encoding='utf-8') as styles:
+        return f"<style>\n{styles.read()}</style>"
+
+# Los paneles con @st.fragment se recargan solos cuando cambia uno de sus widgets.
+# Sus dependencias externas llegan como argumentos: cuando cambian (p. ej. el
+# salario en la barra lateral) la app completa se recarga y el fragmento recibe
+# los valores nuevos. Si un fragmento cambia algo que leen paneles fuera de él,
+# lo avisa con invalidate(). Cada fragmento arma su propia PlannerView para no
+# reutilizar totales calculados en una recarga anterior.
+
+def invalidate(dependency, message=None):
+    """Marca `dependency` como cambiada y recarga la app completa.
+
+    `message` se muestra como confirmación en la siguiente recarga, ya que
+    lo escrito en esta se descarta.
+    """
+    versions = st.session_state.setdefault('versions', {})
+    versions[dependency] = versions.get(dependency, 0) + 1
+    if message:
+        st.session_state.flash = message
+    st.rerun(scope="app")
+
+def dependency_version(dependency):
+    return st.session_state.get('versions', {}).get(dependency, 0)
+
+@st.fragment
+@profiled('ui.hourly_rate')
+def render_hourly_rate(income):
+    # === Cálculo del valor hora de trabajo con mes actual ===
+    st.header("Valor de tu hora de trabajo")
     
-    # Inicializar session state
-    if 'planner' not in st.session_state:
-        st.session_state.planner = FinancialPlanner()
+    # Pedimos las horas trabajadas a la semana
+    horas_semana = st.number_input(
+        "Horas trabajadas por semana", 
+        min_value=1, max_value=100, value=44, step=1
+    )
     
-    planner = st.session_state.planner
+    # Obtenemos mes y año actual
+    hoy = datetime.today()
+    nombre_mes = calendar.month_name[hoy.month]  # Ej: "August"
     
+    valor_hora = hourly_rate(income, horas_semana, hoy)
+    if valor_hora is not None:
+        st.metric(
+            f"💸 Valor por hora ({nombre_mes} {hoy.year})", 
+            f"${valor_hora:,.2f}"
+        )
+
+def render_account():
+    """Identificador de almacenamiento del usuario, o None si todavía no se identificó.
+
+    Con el inicio de sesión de Streamlit (st.login) configurado se usa la
+    cuenta verificada; si no, el nombre de usuario más una clave secreta. Un
+    nombre solo no da acceso a los datos guardados de nadie.
+    """
+    if st.user.get('is_logged_in', False):
+        st.caption(f"👤 {st.user.get('name') or st.user.get('email')}")
+        return f"user:{st.user.get('sub') or st.user.get('email')}"
+
+    user_name = st.text_input(
+        "👤 Nombre de usuario",
+        key="user_id",
+        help="Se usa junto con la clave para guardar y recuperar su presupuesto y sus compras planificadas"
+    ).strip()
+    secret = st.text_input(
+        "🔑 Clave de acceso",
+        key="user_secret",
+        type="password",
+        help=f"Al menos {MIN_SECRET_LENGTH} caracteres. Con otra clave el mismo nombre abre una cuenta distinta"
+    )
+    if not user_name or not secret:
+        return None
+    if len(secret) < MIN_SECRET_LENGTH:
+        st.warning(f"La clave debe tener al menos {MIN_SECRET_LENGTH} caracteres")
+        return None
+
+    # Derivar la cuenta es costoso a propósito: se recalcula solo cuando cambian nombre o clave
+    signature = hashlib.sha256(f"{user_name}\0{secret}".encode('utf-8')).digest()
+    cached = st.session_state.get('account')
+    if cached is None or cached[0] != signature:
+        cached = st.session_state.account = (signature, account_key(user_name, secret))
+    return cached[1]
+
+@profiled('ui.sidebar')
+def render_sidebar(planner, store):
     # Sidebar para información personal
     with st.sidebar:
         st.header("📋 Información Personal")
-        
+    
+        # Cuenta para guardar y recuperar la información
+        user_id = render_account()
+        if user_id and st.session_state.get('loaded_user') != user_id:
+            store.load_planner(user_id, planner)
+            st.session_state.loaded_user = user_id
+    
         # Información básica
         st.subheader("💼 Ingresos")
         planner.income = st.number_input(
@@ -287,751 +168,1128 @@ def main():
             format="%d",
             help="Ingrese su salario mensual después de impuestos"
         )
-        
+    
         # Información familiar
         st.subheader("👨‍👩‍👧‍👦 Composición Familiar")
-        planner.family_info['has_children'] = st.checkbox("¿Tiene hijos?", value=planner.family_info.get('has_children', False))
-        
-        if planner.family_info['has_children']:
-            planner.family_info['num_children'] = st.number_input(
+        planner.family_info.has_children = st.checkbox("¿Tiene hijos?", value=planner.family_info.has_children)
+    
+        if planner.family_info.has_children:
+            planner.family_info.num_children = st.number_input(
                 "Número de hijos",
                 min_value=1,
                 max_value=10,
-                value=planner.family_info.get('num_children', 1)
+                value=max(1, planner.family_info.num_children)
             )
-            planner.family_info['children_ages'] = st.text_input(
+            planner.family_info.children_ages = st.text_input(
                 "Edades de los hijos (separadas por comas)",
-                value=planner.family_info.get('children_ages', ""),
+                value=planner.family_info.children_ages,
                 help="Ejemplo: 5, 8, 12"
             )
-        
-        planner.family_info['has_pets'] = st.checkbox("¿Tiene mascotas?", value=planner.family_info.get('has_pets', False))
-        
-        if planner.family_info['has_pets']:
-            planner.family_info['num_pets'] = st.number_input(
+    
+        planner.family_info.has_pets = st.checkbox("¿Tiene mascotas?", value=planner.family_info.has_pets)
+    
+        if planner.family_info.has_pets:
+            planner.family_info.num_pets = st.number_input(
                 "Número de mascotas",
                 min_value=1,
                 max_value=5,
-                value=planner.family_info.get('num_pets', 1)
+                value=max(1, planner.family_info.num_pets)
             )
 
 
-        # === Cálculo del valor hora de trabajo con mes actual ===
-        st.header("Valor de tu hora de trabajo")
-        
-        # Pedimos las horas trabajadas a la semana
-        horas_semana = st.number_input(
-            "Horas trabajadas por semana", 
-            min_value=1, max_value=100, value=44, step=1
-        )
-        
-        # Obtenemos mes y año actual
-        hoy = datetime.today()
-        mes_actual = hoy.month
-        anio_actual = hoy.year
-        nombre_mes = calendar.month_name[mes_actual]  # Ej: "August"
-        
-        # Número de días del mes actual
-        dias_mes = calendar.monthrange(anio_actual, mes_actual)[1]
-        
-        # Semanas reales del mes
-        semanas_mes = dias_mes / 7  
-        
-        # Horas trabajadas al mes según semanas reales
-        horas_mes = horas_semana * semanas_mes
-        
-        # Evitamos división por cero
-        if horas_mes > 0 and planner.income > 0:
-            valor_hora = planner.income / horas_mes
-            st.metric(
-                f"💸 Valor por hora ({nombre_mes} {anio_actual})", 
-                f"${valor_hora:,.2f}"
-            )
-        
+        render_hourly_rate(planner.income)
+    
+        if st.button("💾 Guardar mi información", disabled=not user_id):
+            store.save_planner(user_id, planner)
+            st.success("✅ Información guardada")
+    
         # Información Adicional
         st.markdown("*Created by Angel Torres*")
 
+    return user_id
+
+@st.fragment
+@profiled('ui.needs_tab')
+def render_needs_tab(planner):
+    view = PlannerView(planner)
+    st.header("🏠 Gastos Básicos y Necesidades (50% del Salario)")
     
-    
-    # Tabs principales
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "🏠 Necesidades (50%)",
-        "🎯 Deseos (30%)",
-        "💰 Ahorros e Inversiones (20%)",
-        "📊 Análisis Completo",
-        "📈 Plan de Compras"
-    ])
-    
-    with tab1:
-        st.header("🏠 Gastos Básicos y Necesidades (50% del Salario)")
+    if planner.income > 0:
+        budgets = view.budgets
+        st.info(f"💡 **Presupuesto disponible para necesidades:** ${budgets['needs_budget']:,.0f} COP")
         
-        if planner.income > 0:
-            budgets = planner.calculate_percentages()
-            st.info(f"💡 **Presupuesto disponible para necesidades:** ${budgets['needs_budget']:,.0f} COP")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.subheader("🏘️ Vivienda")
-                planner.needs['rent'] = st.number_input(
-                    "Arriendo/Hipoteca", 
-                    min_value=0, 
-                    value=planner.needs.get('rent', 0),
-                    step=50000
-                )
-                planner.needs['utilities'] = st.number_input(
-                    "Servicios públicos", 
-                    min_value=0, 
-                    value=planner.needs.get('utilities', 0),
-                    step=10000
-                )
-                
-                st.subheader("🍽️ Alimentación")
-                planner.needs['groceries'] = st.number_input(
-                    "Mercado/Comida", 
-                    min_value=0, 
-                    value=planner.needs.get('groceries', 0),
-                    step=50000
-                )
-                
-                st.subheader("🚗 Transporte")
-                planner.needs['transport'] = st.number_input(
-                    "Transporte público/Combustible", 
-                    min_value=0, 
-                    value=planner.needs.get('transport', 0),
-                    step=25000
-                )
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("🏘️ Vivienda")
+            planner.needs['rent'] = st.number_input(
+                "Arriendo/Hipoteca", 
+                min_value=0, 
+                value=int(planner.needs['rent']),
+                step=50000
+            )
+            planner.needs['utilities'] = st.number_input(
+                "Servicios públicos", 
+                min_value=0, 
+                value=int(planner.needs['utilities']),
+                step=10000
+            )
             
-            with col2:
-                st.subheader("🏥 Salud")
-                planner.needs['health'] = st.number_input(
-                    "Medicina prepagada/Seguros", 
-                    min_value=0, 
-                    value=planner.needs.get('health', 0),
-                    step=25000
-                )
-                
-                if planner.family_info.get('has_children'):
-                    st.subheader("👶 Gastos de Hijos")
-                    planner.needs['children'] = st.number_input(
-                        "Educación/Cuidado de niños", 
-                        min_value=0, 
-                        value=planner.needs.get('children', 0),
-                        step=50000
-                    )
-                
-                if planner.family_info.get('has_pets'):
-                    st.subheader("🐕 Gastos de Mascotas")
-                    planner.needs['pets'] = st.number_input(
-                        "Comida/Veterinario mascotas", 
-                        min_value=0, 
-                        value=planner.needs.get('pets', 0),
-                        step=25000
-                    )
-                
-                st.subheader("📱 Otros Básicos")
-                planner.needs['phone'] = st.number_input(
-                    "Teléfono/Internet", 
-                    min_value=0, 
-                    value=planner.needs.get('phone', 0),
-                    step=25000
-                )
+            st.subheader("🍽️ Alimentación")
+            planner.needs['groceries'] = st.number_input(
+                "Mercado/Comida", 
+                min_value=0, 
+                value=int(planner.needs['groceries']),
+                step=50000
+            )
             
-            # Análisis de necesidades
-            total_needs = planner.calculate_needs_total()
-            if total_needs > budgets['needs_budget']:
-                excess = total_needs - budgets['needs_budget']
-                excess_percent = (excess / planner.income) * 100
-                st.markdown(f"""
-                <div class="danger-card">
-                    <h4>⚠️ ALERTA: Exceso en Gastos Básicos</h4>
-                    <p><strong>Total gastado:</strong> ${total_needs:,.0f} COP</p>
-                    <p><strong>Presupuesto:</strong> ${budgets['needs_budget']:,.0f} COP</p>
-                    <p><strong>Exceso:</strong> ${excess:,.0f} COP ({excess_percent:.1f}% del salario)</p>
-                    <p><strong>Recomendación:</strong> Debe reducir gastos básicos o aumentar ingresos urgentemente.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            elif total_needs > budgets['needs_budget'] * 0.9:
-                st.markdown(f"""
-                <div class="warning-card">
-                    <h4>⚡ Advertencia: Cerca del Límite</h4>
-                    <p><strong>Total gastado:</strong> ${total_needs:,.0f} COP</p>
-                    <p><strong>Presupuesto:</strong> ${budgets['needs_budget']:,.0f} COP</p>
-                    <p><strong>Margen restante:</strong> ${budgets['needs_budget'] - total_needs:,.0f} COP</p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                remaining = budgets['needs_budget'] - total_needs
-                st.markdown(f"""
-                <div class="success-card">
-                    <h4>✅ Gastos Básicos Bajo Control</h4>
-                    <p><strong>Total gastado:</strong> ${total_needs:,.0f} COP</p>
-                    <p><strong>Presupuesto:</strong> ${budgets['needs_budget']:,.0f} COP</p>
-                    <p><strong>Disponible:</strong> ${remaining:,.0f} COP</p>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.warning("⚠️ Por favor, ingrese su salario mensual en la barra lateral para continuar.")
-    
-    with tab2:
-        st.header("🎯 Deseos y Gustos Personales (30% del Salario)")
+            st.subheader("🚗 Transporte")
+            planner.needs['transport'] = st.number_input(
+                "Transporte público/Combustible", 
+                min_value=0, 
+                value=int(planner.needs['transport']),
+                step=25000
+            )
         
-        if planner.income > 0:
-            budgets = planner.calculate_percentages()
-            st.info(f"💡 **Presupuesto disponible para deseos:** ${budgets['wants_budget']:,.0f} COP")
-            
-            col1, col2 = st.columns(2)
+        with col2:
+            st.subheader("🏥 Salud")
+            planner.needs['health'] = st.number_input(
+                "Medicina prepagada/Seguros", 
+                min_value=0, 
+                value=int(planner.needs['health']),
+                step=25000
+            )
             
-            with col1:
-                st.subheader("🎬 Entretenimiento")
-                planner.wants['entertainment'] = st.number_input(
-                    "Cine, streaming, salidas", 
-                    min_value=0, 
-                    value=planner.wants.get('entertainment', 0),
-                    step=25000
-                )
-                
-                st.subheader("🍽️ Restaurantes")
-                planner.wants['dining'] = st.number_input(
-                    "Restaurantes y delivery", 
-                    min_value=0, 
-                    value=planner.wants.get('dining', 0),
-                    step=25000
-                )
-                
-                st.subheader("👕 Ropa y Accesorios")
-                planner.wants['clothing'] = st.number_input(
-                    "Ropa no esencial", 
+            if planner.family_info.has_children:
+                st.subheader("👶 Gastos de Hijos")
+                planner.needs['children'] = st.number_input(
+                    "Educación/Cuidado de niños", 
                     min_value=0, 
-                    value=planner.wants.get('clothing', 0),
+                    value=int(planner.needs['children']),
                     step=50000
                 )
             
-            with col2:
-                st.subheader("🎮 Hobbies")
-                planner.wants['hobbies'] = st.number_input(
-                    "Videojuegos, deportes, aficiones", 
-                    min_value=0, 
-                    value=planner.wants.get('hobbies', 0),
-                    step=25000
-                )
-                
-                st.subheader("✈️ Viajes")
-                planner.wants['travel'] = st.number_input(
-                    "Vacaciones y viajes", 
-                    min_value=0, 
-                    value=planner.wants.get('travel', 0),
-                    step=100000
-                )
-                
-                st.subheader("🛍️ Compras Impulsivas")
-                planner.wants['shopping'] = st.number_input(
-                    "Compras no planificadas", 
+            if planner.family_info.has_pets:
+                st.subheader("🐕 Gastos de Mascotas")
+                planner.needs['pets'] = st.number_input(
+                    "Comida/Veterinario mascotas", 
                     min_value=0, 
-                    value=planner.wants.get('shopping', 0),
+                    value=int(planner.needs['pets']),
                     step=25000
                 )
             
-            total_wants = planner.calculate_wants_total()
-            
-            if total_wants > budgets['wants_budget']:
-                excess = total_wants - budgets['wants_budget']
-                st.markdown(f"""
-                <div class="warning-card">
-                    <h4>💸 Exceso en Gastos de Deseos</h4>
-                    <p><strong>Total en deseos:</strong> ${total_wants:,.0f} COP</p>
-                    <p><strong>Presupuesto:</strong> ${budgets['wants_budget']:,.0f} COP</p>
-                    <p><strong>Exceso:</strong> ${excess:,.0f} COP</p>
-                    <p>💡 <strong>Sugerencia:</strong> Priorice sus deseos y reduzca gastos no esenciales.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                remaining = budgets['wants_budget'] - total_wants
-                st.markdown(f"""
-                <div class="success-card">
-                    <h4>🎉 Presupuesto de Deseos Controlado</h4>
-                    <p><strong>Total gastado:</strong> ${total_wants:,.0f} COP</p>
-                    <p><strong>Disponible:</strong> ${remaining:,.0f} COP para otros gustos</p>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.warning("⚠️ Por favor, ingrese su salario mensual en la barra lateral.")
-    
-    with tab3:
-        st.header("💰 Ahorros e Inversiones (20% del Salario)")
+            st.subheader("📱 Otros Básicos")
+            planner.needs['phone'] = st.number_input(
+                "Teléfono/Internet", 
+                min_value=0, 
+                value=int(planner.needs['phone']),
+                step=25000
+            )
         
-        if planner.income > 0:
-            budgets = planner.calculate_percentages()
-            st.info(f"💡 **Presupuesto obligatorio para ahorros:** ${budgets['savings_budget']:,.0f} COP")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.subheader("🆘 Fondo de Emergencia")
-                emergency_fund = st.number_input(
-                    "Fondo de emergencia mensual", 
-                    min_value=0, 
-                    value=int(budgets['savings_budget'] * 0.6),
-                    step=25000,
-                    help="Recomendado: 60% de este presupuesto"
-                )
-                
-                months_expenses = planner.calculate_needs_total()
-                if months_expenses > 0:
-                    recommended_emergency = months_expenses * 6
-                    st.info(f"💡 **Fondo de emergencia recomendado:** ${recommended_emergency:,.0f} COP (6 meses de gastos básicos)")
-            
-            with col2:
-                st.subheader("📈 Inversiones")
-                investment_amount = st.number_input(
-                    "Monto mensual para inversiones", 
-                    min_value=0, 
-                  value=int(budgets['savings_budget'] * 0.4),
-                    step=25000,
-                    help="Recomendado: 40% de este presupuesto"
-                )
-            
-            # Análisis de inversiones
-            if investment_amount > 0:
-                st.subheader("🎯 Recomendaciones de Inversión")
-                
-                advisor = InvestmentAdvisor()
-                investment_options = advisor.get_investment_options(investment_amount * 12)  # Anual
-                
-                for option in investment_options:
-                    with st.expander(f"💼 {option['name']} - Riesgo: {option['risk']}"):
-                        col_a, col_b, col_c = st.columns(3)
-                        
-                        with col_a:
-                            st.metric("Rentabilidad Esperada", option['return'])
-                        
-                        with col_b:
-                            st.metric("Inversión Mínima", f"${option['min_amount']:,.0f}")
-                        
-                        with col_c:
-                            st.metric("Liquidez", option['liquidity'])
-                        
-                        st.write(option['description'])
-                        
-                        if investment_amount * 12 >= option['min_amount']:
-                            st.success("✅ Su presupuesto es suficiente para esta opción")
-                        else:
-                            needed = option['min_amount'] - (investment_amount * 12)
-                            months_needed = math.ceil(needed / investment_amount)
-                            st.warning(f"⏰ Necesita ahorrar {months_needed} meses más para alcanzar la inversión mínima")
-            
-            # Visualización del progreso
-            total_savings = emergency_fund + investment_amount
-            if total_savings < budgets['savings_budget']:
-                remaining = budgets['savings_budget'] - total_savings
-                st.markdown(f"""
-                <div class="warning-card">
-                    <h4>⚠️ No está cumpliendo con el 20% de ahorro</h4>
-                    <p><strong>Ahorrando actualmente:</strong> ${total_savings:,.0f} COP</p>
-                    <p><strong>Debería ahorrar:</strong> ${budgets['savings_budget']:,.0f} COP</p>
-                    <p><strong>Faltante:</strong> ${remaining:,.0f} COP</p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="success-card">
-                    <h4>🎯 ¡Excelente! Cumpliendo con el ahorro obligatorio</h4>
-                    <p><strong>Ahorro mensual:</strong> ${total_savings:,.0f} COP</p>
-                    <p><strong>Ahorro anual proyectado:</strong> ${total_savings * 12:,.0f} COP</p>
-                </div>
-                """, unsafe_allow_html=True)
+        # Análisis de necesidades
+        total_needs = view.needs_total
+        if total_needs > budgets['needs_budget']:
+            excess = total_needs - budgets['needs_budget']
+            excess_percent = (excess / planner.income) * 100
+            st.markdown(f"""
+            <div class="danger-card">
+                <h4>⚠️ ALERTA: Exceso en Gastos Básicos</h4>
+                <p><strong>Total gastado:</strong> ${total_needs:,.0f} COP</p>
+                <p><strong>Presupuesto:</strong> ${budgets['needs_budget']:,.0f} COP</p>
+                <p><strong>Exceso:</strong> ${excess:,.0f} COP ({excess_percent:.1f}% del salario)</p>
+                <p><strong>Recomendación:</strong> Debe reducir gastos básicos o aumentar ingresos urgentemente.</p>
+            </div>
+            """, unsafe_allow_html=True)
+        elif total_needs > budgets['needs_budget'] * 0.9:
+            st.markdown(f"""
+            <div class="warning-card">
+                <h4>⚡ Advertencia: Cerca del Límite</h4>
+                <p><strong>Total gastado:</strong> ${total_needs:,.0f} COP</p>
+                <p><strong>Presupuesto:</strong> ${budgets['needs_budget']:,.0f} COP</p>
+                <p><strong>Margen restante:</strong> ${budgets['needs_budget'] - total_needs:,.0f} COP</p>
+            </div>
+            """, unsafe_allow_html=True)
         else:
-            st.warning("⚠️ Por favor, ingrese su salario mensual en la barra lateral.")
+            remaining = budgets['needs_budget'] - total_needs
+            st.markdown(f"""
+            <div class="success-card">
+                <h4>✅ Gastos Básicos Bajo Control</h4>
+                <p><strong>Total gastado:</strong> ${total_needs:,.0f} COP</p>
+                <p><strong>Presupuesto:</strong> ${budgets['needs_budget']:,.0f} COP</p>
+                <p><strong>Disponible:</strong> ${remaining:,.0f} COP</p>
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.warning("⚠️ Por favor, ingrese su salario mensual en la barra lateral para continuar.")
+
+@st.fragment
+@profiled('ui.wants_tab')
+def render_wants_tab(planner):
+    view = PlannerView(planner)
+    st.header("🎯 Deseos y Gustos Personales (30% del Salario)")
     
-    with tab4:
-        st.header("📊 Análisis Financiero Completo")
+    if planner.income > 0:
+        budgets = view.budgets
+        st.info(f"💡 **Presupuesto disponible para deseos:** ${budgets['wants_budget']:,.0f} COP")
         
-        if planner.income > 0:
-            # Cálculos generales
-            budgets = planner.calculate_percentages()
-            total_needs = planner.calculate_needs_total()
-            total_wants = planner.calculate_wants_total()
-            risk_analysis = planner.get_risk_analysis()
-            
-            # Métricas principales
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric(
-                    "💰 Salario Mensual",
-                    f"${planner.income:,.0f}",
-                    help="Su ingreso mensual neto"
-                )
-            
-            with col2:
-                needs_percent = (total_needs / planner.income) * 100 if planner.income > 0 else 0
-                delta_needs = needs_percent - 50
-                st.metric(
-                    "🏠 Gastos Básicos",
-                    f"{needs_percent:.1f}%",
-                    f"{delta_needs:+.1f}%",
-                    delta_color="inverse"
-                )
-            
-            with col3:
-                wants_percent = (total_wants / planner.income) * 100 if planner.income > 0 else 0
-                delta_wants = wants_percent - 30
-                st.metric(
-                    "🎯 Deseos",
-                    f"{wants_percent:.1f}%",
-                    f"{delta_wants:+.1f}%",
-                    delta_color="inverse"
-                )
-            
-            with col4:
-                st.metric(
-                    "⚠️ Nivel de Riesgo",
-                    risk_analysis['level'],
-                    help="Basado en el análisis de sus gastos"
-                )
-            
-            # Gráfico de distribución
-            st.subheader("📈 Distribución de Ingresos")
-            
-            # Datos para el gráfico
-            categories = ['Necesidades\n(50%)', 'Deseos\n(30%)', 'Ahorros\n(20%)', 'Sin Asignar']
-            actual_values = [
-                total_needs,
-                total_wants,
-                budgets['savings_budget'],
-                max(0, planner.income - total_needs - total_wants - budgets['savings_budget'])
-            ]
-            
-            budget_values = [
-                budgets['needs_budget'],
-                budgets['wants_budget'],
-                budgets['savings_budget'],
-                0
-            ]
-            
-            # Crear gráfico de barras comparativo
-            fig = make_subplots(
-                rows=2, cols=1,
-                subplot_titles=('Distribución Actual vs Recomendada', 'Análisis por Categorías'),
-                specs=[[{"type": "bar"}], [{"type": "pie"}]],
-                vertical_spacing=0.12
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("🎬 Entretenimiento")
+            planner.wants['entertainment'] = st.number_input(
+                "Cine, streaming, salidas", 
+                min_value=0, 
+                value=int(planner.wants['entertainment']),
+                step=25000
             )
             
-            # Gráfico de barras
-            fig.add_trace(
-                go.Bar(name='Actual', x=categories[:-1], y=actual_values[:-1], 
-                       marker_color=['#e17055', '#fdcb6e', '#00b894']),
-                row=1, col=1
+            st.subheader("🍽️ Restaurantes")
+            planner.wants['dining'] = st.number_input(
+                "Restaurantes y delivery", 
+                min_value=0, 
+                value=int(planner.wants['dining']),
+                step=25000
             )
             
-            fig.add_trace(
-                go.Bar(name='Recomendado', x=categories[:-1], y=budget_values[:-1], 
-                       marker_color=['#ff7675', '#ffeaa7', '#55a3ff'], opacity=0.7),
-                row=1, col=1
+            st.subheader("👕 Ropa y Accesorios")
+            planner.wants['clothing'] = st.number_input(
+                "Ropa no esencial", 
+                min_value=0, 
+                value=int(planner.wants['clothing']),
+                step=50000
             )
-            
-            # Gráfico circular
-            fig.add_trace(
-                go.Pie(labels=categories, values=actual_values, 
-                       marker_colors=['#e17055', '#fdcb6e', '#00b894', '#ddd']),
-                row=2, col=1
+        
+        with col2:
+            st.subheader("🎮 Hobbies")
+            planner.wants['hobbies'] = st.number_input(
+                "Videojuegos, deportes, aficiones", 
+                min_value=0, 
+                value=int(planner.wants['hobbies']),
+                step=25000
             )
             
-            fig.update_layout(
-                height=800,
-                title_text="Análisis Financiero Detallado",
-                showlegend=True
+            st.subheader("✈️ Viajes")
+            planner.wants['travel'] = st.number_input(
+                "Vacaciones y viajes", 
+                min_value=0, 
+                value=int(planner.wants['travel']),
+                step=100000
             )
             
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Recomendaciones personalizadas
-            st.subheader("🎯 Recomendaciones Personalizadas")
-            
-            for i, recommendation in enumerate(risk_analysis['recommendations'], 1):
-                st.write(f"{i}. {recommendation}")
-            
-            # Proyección anual
-            st.subheader("📅 Proyección Anual")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                annual_needs = total_needs * 12
-                st.metric("Gastos Básicos Anuales", f"${annual_needs:,.0f}")
-            
-            with col2:
-                annual_wants = total_wants * 12
-                st.metric("Gastos de Deseos Anuales", f"${annual_wants:,.0f}")
-            
-            with col3:
-                annual_savings = budgets['savings_budget'] * 12
-                st.metric("Ahorro Anual Recomendado", f"${annual_savings:,.0f}")
-            
-            # Análisis de flujo de caja
-            st.subheader("💸 Flujo de Caja Mensual")
-            
-            remaining_income = planner.income - total_needs - total_wants - budgets['savings_budget']
-            
-            if remaining_income < 0:
-                st.markdown(f"""
-                <div class="danger-card">
-                    <h4>🚨 DÉFICIT FINANCIERO</h4>
-                    <p><strong>Déficit mensual:</strong> ${abs(remaining_income):,.0f} COP</p>
-                    <p><strong>Acción requerida:</strong> Reducir gastos o aumentar ingresos inmediatamente.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            elif remaining_income < planner.income * 0.05:
-                st.markdown(f"""
-                <div class="warning-card">
-                    <h4>⚠️ MARGEN AJUSTADO</h4>
-                    <p><strong>Sobrante mensual:</strong> ${remaining_income:,.0f} COP</p>
-                    <p>Margen muy ajustado, considere optimizar gastos.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="success-card">
-                    <h4>✅ SITUACIÓN FINANCIERA SALUDABLE</h4>
-                    <p><strong>Sobrante mensual:</strong> ${remaining_income:,.0f} COP</p>
-                    <p>Puede considerar aumentar ahorros o inversiones.</p>
-                </div>
-                """, unsafe_allow_html=True)
+            st.subheader("🛍️ Compras Impulsivas")
+            planner.wants['shopping'] = st.number_input(
+                "Compras no planificadas", 
+                min_value=0, 
+                value=int(planner.wants['shopping']),
+                step=25000
+            )
+        
+        total_wants = view.wants_total
+        
+        if total_wants > budgets['wants_budget']:
+            excess = total_wants - budgets['wants_budget']
+            st.markdown(f"""
+            <div class="warning-card">
+                <h4>💸 Exceso en Gastos de Deseos</h4>
+                <p><strong>Total en deseos:</strong> ${total_wants:,.0f} COP</p>
+                <p><strong>Presupuesto:</strong> ${budgets['wants_budget']:,.0f} COP</p>
+                <p><strong>Exceso:</strong> ${excess:,.0f} COP</p>
+                <p>💡 <strong>Sugerencia:</strong> Priorice sus deseos y reduzca gastos no esenciales.</p>
+            </div>
+            """, unsafe_allow_html=True)
         else:
-            st.warning("⚠️ Complete la información de ingresos y gastos para ver el análisis completo.")
+            remaining = budgets['wants_budget'] - total_wants
+            st.markdown(f"""
+            <div class="success-card">
+                <h4>🎉 Presupuesto de Deseos Controlado</h4>
+                <p><strong>Total gastado:</strong> ${total_wants:,.0f} COP</p>
+                <p><strong>Disponible:</strong> ${remaining:,.0f} COP para otros gustos</p>
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.warning("⚠️ Por favor, ingrese su salario mensual en la barra lateral.")
+
+@st.fragment
+@profiled('ui.projection_panel')
+def render_projection_panel(projectable, investment_amount, emergency_fund):
+    # Proyección Monte Carlo de los aportes mensuales; sus controles solo recargan este panel
+    st.subheader("🔮 Proyección de sus Inversiones")
+    col_mc1, col_mc2 = st.columns(2)
+
+    with col_mc1:
+        projected_option = st.selectbox(
+            "Opción a proyectar",
+            projectable,
+            format_func=lambda option: f"{option.name} ({option.expected_return})",
+            key="projected_option",
+            persist_state="session"
+        )
+        include_emergency = st.checkbox(
+            "Incluir el fondo de emergencia (en Cuenta de Ahorros Premium)",
+            value=False,
+            key="include_emergency",
+            persist_state="session"
+        )
+
+    with col_mc2:
+        projection_years = st.slider("Horizonte (años)", min_value=1, max_value=40, value=10, key="projection_years", persist_state="session")
+
+    projection = project_option(
+        projected_option.id,
+        investment_amount,
+        projection_years,
+        emergency_fund if include_emergency else 0,
+        paths=MONTE_CARLO_PATHS
+    )
+    st.plotly_chart(
+        projection_figure(projection, f"Escenarios simulados: {projected_option.name}"),
+        width='stretch'
+    )
+
+    col_p1, col_p2, col_p3 = st.columns(3)
+    with col_p1:
+        st.metric("Escenario pesimista (5%)", f"${projection['percentiles'][5][-1]:,.0f}")
+    with col_p2:
+        st.metric("Escenario probable (mediana)", f"${projection['percentiles'][50][-1]:,.0f}")
+    with col_p3:
+        st.metric("Escenario optimista (95%)", f"${projection['percentiles'][95][-1]:,.0f}")
+    st.caption(f"Basado en {projection['paths']:,} escenarios con rentabilidades aleatorias derivadas "
+               f"del rango y el nivel de riesgo de cada opción. Total aportado: ${projection['contributed'][-1]:,.0f}.")
+
+@st.fragment
+@profiled('ui.emergency_panel')
+def render_emergency_panel(emergency_fund, needs_total, wants_total, income):
+    # Simulación del fondo con pérdida de empleo, gastos médicos y caídas del ingreso
+    col1, col2 = st.columns(2)
+    with col1:
+        initial_balance = st.number_input("Saldo actual del fondo", min_value=0, value=0, step=100000,
+                                          key="emergency_balance", persist_state="session")
+        target_months = st.slider("Meta (meses de gastos básicos)", 3, 12, 6, key="emergency_target_months",
+                                  persist_state="session")
+        years = st.slider("Horizonte (años)", 1, 10, 5, key="emergency_years", persist_state="session")
+    with col2:
+        job_loss = st.slider("Probabilidad anual de perder el empleo (%)", 0, 40, int(JOB_LOSS_RATE * 100),
+                             key="emergency_job_loss", persist_state="session")
+        unemployment = st.slider("Duración media del desempleo (meses)", 1, 18, int(UNEMPLOYMENT_MONTHS),
+                                 key="emergency_unemployment", persist_state="session")
+        medical = st.slider("Probabilidad anual de un gasto médico (%)", 0, 50, int(MEDICAL_RATE * 100),
+                            key="emergency_medical", persist_state="session")
+
+    simulation = simulate_emergency_fund(
+        float(emergency_fund), float(needs_total), float(wants_total), float(income), float(initial_balance),
+        target_months, years * 12, paths=EMERGENCY_PATHS, job_loss_rate=job_loss / 100,
+        unemployment_months=float(unemployment), medical_rate=medical / 100
+    )
+
+    col_m1, col_m2, col_m3 = st.columns(3)
+    with col_m1:
+        st.metric("Probabilidad de agotar el fondo", f"{simulation['depletion_probability']:.0%}",
+                  help="Algún imprevisto costó más que el saldo disponible")
+    with col_m2:
+        st.metric("Se agota antes de volver a trabajar", f"{simulation['depletion_given_job_loss']:.0%}",
+                  help=f"Entre quienes pierden el empleo ({simulation['job_loss_probability']:.0%} de los escenarios)")
+    with col_m3:
+        median_months = simulation['adequacy_percentiles'][50]
+        expected = simulation['expected_months']
+        st.metric("Meses para completar la meta (mediana)",
+                  f"{median_months:.0f}" if np.isfinite(median_months) else "No se completa",
+                  help=f"Sin imprevistos: {expected} meses" if np.isfinite(expected) else "Sin aporte mensual no se completa")
+
+    st.plotly_chart(emergency_figure(simulation), width='stretch')
+    slow = simulation['adequacy_percentiles'][90]
+    st.caption(f"{simulation['paths']:,} escenarios, con caídas del ingreso (probabilidad anual "
+               f"{INCOME_SHOCK_RATE:.0%}) además de los eventos anteriores. La meta se completa en el horizonte "
+               f"en el {simulation['adequacy_probability']:.0%} de ellos"
+               + (f"; el 90% la completa a más tardar en el mes {slow:.0f}." if np.isfinite(slow) else "."))
+
+@st.fragment
+@profiled('ui.savings_tab')
+def render_savings_tab(planner):
+    view = PlannerView(planner)
+    st.header("💰 Ahorros e Inversiones (20% del Salario)")
     
-    with tab5:
-        st.header("📈 Planificador de Compras Importantes")
+    if planner.income > 0:
+        budgets = view.budgets
+        st.info(f"💡 **Presupuesto obligatorio para ahorros:** ${budgets['savings_budget']:,.0f} COP")
         
-        if planner.income > 0:
-            budgets = planner.calculate_percentages()
-            available_wants = budgets['wants_budget'] - planner.calculate_wants_total()
-            
-            st.info(f"💡 **Presupuesto disponible mensual para compras:** ${max(0, available_wants):,.0f} COP")
-            
-            # Formulario para nueva compra
-            st.subheader("🛍️ Nueva Compra Planificada")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("🆘 Fondo de Emergencia")
+            emergency_fund = st.number_input(
+                "Fondo de emergencia mensual", 
+                min_value=0, 
+                value=int(budgets['savings_budget'] * 0.6),
+                step=25000,
+                help="Recomendado: 60% de este presupuesto",
+                key="emergency_fund",
+                persist_state="session"
+            )
             
-            col1, col2 = st.columns(2)
+            months_expenses = view.needs_total
+            if months_expenses > 0:
+                recommended_emergency = months_expenses * 6
+                st.info(f"💡 **Fondo de emergencia recomendado:** ${recommended_emergency:,.0f} COP (6 meses de gastos básicos)")
+                with st.expander("🧯 ¿Alcanza su fondo ante imprevistos?"):
+                    render_emergency_panel(emergency_fund, months_expenses, view.wants_total, planner.income)
+        
+        with col2:
+            st.subheader("📈 Inversiones")
+            investment_amount = st.number_input(
+                "Monto mensual para inversiones", 
+                min_value=0, 
+              value=int(budgets['savings_budget'] * 0.4),
+                step=25000,
+                help="Recomendado: 40% de este presupuesto",
+                key="investment_amount",
+                persist_state="session"
+            )
+        
+        # Análisis de inversiones
+        if investment_amount > 0:
+            st.subheader("🎯 Recomendaciones de Inversión")
             
-            with col1:
-                item_name = st.text_input("¿Qué desea comprar?", placeholder="Ejemplo: iPhone 15, Laptop, Carro")
-                item_price = st.number_input(
-                    "Precio del producto (COP)", 
-                    min_value=0, 
-                    step=100000,
-                    format="%d"
-                )
+            # El catálogo trabaja con montos anuales
+            investment_options = InvestmentAdvisor.catalog.lookup(investment_amount * 12)
+            projectable = simulable_options(investment_options)
             
-            with col2:
-                priority = st.selectbox(
-                    "Prioridad de la compra",
-                    ["Alta", "Media", "Baja"]
-                )
-                
-                save_percentage = st.slider(
-                    "¿Qué % de su presupuesto de deseos destinará a esta compra?",
-                    min_value=10,
-                    max_value=100,
-                    value=50,
-                    step=5
-                ) / 100
-
-            if item_name and item_price > 0 and available_wants > 0:
-                # NUEVA LÓGICA CORREGIDA:
-                
-                # 1. Calcular el monto máximo mensual disponible
-                max_monthly_save = available_wants * save_percentage
-                
-                # 2. Calcular meses necesarios (redondeado hacia arriba)
-                months_needed = math.ceil(item_price / max_monthly_save) if max_monthly_save > 0 else float('inf')
-                
-                # 3. Calcular la cuota mensual exacta para obtener meses enteros
-                monthly_save = item_price / months_needed if months_needed < float('inf') else 0
-                
-                # Verificar que la cuota calculada no exceda el presupuesto disponible
-                if monthly_save > available_wants:
-                    # Si excede, recalcular con el máximo disponible
-                    monthly_save = available_wants
-                    months_needed = math.ceil(item_price / monthly_save)
-                
-                # Información de la compra
-                st.subheader(f"📊 Plan de Ahorro: {item_name}")
-                
-                col_a, col_b, col_c, col_d = st.columns(4)
-                
-                with col_a:
-                    st.metric("💰 Precio Total", f"${item_price:,.0f}")
-                
-                with col_b:
-                    st.metric("💳 Ahorro Mensual", f"${monthly_save:,.0f}")
-                
-                with col_c:
-                    st.metric("📅 Meses Necesarios", f"{months_needed}")
-                
-                with col_d:
-                    target_date = datetime.now() + timedelta(days=30 * months_needed)
-                    st.metric("🎯 Fecha Objetivo", target_date.strftime("%m/%Y"))
-                
-                # Mostrar validación del cálculo
-                total_saved = monthly_save * months_needed
-                st.info(f"✅ Validación: ${monthly_save:,.0f} × {months_needed} meses = ${total_saved:,.0f} COP")
-                
-                if total_saved < item_price:
-                    difference = item_price - total_saved
-                    st.warning(f"⚠️ Faltarían ${difference:,.0f} COP. Agregando 1 mes adicional.")
-                    months_needed += 1
-                    monthly_save = item_price / months_needed
-                
-                # Gráfico de progreso de ahorro
-                if months_needed <= 60:  # Solo mostrar si es razonable
-                    progress_data = []
-                    cumulative = 0
-                    
-                    for month in range(int(months_needed) + 1):
-                        cumulative += monthly_save if month < months_needed else 0
-                        progress_data.append({
-                            'Mes': month,
-                            'Ahorro Acumulado': min(cumulative, item_price),
-                            'Meta': item_price
-                        })
+            for option in investment_options:
+                with st.expander(f"💼 {option.name} - Riesgo: {option.risk}"):
+                    col_a, col_b, col_c = st.columns(3)
                     
-                    df_progress = pd.DataFrame(progress_data)
+                    with col_a:
+                        st.metric("Rentabilidad Esperada", option.expected_return)
                     
-                    fig_progress = px.line(
-                        df_progress, 
-                        x='Mes', 
-                        y=['Ahorro Acumulado', 'Meta'],
-                        title=f"Progreso de Ahorro para {item_name}",
-                        color_discrete_map={
-                            'Ahorro Acumulado': '#00b894',
-                            'Meta': '#e17055'
-                        }
-                    )
+                    with col_b:
+                        st.metric("Inversión Mínima", f"${option.min_amount:,.0f}")
                     
-                    fig_progress.update_layout(
-                        xaxis_title="Meses",
-                        yaxis_title="Monto (COP)",
-                        height=400
-                    )
+                    with col_c:
+                        st.metric("Liquidez", option.liquidity)
                     
-                    st.plotly_chart(fig_progress, use_container_width=True)
+                    st.write(option.description)
                     
-                    # Recomendaciones para la compra
-                    if months_needed <= 6:
-                        st.markdown(f"""
-                        <div class="success-card">
-                            <h4>🎉 Compra Alcanzable</h4>
-                            <p>Podrá comprar <strong>{item_name}</strong> en {months_needed} meses.</p>
-                            <p><strong>Estrategia:</strong> Mantenga disciplina en el ahorro mensual.</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    elif months_needed <= 12:
-                        st.markdown(f"""
-                        <div class="warning-card">
-                            <h4>⏰ Compra a Mediano Plazo</h4>
-                            <p>Necesitará {months_needed} meses para comprar <strong>{item_name}</strong>.</p>
-                            <p><strong>Sugerencias:</strong></p>
-                            <ul>
-                                <li>Considere aumentar el % destinado al ahorro</li>
-                                <li>Busque ofertas o descuentos</li>
-                                <li>Evalúe comprar una versión más económica</li>
-                            </ul>
-                        </div>
-                        """, unsafe_allow_html=True)
+                    months_needed = InvestmentAdvisor.months_to_minimum(option.min_amount, investment_amount)
+                    if months_needed == 0:
+                        st.success("✅ Su presupuesto es suficiente para esta opción")
                     else:
-                        st.markdown(f"""
-                        <div class="danger-card">
-                            <h4>🚨 Compra a Muy Largo Plazo</h4>
-                            <p>Necesitará {months_needed} meses para esta compra.</p>
-                            <p><strong>Recomendaciones:</strong></p>
-                            <ul>
-                                <li>Reconsidere si realmente necesita esta compra</li>
-                                <li>Aumente significativamente sus ingresos</li>
-                                <li>Reduzca otros gastos de deseos</li>
-                                <li>Busque alternativas más económicas</li>
-                            </ul>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    # Comparación con financiamiento
-                    st.subheader("💳 Comparación: Ahorro vs Financiamiento")
-                    
-                    # Simulación de crédito (ejemplo con 24% anual)
-                    if months_needed > 3:
-                        monthly_rate = 0.24 / 12  # 24% anual
-                        loan_months = min(months_needed, 36)  # Máximo 36 meses
-                        
-                        if monthly_rate > 0:
-                            monthly_payment = (item_price * monthly_rate * (1 + monthly_rate)**loan_months) / ((1 + monthly_rate)**loan_months - 1)
-                            total_interest = (monthly_payment * loan_months) - item_price
-                        else:
-                            monthly_payment = item_price / loan_months
-                            total_interest = 0
-                        
-                        col_credit1, col_credit2 = st.columns(2)
-                        
-                        with col_credit1:
-                            st.markdown("### 💰 Ahorrando")
-                            st.write(f"**Cuota mensual:** ${monthly_save:,.0f}")
-                            st.write(f"**Total pagado:** ${item_price:,.0f}")
-                            st.write(f"**Intereses:** $0")
-                            st.write(f"**Tiempo:** {months_needed} meses")
-                        
-                        with col_credit2:
-                            st.markdown("### 💳 Financiando (24% anual)")
-                            st.write(f"**Cuota mensual:** ${monthly_payment:,.0f}")
-                            st.write(f"**Total pagado:** ${monthly_payment * loan_months:,.0f}")
-                            st.write(f"**Intereses:** ${total_interest:,.0f}")
-                            st.write(f"**Tiempo:** {loan_months} meses")
-                        
-                        if monthly_payment <= available_wants:
-                            savings_vs_credit = total_interest
-                            st.success(f"💡 **Ahorrando en lugar de financiar, evitará pagar ${savings_vs_credit:,.0f} en intereses.**")
-                        else:
-                            st.error(f"⚠️ **La cuota del crédito (${monthly_payment:,.0f}) excede su presupuesto disponible.**")
-                
-                else:
-                    st.warning(f"⏰ El tiempo necesario ({months_needed} meses) es muy largo. Considere reducir el precio objetivo o aumentar el ahorro mensual.")
+                        st.warning(f"⏰ Necesita ahorrar {months_needed} meses más para alcanzar la inversión mínima")
+            
+            # Proyección Monte Carlo de los aportes mensuales
+            if projectable:
+                render_projection_panel(projectable, investment_amount, emergency_fund)
+        
+        # Visualización del progreso
+        total_savings = emergency_fund + investment_amount
+        if total_savings < budgets['savings_budget']:
+            remaining = budgets['savings_budget'] - total_savings
+            st.markdown(f"""
+            <div class="warning-card">
+                <h4>⚠️ No está cumpliendo con el 20% de ahorro</h4>
+                <p><strong>Ahorrando actualmente:</strong> ${total_savings:,.0f} COP</p>
+                <p><strong>Debería ahorrar:</strong> ${budgets['savings_budget']:,.0f} COP</p>
+                <p><strong>Faltante:</strong> ${remaining:,.0f} COP</p>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class="success-card">
+                <h4>🎯 ¡Excelente! Cumpliendo con el ahorro obligatorio</h4>
+                <p><strong>Ahorro mensual:</strong> ${total_savings:,.0f} COP</p>
+                <p><strong>Ahorro anual proyectado:</strong> ${total_savings * 12:,.0f} COP</p>
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.warning("⚠️ Por favor, ingrese su salario mensual en la barra lateral.")
+
+@profiled('ui.analysis_tab')
+def render_analysis_tab(planner):
+    view = PlannerView(planner)
+    st.header("📊 Análisis Financiero Completo")
+    
+    if planner.income > 0:
+        # Cálculos generales
+        total_needs = view.needs_total
+        total_wants = view.wants_total
+        risk_analysis = view.risk_analysis
+        
+        # Métricas principales
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric(
+                "💰 Salario Mensual",
+                f"${planner.income:,.0f}",
+                help="Su ingreso mensual neto"
+            )
+        
+        with col2:
+            needs_percent = (total_needs / planner.income) * 100 if planner.income > 0 else 0
+            delta_needs = needs_percent - 50
+            st.metric(
+                "🏠 Gastos Básicos",
+                f"{needs_percent:.1f}%",
+                f"{delta_needs:+.1f}%",
+                delta_color="inverse"
+            )
+        
+        with col3:
+            wants_percent = (total_wants / planner.income) * 100 if planner.income > 0 else 0
+            delta_wants = wants_percent - 30
+            st.metric(
+                "🎯 Deseos",
+                f"{wants_percent:.1f}%",
+                f"{delta_wants:+.1f}%",
+                delta_color="inverse"
+            )
+        
+        with col4:
+            st.metric(
+                "⚠️ Nivel de Riesgo",
+                risk_analysis['level'],
+                help="Basado en el análisis de sus gastos"
+            )
+        
+        # Gráfico de distribución
+        st.subheader("📈 Distribución de Ingresos")
+        
+        st.plotly_chart(view.distribution_figure, width='stretch')
+        
+        # Recomendaciones personalizadas
+        st.subheader("🎯 Recomendaciones Personalizadas")
+        
+        for i, recommendation in enumerate(risk_analysis['recommendations'], 1):
+            st.write(f"{i}. {recommendation}")
+        
+        render_forecast_panel(planner)
+        
+        # Análisis de flujo de caja
+        st.subheader("💸 Flujo de Caja Mensual")
+        
+        remaining_income = view.remaining_income
+        
+        if remaining_income < 0:
+            st.markdown(f"""
+            <div class="danger-card">
+                <h4>🚨 DÉFICIT FINANCIERO</h4>
+                <p><strong>Déficit mensual:</strong> ${abs(remaining_income):,.0f} COP</p>
+                <p><strong>Acción requerida:</strong> Reducir gastos o aumentar ingresos inmediatamente.</p>
+            </div>
+            """, unsafe_allow_html=True)
+        elif remaining_income < planner.income * 0.05:
+            st.markdown(f"""
+            <div class="warning-card">
+                <h4>⚠️ MARGEN AJUSTADO</h4>
+                <p><strong>Sobrante mensual:</strong> ${remaining_income:,.0f} COP</p>
+                <p>Margen muy ajustado, considere optimizar gastos.</p>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class="success-card">
+                <h4>✅ SITUACIÓN FINANCIERA SALUDABLE</h4>
+                <p><strong>Sobrante mensual:</strong> ${remaining_income:,.0f} COP</p>
+                <p>Puede considerar aumentar ahorros o inversiones.</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        render_scenarios_panel(planner)
+    else:
+        st.warning("⚠️ Complete la información de ingresos y gastos para ver el análisis completo.")
+
+def _percent_steps(bounds, step):
+    low, high = bounds
+    return np.arange(low, high + step / 2, step) if high > low else np.array([low])
+
+@st.fragment
+@profiled('ui.forecast_panel')
+def render_forecast_panel(planner):
+    st.subheader("📅 Proyección Anual")
+    st.caption("Salario, gastos y presupuesto 50/30/20 mes a mes con aumentos de salario, "
+               f"inflación por categoría y el salario mínimo (${MINIMUM_WAGE:,.0f} en {MINIMUM_WAGE_YEAR}).")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        years = st.slider("Años a proyectar", 1, 30, 5, key="forecast_years", persist_state="session")
+        indexed = st.checkbox("Mi salario se reajusta con el salario mínimo", key="forecast_indexed",
+                              persist_state="session")
+        if indexed:
+            growth_range = st.slider("Aumento anual del salario mínimo (%)", 0.0, 15.0, (5.0, 9.0), step=0.5,
+                                     key="forecast_minimum_wage_growth", persist_state="session")
+        else:
+            growth_range = st.slider("Aumento anual del salario (%)", 0.0, 15.0, (3.0, 7.0), step=0.5,
+                                     key="forecast_salary_growth", persist_state="session")
+    with col2:
+        shift_range = st.slider("Inflación por encima de lo esperado (puntos %)", -3.0, 6.0, (-1.0, 2.0), step=0.5,
+                                key="forecast_inflation_shift", persist_state="session")
+        series = st.selectbox("Serie a graficar", list(FORECAST_SERIES), key="forecast_series",
+                              persist_state="session")
+
+    # Cinco valores por rango; cada combinación es un escenario
+    growth = np.unique(np.linspace(*growth_range, 5)) / 100
+    shift = np.unique(np.linspace(*shift_range, 5)) / 100
+    growth_grid, shift_grid = (grid.ravel() for grid in np.meshgrid(growth, shift, indexing='ij'))
+    started = time.perf_counter()
+    if indexed:
+        forecast = forecast_budget(planner, years, minimum_wage_growth=growth_grid, inflation_shift=shift_grid,
+                                   index_to_minimum_wage=True)
+    else:
+        forecast = forecast_budget(planner, years, salary_growth=growth_grid, inflation_shift=shift_grid)
+    elapsed = time.perf_counter() - started
+    st.caption(f"{len(growth_grid)} escenarios × {len(forecast['month'])} meses calculados en {elapsed * 1000:.1f} ms")
+
+    # Totales del primer año del escenario mediano frente a multiplicar el mes actual por 12
+    first_year = {field: float(np.median(annual_totals(forecast[field])[:, 0]))
+                  for field in ('needs_total', 'wants_total', 'savings_budget')}
+    view = PlannerView(planner)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Gastos Básicos Primer Año", f"${first_year['needs_total']:,.0f}",
+                  f"{first_year['needs_total'] - view.needs_total * 12:+,.0f} COP por inflación", delta_color="inverse")
+    with col2:
+        st.metric("Gastos de Deseos Primer Año", f"${first_year['wants_total']:,.0f}",
+                  f"{first_year['wants_total'] - view.wants_total * 12:+,.0f} COP por inflación", delta_color="inverse")
+    with col3:
+        st.metric("Ahorro Recomendado Primer Año", f"${first_year['savings_budget']:,.0f}",
+                  f"{first_year['savings_budget'] - view.budgets['savings_budget'] * 12:+,.0f} COP por aumentos")
+
+    field = FORECAST_SERIES[series]
+    reference = {
+        'income': planner.income,
+        'needs_total': view.needs_total,
+        'savings_budget': view.budgets['savings_budget'],
+        'remaining_income': view.remaining_income
+    }[field]
+    st.plotly_chart(
+        forecast_figure(forecast['month'], forecast_bands(forecast[field]), f"Proyección: {series}",
+                        np.full(len(forecast['month']), reference)),
+        width='stretch'
+    )
+
+    high_risk = first_high_risk_month(forecast)
+    reached = high_risk >= 0
+    if reached.any():
+        earliest = forecast['month'][high_risk[reached].min()]
+        st.warning(f"⚠️ En {reached.sum()} de {len(high_risk)} escenarios los gastos básicos llegan a riesgo Alto; "
+                   f"el primero en {earliest}.")
+    else:
+        st.success("✅ En ningún escenario los gastos básicos llegan a riesgo Alto en el periodo proyectado.")
+
+@st.fragment
+@profiled('ui.scenarios_panel')
+def render_scenarios_panel(planner):
+    st.subheader("🔀 Escenarios: ¿y si...?")
+    st.caption("Compare de una vez cambios de salario, arriendo y porcentaje de ahorro para una compra.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        income_range = st.slider("Variación del salario (%)", -50, 50, (-10, 10), step=5,
+                                 key="scenario_income_range", persist_state="session")
+        rent_range = st.slider("Variación del arriendo (%)", -50, 50, (-20, 20), step=10,
+                               key="scenario_rent_range", persist_state="session")
+    with col2:
+        # La compra de la pestaña de compras, si ya se ingresó
+        item_price = st.number_input("Precio de la compra (COP)", min_value=0, step=100000, format="%d",
+                                     value=int(st.session_state.get('item_price') or 0),
+                                     key="scenario_item_price", persist_state="session")
+        save_percentages = st.multiselect("% del presupuesto de deseos para la compra", list(range(10, 101, 10)),
+                                          default=[30, 50, 100], key="scenario_save_percentages",
+                                          persist_state="session")
+
+    if not save_percentages:
+        st.info("Seleccione al menos un porcentaje de ahorro.")
+        return
+
+    base = scenario_inputs(
+        planner, item_price,
+        annual_rate=st.session_state.get('loan_rate', DEFAULT_ANNUAL_RATE * 100) / 100,
+        max_loan_months=st.session_state.get('max_loan_months', DEFAULT_MAX_LOAN_MONTHS)
+    )
+    income_steps = _percent_steps(income_range, 5)
+    # Sin arriendo registrado la variación porcentual no cambia nada
+    rent_steps = _percent_steps(rent_range, 10) if planner.needs['rent'] > 0 else np.array([0])
+    started = time.perf_counter()
+    scenarios = evaluate_scenarios(scenario_grid(
+        base,
+        income=planner.income * (1 + income_steps / 100),
+        rent=planner.needs['rent'] * (1 + rent_steps / 100),
+        save_percentage=np.asarray(save_percentages) / 100
+    ))
+    elapsed = time.perf_counter() - started
+
+    # La malla recorre salario, luego arriendo, luego % de ahorro
+    income_delta = np.repeat(income_steps, len(rent_steps) * len(save_percentages))
+    rent_delta = np.tile(np.repeat(rent_steps, len(save_percentages)), len(income_steps))
+    labels = [f"Salario {i:+.0f}% · Arriendo {r:+.0f}% · Ahorro {p:.0f}%"
+              for i, r, p in zip(income_delta, rent_delta, scenarios['save_percentage'] * 100)]
+    st.caption(f"{len(scenarios)} escenarios evaluados en {elapsed * 1000:.1f} ms")
+
+    columns = ['Escenario', 'income', 'rent', 'risk_level', 'remaining_income']
+    if item_price > 0:
+        st.plotly_chart(scenario_figure(scenarios, labels), width='stretch')
+        columns += ['monthly_save', 'months_needed', 'loan_monthly_payment', 'loan_total_interest']
+    else:
+        st.caption("Ingrese el precio de una compra para comparar el ahorro y el crédito de cada escenario.")
+    st.dataframe(
+        scenarios.assign(
+            Escenario=labels,
+            months_needed=scenarios['months_needed'].where(np.isfinite(scenarios['months_needed']))
+        )[columns],
+        hide_index=True,
+        width='stretch',
+        column_config={
+            'income': st.column_config.NumberColumn("Salario", format="$%,.0f"),
+            'rent': st.column_config.NumberColumn("Arriendo", format="$%,.0f"),
+            'risk_level': "Riesgo",
+            'remaining_income': st.column_config.NumberColumn("Sobrante mensual", format="$%,.0f"),
+            'monthly_save': st.column_config.NumberColumn("Ahorro mensual", format="$%,.0f"),
+            'months_needed': st.column_config.NumberColumn("Meses para la compra", format="%d"),
+            'loan_monthly_payment': st.column_config.NumberColumn("Cuota si financia", format="$%,.0f"),
+            'loan_total_interest': st.column_config.NumberColumn("Intereses si financia", format="$%,.0f")
+        }
+    )
+
+@st.fragment
+@profiled('ui.amortization_panel')
+def render_amortization_panel(item_price, loan_rate, loan_months, schedule):
+    extra_payment = st.number_input(
+        "Abono extra mensual a capital (COP)",
+        min_value=0,
+        value=0,
+        step=50000,
+        key="extra_payment",
+        persist_state="session"
+    )
+    if extra_payment > 0:
+        payoff = early_payoff(item_price, loan_rate, loan_months, extra_payment)
+        st.info(f"💡 Con el abono extra terminaría en {payoff['months']} meses "
+                f"({payoff['months_saved']} meses antes) y ahorraría ${payoff['interest_saved']:,.0f} en intereses.")
+    st.dataframe(schedule, hide_index=True, width='stretch')
+
+@st.fragment
+@profiled('ui.offer_comparison')
+def render_offer_comparison(item_price, available_wants):
+    rate_range = st.slider(
+        "Rango de tasas anuales (%)",
+        min_value=0.0,
+        max_value=60.0,
+        value=(12.0, 36.0),
+        step=0.5,
+        key="rate_range",
+        persist_state="session"
+    )
+    offer_terms = st.multiselect(
+        "Plazos a comparar (meses)",
+        [6, 12, 18, 24, 36, 48, 60, 72],
+        default=[12, 24, 36, 48],
+        key="offer_terms",
+        persist_state="session"
+    )
+    if offer_terms:
+        rates = np.arange(rate_range[0], rate_range[1] + 0.25, 0.5) / 100
+        offers = compare_offers(item_price, rates, sorted(offer_terms), available_wants)
+        affordable = offers['Dentro del presupuesto'].sum()
+        st.write(f"**{len(offers)} ofertas evaluadas**, {affordable} con cuota dentro de su presupuesto de deseos.")
+        st.dataframe(
+            offers,
+            hide_index=True,
+            width='stretch',
+            column_config={'Tasa anual': st.column_config.NumberColumn(format="percent")}
+        )
+
+@st.fragment
+@profiled('ui.purchase_form')
+def render_purchase_form(planner, store, user_id):
+    available_wants = PlannerView(planner).available_wants
+    
+    st.info(f"💡 **Presupuesto disponible mensual para compras:** ${max(0, available_wants):,.0f} COP")
+    
+    # Formulario para nueva compra
+    st.subheader("🛍️ Nueva Compra Planificada")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        item_name = st.text_input("¿Qué desea comprar?", placeholder="Ejemplo: iPhone 15, Laptop, Carro", key="item_name", persist_state="session")
+        item_price = st.number_input(
+            "Precio del producto (COP)", 
+            min_value=0, 
+            step=100000,
+            format="%d",
+            key="item_price",
+            persist_state="session"
+        )
+    
+    with col2:
+        priority = st.selectbox(
+            "Prioridad de la compra",
+            ["Alta", "Media", "Baja"],
+            key="priority",
+            persist_state="session"
+        )
+        
+        save_percentage = st.slider(
+            "¿Qué % de su presupuesto de deseos destinará a esta compra?",
+            min_value=10,
+            max_value=100,
+            value=50,
+            step=5,
+            key="save_percentage",
+            persist_state="session"
+        ) / 100
+        
+        with st.expander("⚙️ Condiciones del crédito a comparar"):
+            loan_rate = st.number_input(
+                "Tasa de interés anual (%)",
+                min_value=0.0,
+                max_value=100.0,
+                value=DEFAULT_ANNUAL_RATE * 100,
+                step=0.5,
+                key="loan_rate",
+                persist_state="session"
+            ) / 100
+            max_loan_months = st.slider(
+                "Plazo máximo del crédito (meses)",
+                min_value=6,
+                max_value=120,
+                value=DEFAULT_MAX_LOAN_MONTHS,
+                step=6,
+                key="max_loan_months",
+                persist_state="session"
+            )
+
+    if item_name and item_price > 0 and available_wants > 0:
+        purchase = purchase_plan(item_price, available_wants, save_percentage, loan_rate, max_loan_months)
+        plan = purchase['savings']
+        monthly_save = plan['monthly_save']
+        months_needed = plan['months_needed']
+        
+        # Información de la compra
+        st.subheader(f"📊 Plan de Ahorro: {item_name}")
+        
+        col_a, col_b, col_c, col_d = st.columns(4)
+        
+        with col_a:
+            st.metric("💰 Precio Total", f"${item_price:,.0f}")
+        
+        with col_b:
+            st.metric("💳 Ahorro Mensual", f"${monthly_save:,.0f}")
+        
+        with col_c:
+            st.metric("📅 Meses Necesarios", f"{months_needed}")
+        
+        with col_d:
+            st.metric("🎯 Fecha Objetivo", target_date(months_needed).strftime("%m/%Y"))
+        
+        # Mostrar validación del cálculo
+        st.info(f"✅ Validación: ${monthly_save:,.0f} × {months_needed} meses = ${plan['total_saved']:,.0f} COP")
+        
+        if plan['shortfall'] > 0:
+            st.warning(f"⚠️ Faltarían ${plan['shortfall']:,.0f} COP. Agregando 1 mes adicional.")
+            months_needed = plan['plan_months']
+            monthly_save = plan['plan_monthly_save']
+        
+        if st.button("💾 Guardar en mis compras planificadas", disabled=not user_id,
+                     help=None if user_id else "Ingrese su nombre de usuario y su clave en la barra lateral"):
+            store.add_plan(user_id, item_name, item_price, monthly_save, priority, target_date(months_needed))
+            store.save_planner(user_id, planner)
+            # La lista de compras guardadas está fuera de este fragmento
+            invalidate('plans', f"✅ {item_name} agregado a sus compras planificadas")
+        
+        # Gráfico de progreso de ahorro (el plan memorizado trae columnas de solo lectura)
+        fig_progress = progress_figure(pd.DataFrame(dict(purchase['progress'])), item_name)
+        
+        st.plotly_chart(fig_progress, width='stretch')
+        
+        # Recomendaciones para la compra
+        if months_needed <= 6:
+            st.markdown(f"""
+            <div class="success-card">
+                <h4>🎉 Compra Alcanzable</h4>
+                <p>Podrá comprar <strong>{item_name}</strong> en {months_needed} meses.</p>
+                <p><strong>Estrategia:</strong> Mantenga disciplina en el ahorro mensual.</p>
+            </div>
+            """, unsafe_allow_html=True)
+        elif months_needed <= 12:
+            st.markdown(f"""
+            <div class="warning-card">
+                <h4>⏰ Compra a Mediano Plazo</h4>
+                <p>Necesitará {months_needed} meses para comprar <strong>{item_name}</strong>.</p>
+                <p><strong>Sugerencias:</strong></p>
+                <ul>
+                    <li>Considere aumentar el % destinado al ahorro</li>
+                    <li>Busque ofertas o descuentos</li>
+                    <li>Evalúe comprar una versión más económica</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class="danger-card">
+                <h4>🚨 Compra a Muy Largo Plazo</h4>
+                <p>Necesitará {months_needed} meses para esta compra.</p>
+                <p><strong>Recomendaciones:</strong></p>
+                <ul>
+                    <li>Reconsidere si realmente necesita esta compra</li>
+                    <li>Aumente significativamente sus ingresos</li>
+                    <li>Reduzca otros gastos de deseos</li>
+                    <li>Busque alternativas más económicas</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Comparación con financiamiento
+        st.subheader("💳 Comparación: Ahorro vs Financiamiento")
+        
+        # Simulación de crédito con las condiciones elegidas
+        if months_needed > 3:
+            loan = purchase['loan']
+            monthly_payment = loan['monthly_payment']
+            loan_months = loan['loan_months']
+            total_interest = loan['total_interest']
             
-            elif available_wants <= 0:
-                st.error("❌ No tiene presupuesto disponible para nuevas compras. Primero optimice sus gastos actuales de deseos.")
+            col_credit1, col_credit2 = st.columns(2)
             
-            # Historial de compras planificadas (simulado)
-            st.subheader("📋 Mis Compras Planificadas")
+            with col_credit1:
+                st.markdown("### 💰 Ahorrando")
+                st.write(f"**Cuota mensual:** ${monthly_save:,.0f}")
+                st.write(f"**Total pagado:** ${item_price:,.0f}")
+                st.write(f"**Intereses:** $0")
+                st.write(f"**Tiempo:** {months_needed} meses")
             
-            # Esto sería idealmente guardado en una base de datos
-            sample_purchases = [
-                {"Producto": "Laptop Gaming", "Precio": 3500000, "Ahorro Mensual": 350000, "Meses Restantes": 7, "Progreso": 30},
-                {"Producto": "Viaje a Europa", "Precio": 8000000, "Ahorro Mensual": 400000, "Meses Restantes": 15, "Progreso": 25},
-                {"Producto": "iPhone 15", "Precio": 4500000, "Ahorro Mensual": 450000, "Meses Restantes": 2, "Progreso": 80}
-            ]
+            with col_credit2:
+                st.markdown(f"### 💳 Financiando ({loan['annual_rate']:.0%} anual)")
+                st.write(f"**Cuota mensual:** ${monthly_payment:,.0f}")
+                st.write(f"**Total pagado:** ${loan['total_paid']:,.0f}")
+                st.write(f"**Intereses:** ${total_interest:,.0f}")
+                st.write(f"**Tiempo:** {loan_months} meses")
             
-            if st.checkbox("Ver ejemplo de compras planificadas"):
-                df_purchases = pd.DataFrame(sample_purchases)
-                
-                for idx, purchase in df_purchases.iterrows():
-                    with st.expander(f"🛍️ {purchase['Producto']} - {purchase['Progreso']}% completado"):
-                        col_p1, col_p2, col_p3 = st.columns(3)
-                        
-                        with col_p1:
-                            st.metric("Precio", f"${purchase['Precio']:,.0f}")
-                        
-                        with col_p2:
-                            st.metric("Ahorro Mensual", f"${purchase['Ahorro Mensual']:,.0f}")
-                        
-                        with col_p3:
-                            st.metric("Meses Restantes", purchase['Meses Restantes'])
-                        
-                        # Barra de progreso
-                        progress_bar = st.progress(purchase['Progreso'] / 100)
-                        st.write(f"Progreso: {purchase['Progreso']}%")
+            if monthly_payment <= available_wants:
+                savings_vs_credit = total_interest
+                st.success(f"💡 **Ahorrando en lugar de financiar, evitará pagar ${savings_vs_credit:,.0f} en intereses.**")
+            else:
+                st.error(f"⚠️ **La cuota del crédito (${monthly_payment:,.0f}) excede su presupuesto disponible.**")
+            
+            with st.expander("📑 Tabla de amortización del crédito"):
+                render_amortization_panel(item_price, loan_rate, loan_months, pd.DataFrame(dict(purchase['schedule'])))
+            
+            with st.expander("🔎 Comparar ofertas de crédito"):
+                render_offer_comparison(item_price, available_wants)
+    
+    elif available_wants <= 0:
+        st.error("❌ No tiene presupuesto disponible para nuevas compras. Primero optimice sus gastos actuales de deseos.")
+
+@st.fragment
+@profiled('ui.saved_plans')
+def render_saved_plans(store, user_id):
+    # Compras planificadas guardadas por el usuario
+    st.subheader("📋 Mis Compras Planificadas")
+    if 'flash' in st.session_state:
+        st.success(st.session_state.pop('flash'))
+    
+    if not user_id:
+        st.info("👤 Ingrese su nombre de usuario y su clave en la barra lateral para guardar y ver sus compras planificadas.")
+    else:
+        # Se relee de SQLite solo cuando cambia el usuario o se guarda una compra
+        cached = st.session_state.get('plans_frame')
+        signature = (user_id, dependency_version('plans'))
+        if cached is None or cached[0] != signature:
+            cached = st.session_state.plans_frame = (signature, store.load_plans_frame(user_id))
+        purchases = cached[1]
+        if purchases.empty:
+            st.info("Aún no tiene compras guardadas. Planifique una compra y guárdela con el botón 💾.")
         else:
-            st.warning("⚠️ Complete la información de ingresos para usar el planificador de compras.")
+            st.dataframe(
+                purchases.drop(columns='id'),
+                hide_index=True,
+                width='stretch',
+                column_config={
+                    'Precio': st.column_config.NumberColumn(format="$%,.0f"),
+                    'Ahorro Mensual': st.column_config.NumberColumn(format="$%,.0f"),
+                    'Progreso': st.column_config.ProgressColumn(format="percent", min_value=0, max_value=1)
+                }
+            )
+            render_contribution_form(store, user_id, purchases)
+
+def render_contribution_form(store, user_id, purchases):
+    # Registrar lo ahorrado actualiza el progreso, los meses restantes y el calendario
+    col1, col2, col3 = st.columns([2, 2, 1], vertical_alignment="bottom")
+    with col1:
+        plan_id = st.selectbox(
+            "Compra",
+            purchases['id'].tolist(),
+            format_func=dict(zip(purchases['id'], purchases['Producto'])).get,
+            key="contribution_plan"
+        )
+    monthly_save = purchases.loc[purchases['id'] == plan_id, 'Ahorro Mensual']
+    with col2:
+        amount = st.number_input(
+            "Aporte ahorrado (COP)",
+            min_value=0,
+            value=int(monthly_save.iloc[0]) if len(monthly_save) else 0,
+            step=50000,
+            key="contribution_amount"
+        )
+    with col3:
+        if st.button("💵 Registrar aporte", disabled=amount <= 0):
+            store.add_contribution(user_id, plan_id, amount)
+            invalidate('plans', f"✅ Aporte de ${amount:,.0f} registrado")
+
+@st.fragment
+@profiled('ui.goal_schedule')
+def render_goal_schedule(planner, store, user_id):
+    # Todas las compras guardadas compiten por el mismo presupuesto mensual
+    cached = st.session_state.get('plans_columns')
+    signature = (user_id, dependency_version('plans'))
+    if cached is None or cached[0] != signature:
+        cached = st.session_state.plans_columns = (signature, store.load_plans(user_id))
+    plans = cached[1]
+    if not plans['id']:
+        return
+
+    st.subheader("🗓️ Calendario de Ahorro por Prioridades")
+    view = PlannerView(planner)
+    include_savings = st.checkbox(
+        "Incluir el presupuesto de ahorro (20%)",
+        key="schedule_include_savings",
+        persist_state="session"
+    )
+    budget = max(0, view.available_wants) + (view.budgets['savings_budget'] if include_savings else 0)
+    if budget <= 0:
+        st.warning("⚠️ No hay presupuesto disponible para ahorrar: ajuste sus deseos o incluya el presupuesto de ahorro.")
+        return
+
+    schedule = schedule_plans(plans, budget)
+    completion = schedule['completion_month']
+    st.caption(f"Cada mes se destinan ${budget:,.0f} COP: primero a las compras de prioridad Alta y, "
+               "dentro de cada prioridad, a la de fecha objetivo más cercana.")
+    st.dataframe(
+        {
+            'Producto': plans['product'],
+            'Prioridad': priority_labels(plans['priority']),
+            'Fecha Objetivo': plans['target_date'],
+            'Aporte este Mes': schedule['allocation'][:, 0] if schedule['horizon'] else np.zeros(len(completion)),
+            'Meses': np.where(np.isfinite(completion), completion, np.nan),
+            'Fecha Estimada': [target_date(int(m), schedule['start']).strftime('%Y-%m-%d') if np.isfinite(m) else "—"
+                               for m in completion],
+            'Estado': np.where(schedule['late'], "⚠️ Después de la fecha objetivo", "✅ A tiempo")
+        },
+        hide_index=True,
+        width='stretch',
+        column_config={
+            'Aporte este Mes': st.column_config.NumberColumn(format="$%,.0f"),
+            'Meses': st.column_config.NumberColumn(format="%d")
+        }
+    )
+    if schedule['horizon']:
+        st.plotly_chart(schedule_figure(schedule['allocation'], plans['priority']), width='stretch')
+
+        with st.expander("📒 Flujo de caja mes a mes"):
+            # Cada compra se paga con el fondo en el mes de su último aporte; si el ahorro
+            # se destina a las compras ya va dentro de sus aportes
+            bought = np.isfinite(completion) & (completion > 0)
+            ledger = cash_flow_ledger(
+                planner.income, view.needs_total, view.wants_total,
+                0 if include_savings else view.budgets['savings_budget'],
+                months=schedule['horizon'], start=schedule['start'],
+                purchase_contributions=schedule['monthly_total'],
+                purchases={'price': np.asarray(plans['price'])[bought], 'month': completion[bought] - 1}
+            )
+            st.dataframe(
+                ledger_frame(ledger),
+                hide_index=True,
+                width='stretch',
+                column_config={
+                    column: st.column_config.NumberColumn(format="$%,.0f")
+                    for column in ('Ingresos', 'Necesidades', 'Deseos', 'Ahorro', 'Aporte a Compras', 'Compras',
+                                   'Cuotas de Crédito', 'Caja Libre', 'Saldo de Caja', 'Saldo de Ahorro',
+                                   'Fondo de Compras')
+                }
+            )
+
+@profiled('ui.purchases_tab')
+def render_purchases_tab(planner, store, user_id):
+    st.header("📈 Planificador de Compras Importantes")
+    
+    if planner.income > 0:
+        render_purchase_form(planner, store, user_id)
+        render_saved_plans(store, user_id)
+        if user_id:
+            render_goal_schedule(planner, store, user_id)
+    else:
+        st.warning("⚠️ Complete la información de ingresos para usar el planificador de compras.")
+
+def render_profiling_panel():
+    # Panel para desarrolladores: solo aparece con FINANCEFLOW_PROFILE=1
+    import pandas as pd
+
+    with st.sidebar.expander("🛠️ Perfilado", expanded=False):
+        snapshot = PROFILER.snapshot()
+        if snapshot['sections']:
+            sections = pd.DataFrame.from_dict(snapshot['sections'], orient='index').sort_values('total_ms', ascending=False)
+            st.dataframe(sections, column_config={
+                column: st.column_config.NumberColumn(format="%.2f") for column in sections.columns if column.endswith('_ms')
+            })
+        st.caption(" · ".join(f"{name}: {value}" for name, value in snapshot['counters'].items()))
+        st.download_button("Descargar JSON", PROFILER.to_json(), file_name="financeflow-profile.json", mime="application/json")
+        st.download_button("Descargar Prometheus", PROFILER.to_prometheus(), file_name="financeflow-profile.prom", mime="text/plain")
+        if st.button("Reiniciar mediciones"):
+            PROFILER.reset()
+
+# Función principal de la aplicación
+def main():
+    # Configuración de la página
+    st.set_page_config(
+        page_title="Planificador Financiero 50-30-20",
+        page_icon="💰",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    PROFILER.count('app.reruns')
+    st.markdown(page_styles(STYLES_PATH, os.path.getmtime(STYLES_PATH)), unsafe_allow_html=True)
+
+    # Header principal
+    with PROFILER.section('ui.header'):
+        st.markdown("""
+    <div class="main-header">
+        <h1>💰FinanceFlow-Pro</h1>
+        <h2>Planificador Financiero Inteligente</h1>
+        <p>Basado en el Modelo 50-30-20 | Análisis de Riesgo Personalizado</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Inicializar session state
+    if 'planner' not in st.session_state:
+        st.session_state.planner = FinancialPlanner()
+    
+    planner = st.session_state.planner
+    store = default_store()
+    
+    user_id = render_sidebar(planner, store)
+    
+    # Tabs principales: con on_change="rerun" solo la pestaña visible queda abierta
+    # y las demás no calculan ni dibujan nada en la recarga
+    tabs = st.tabs(TAB_LABELS, key="active_tab", on_change="rerun")
+    
+    if tabs[0].open:
+        with tabs[0]:
+            render_needs_tab(planner)
+    if tabs[1].open:
+        with tabs[1]:
+            render_wants_tab(planner)
+    if tabs[2].open:
+        with tabs[2]:
+            render_savings_tab(planner)
+    if tabs[3].open:
+        with tabs[3]:
+            render_analysis_tab(planner)
+    if tabs[4].open:
+        with tabs[4]:
+            render_purchases_tab(planner, store, user_id)
     
     # Footer con información adicional
-    st.markdown("---")
-    st.markdown("""
+    with PROFILER.section('ui.footer'):
+        st.markdown("---")
+        st.markdown("""
     <div style="text-align: center; color: #666; padding: 2rem;">
         <h3>💡 Sobre el Modelo 50-30-20</h3>
         <p>Este modelo de presupuesto fue popularizado por Elizabeth Warren y sugiere:</p>
@@ -1055,5 +1313,9 @@ def main():
     </div>
     """, unsafe_allow_html=True)
 
+    if PROFILER.enabled:
+        render_profiling_panel()
+
 if __name__ == "__main__":
-    main()
+    with PROFILER.section('app.rerun'):
+        main()
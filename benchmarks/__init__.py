@@ -0,0 +1 @@
+"""Suite de rendimiento y pruebas de carga de FinanceFlow-Pro (ver benchmarks/run.py)."""
@@ -0,0 +1,161 @@
+"""Casos de la suite de rendimiento.
+
+Cada caso recibe la cantidad de hogares y retorna una función sin argumentos
+que procesa todos esos hogares una vez. Los datos se generan con semilla fija
+para que las corridas sean comparables. Los casos escalares (un objeto o una
+llamada por hogar) y los de gráficos tienen una escala máxima: por encima de
+ella el costo lo cubren sus equivalentes vectorizados.
+"""
+import inspect
+
+import numpy as np
+import pandas as pd
+
+from financeflow import FinancialPlanner, InvestmentAdvisor, NEEDS_CATEGORIES, WANTS_CATEGORIES
+from financeflow.batch import BatchFinancialPlanner
+from financeflow.charts import distribution_figure, new_distribution_figure, progress_figure
+from financeflow.cli import purchases_chunk
+from financeflow.progress import progress_matrix
+from financeflow.purchases import purchase_plan, savings_progress
+
+SEED = 2024
+
+# Nombre -> (función de preparación, escala máxima o None)
+CASES = {}
+
+def case(name, max_scale=None):
+    def decorator(setup):
+        CASES[name] = (setup, max_scale)
+        return setup
+    return decorator
+
+def households(n, seed=SEED):
+    """Ingresos y gastos sintéticos en COP, con una parte de los hogares sobre el presupuesto."""
+    rng = np.random.default_rng(seed)
+    income = rng.uniform(1_000_000, 12_000_000, n).round(-3)
+    needs = income[:, None] * rng.dirichlet(np.ones(len(NEEDS_CATEGORIES)), n) * rng.uniform(0.3, 0.8, (n, 1))
+    wants = income[:, None] * rng.dirichlet(np.ones(len(WANTS_CATEGORIES)), n) * rng.uniform(0.1, 0.4, (n, 1))
+    return income, needs.round(-3), wants.round(-3)
+
+def purchases(n, seed=SEED):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'item_price': rng.uniform(500_000, 20_000_000, n).round(-3),
+        'available_wants': rng.uniform(100_000, 3_000_000, n).round(-3),
+        'save_percentage': rng.choice([0.3, 0.5, 0.7, 1.0], n),
+    })
+
+@case('planner.scalar', max_scale=100_000)
+def planner_scalar(n):
+    income, needs, wants = households(n)
+    planners = []
+    for i in range(n):
+        planner = FinancialPlanner()
+        planner.income = income[i]
+        planner.needs = dict(zip(NEEDS_CATEGORIES, needs[i]))
+        planner.wants = dict(zip(WANTS_CATEGORIES, wants[i]))
+        planners.append(planner)
+    rents = (needs[:, 0].tolist(), (needs[:, 0] + 1000).tolist())
+    state = {'round': 0}
+
+    def run():
+        # Se alterna el arriendo en cada vuelta para que los totales y el riesgo se recalculen
+        state['round'] += 1
+        for planner, rent in zip(planners, rents[state['round'] % 2]):
+            planner.needs['rent'] = rent
+            planner.calculate_needs_total()
+            planner.calculate_wants_total()
+            planner.get_risk_analysis()
+    return run
+
+@case('planner.batch')
+def planner_batch(n):
+    income, needs, wants = households(n)
+
+    def run():
+        planner = BatchFinancialPlanner(income, needs, wants)
+        planner.calculate_wants_total()
+        planner.get_risk_analysis()
+    return run
+
+@case('advisor.scalar', max_scale=100_000)
+def advisor_scalar(n):
+    amounts = (households(n)[0] * 0.2 * 12).tolist()
+    get_investment_options = InvestmentAdvisor.get_investment_options
+
+    def run():
+        for amount in amounts:
+            get_investment_options(amount)
+    return run
+
+@case('advisor.batch')
+def advisor_batch(n):
+    amounts = households(n)[0] * 0.2 * 12
+
+    def run():
+        InvestmentAdvisor.get_investment_options_batch(amounts)
+    return run
+
+@case('purchases.scalar', max_scale=1_000)
+def purchases_scalar(n):
+    # Plan completo de la pestaña 5 (ahorro, progreso, crédito y cronograma) sin la memorización
+    plan = inspect.unwrap(purchase_plan)
+    rows = purchases(n).itertuples(index=False)
+    rows = [(row.item_price, row.available_wants, row.save_percentage) for row in rows]
+
+    def run():
+        for item_price, available_wants, save_percentage in rows:
+            plan(item_price, available_wants, save_percentage)
+    return run
+
+@case('purchases.batch')
+def purchases_batch(n):
+    frame = purchases(n)
+
+    def run():
+        purchases_chunk(frame)
+    return run
+
+@case('progress.series', max_scale=1_000)
+def progress_series(n):
+    frame = purchases(n)
+    rows = list(zip(frame['item_price'] / 12, [12] * n, frame['item_price']))
+
+    def run():
+        for monthly_save, months, goal in rows:
+            savings_progress(monthly_save, months, goal)
+    return run
+
+@case('progress.matrix')
+def progress_batch(n):
+    frame = purchases(n)
+    months = np.random.default_rng(SEED).integers(1, 25, n)
+
+    def run():
+        progress_matrix(frame['item_price'] / months, months, frame['item_price'], horizon=24)
+    return run
+
+@case('charts.distribution', max_scale=100)
+def charts_distribution(n):
+    income, needs, wants = households(n)
+    rows = [(income[i], needs[i].sum(), wants[i].sum(),
+             {'needs_budget': income[i] * 0.5, 'wants_budget': income[i] * 0.3, 'savings_budget': income[i] * 0.2})
+            for i in range(n)]
+
+    figure = new_distribution_figure()
+
+    def run():
+        # Como una sesión cuyos montos cambian en cada recarga: se parcha su figura y se serializa
+        for row in rows:
+            distribution_figure(*row, figure=figure).to_dict()
+    return run
+
+@case('charts.progress', max_scale=100)
+def charts_progress(n):
+    frame = purchases(n)
+    series = [savings_progress(price / 12, 12, price) for price in frame['item_price']]
+
+    def run():
+        for df_progress in series:
+            progress_figure(df_progress, 'Meta').to_dict()
+    return run
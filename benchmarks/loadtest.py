@@ -0,0 +1,210 @@
+"""Prueba de carga sin navegador: muchas sesiones simultáneas de app.py en una sola máquina.
+
+    python -m benchmarks.loadtest --sessions 40 --concurrency 8
+
+Cada sesión es un AppTest de Streamlit que recorre el flujo de un usuario:
+nombre, salario, gastos básicos, deseos, una compra guardada y el análisis
+completo. AppTest instala un runtime global durante cada ejecución, así que
+no admite dos ejecuciones a la vez en un mismo proceso: la concurrencia se
+logra con un proceso por sesión simultánea, y cada uno atiende sus sesiones
+en serie. Todas comparten la base SQLite (una temporal por corrida).
+AppTest recarga el script completo en cada interacción, incluso dentro de
+fragmentos, así que las latencias son una cota superior de las del servidor.
+
+Reporta percentiles de latencia por paso, recargas por segundo y la memoria
+residente que retiene cada sesión adicional. Solo usa el sistema de archivos
+local (Linux, por /proc).
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+QUANTILES = (50, 95, 99)
+
+def resident_bytes():
+    # Memoria residente actual del proceso (Linux)
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+def _percentile(ordered, q):
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+def summarize(samples):
+    ordered = sorted(samples)
+    summary = {'count': len(ordered), 'mean_ms': statistics.fmean(ordered) * 1000}
+    for q in QUANTILES:
+        summary[f'p{q}_ms'] = _percentile(ordered, q) * 1000
+    summary['max_ms'] = ordered[-1] * 1000
+    return summary
+
+class Session:
+    """Un usuario simulado: recorre el flujo y guarda la duración de cada recarga por paso."""
+
+    def __init__(self, index, timeout=60, think_time=0.0):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.think_time = think_time
+        self.latencies = []
+        self.app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.tabs = None
+
+    def rerun(self, step, tab=None):
+        if tab is not None:
+            # AppTest no conserva la pestaña activa entre ejecuciones
+            self.app.session_state['active_tab'] = self.tabs[tab]
+        start = time.perf_counter()
+        self.app.run()
+        self.latencies.append((step, time.perf_counter() - start))
+        if self.app.exception:
+            raise RuntimeError(f"Sesión {self.index}, paso {step!r}: {self.app.exception[0].value}")
+        if self.think_time:
+            time.sleep(self.think_time)
+
+    def fill(self, step, tab, values):
+        # Cada campo es una interacción y por lo tanto una recarga
+        for position, value in enumerate(values):
+            inputs = self.app.main.number_input
+            if position >= len(inputs):
+                break
+            inputs[position].set_value(value)
+            self.rerun(step, tab)
+
+    def run(self):
+        app = self.app
+        income = 2_000_000 + (self.index % 20) * 500_000
+
+        self.rerun('inicio')
+        self.tabs = [tab.label for tab in app.tabs]
+        app.sidebar.text_input[0].set_value(f"carga-{self.index}")
+        app.sidebar.text_input[1].set_value(f"clave-de-carga-{self.index}")
+        self.rerun('usuario', 0)
+        app.sidebar.number_input[0].set_value(income)
+        self.rerun('ingreso', 0)
+
+        self.fill('necesidades', 0, [round(income * share, -3) for share in (0.25, 0.04, 0.12, 0.05, 0.03, 0.02)])
+        self.rerun('cambio de pestaña', 1)
+        self.fill('deseos', 1, [round(income * share, -3) for share in (0.03, 0.04, 0.02, 0.02, 0.05, 0.02)])
+
+        self.rerun('cambio de pestaña', 4)
+        app.text_input(key='item_name').set_value(f"Compra {self.index}")
+        app.number_input(key='item_price').set_value(income * 2)
+        self.rerun('compra', 4)
+        next(button for button in app.button if button.label.startswith('💾')).click()
+        self.rerun('guardar compra', 4)
+
+        self.rerun('análisis', 3)
+        return self
+
+def _run_sessions(indices, timeout, think_time):
+    # Proceso de trabajo: ejecuta sus sesiones en serie y las mantiene vivas para medir lo que retienen
+    sessions = []
+    latencies = []
+    errors = []
+    rss = [resident_bytes()]
+    for index in indices:
+        session = Session(index, timeout, think_time)
+        try:
+            session.run()
+        except Exception as error:
+            errors.append(f"{type(error).__name__}: {error}")
+        sessions.append(session)
+        latencies.extend(session.latencies)
+        gc.collect()
+        rss.append(resident_bytes())
+
+    planner_bytes = [session.app.session_state['planner'].memory_footprint()['total']
+                     for session in sessions if 'planner' in session.app.session_state]
+    return {'latencies': latencies, 'errors': errors, 'rss': rss, 'planner_bytes': planner_bytes}
+
+def run_load(sessions, concurrency, timeout=60, think_time=0.0):
+    """Ejecuta `sessions` sesiones con `concurrency` procesos a la vez y resume los resultados."""
+    concurrency = max(1, min(concurrency, sessions))
+    shards = [list(range(worker, sessions, concurrency)) for worker in range(concurrency)]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(_run_sessions, shards, [timeout] * concurrency, [think_time] * concurrency))
+    elapsed = time.perf_counter() - start
+
+    samples = [latency for result in results for _, latency in result['latencies']]
+    by_step = {}
+    for result in results:
+        for step, latency in result['latencies']:
+            by_step.setdefault(step, []).append(latency)
+
+    # La primera sesión de cada proceso paga las importaciones; las siguientes muestran lo que agrega una sesión
+    retained = [after - before for result in results for before, after in zip(result['rss'][1:], result['rss'][2:])]
+    planner_bytes = [size for result in results for size in result['planner_bytes']]
+    errors = [error for result in results for error in result['errors']]
+    return {
+        'sessions': sessions,
+        'concurrency': concurrency,
+        'elapsed_seconds': elapsed,
+        'reruns': len(samples),
+        'reruns_per_second': len(samples) / elapsed if elapsed else 0.0,
+        'sessions_per_minute': 60 * sessions / elapsed if elapsed else 0.0,
+        'errors': errors,
+        'latency': summarize(samples) if samples else None,
+        'steps': {step: summarize(values) for step, values in by_step.items()},
+        'memory': {
+            'process_rss_bytes': max(result['rss'][-1] for result in results),
+            'rss_per_session_bytes': statistics.median(retained) if retained else None,
+            'planner_bytes': statistics.fmean(planner_bytes) if planner_bytes else None
+        }
+    }
+
+def _print_report(report):
+    latency = report['latency'] or {}
+    print(f"{report['sessions']} sesiones, {report['concurrency']} concurrentes, "
+          f"{report['elapsed_seconds']:.1f} s, {len(report['errors'])} errores")
+    print(f"{report['reruns']} recargas ({report['reruns_per_second']:.1f}/s, "
+          f"{report['sessions_per_minute']:.1f} sesiones/min)")
+    if latency:
+        print("latencia total: " + ", ".join(f"p{q} {latency[f'p{q}_ms']:.0f} ms" for q in QUANTILES)
+              + f", máx {latency['max_ms']:.0f} ms")
+    for step, stats in report['steps'].items():
+        print(f"  {step:<20} n={stats['count']:<5} " +
+              " ".join(f"p{q}={stats[f'p{q}_ms']:.0f}ms" for q in QUANTILES))
+    memory = report['memory']
+    print(f"memoria residente por proceso: {memory['process_rss_bytes'] / 2**20:.1f} MiB")
+    if memory['rss_per_session_bytes'] is not None:
+        print(f"memoria por sesión adicional: {memory['rss_per_session_bytes'] / 2**20:.2f} MiB")
+    if memory['planner_bytes']:
+        print(f"planificador en sesión: {memory['planner_bytes']:.0f} bytes")
+    for error in report['errors'][:5]:
+        print(f"ERROR {error}", file=sys.stderr)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.loadtest', description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=20, help="Sesiones simuladas en total")
+    parser.add_argument('--concurrency', type=int, default=5, help="Sesiones ejecutándose a la vez (un proceso cada una)")
+    parser.add_argument('--timeout', type=float, default=60, help="Segundos máximos por recarga")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Pausa en segundos entre interacciones")
+    parser.add_argument('--db', help="Base SQLite a usar (por defecto una temporal)")
+    parser.add_argument('--output', help="Guarda el reporte completo en un JSON")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        # Debe fijarse antes de que la app importe financeflow.store; los procesos la heredan
+        os.environ['FINANCEFLOW_DB'] = args.db or os.path.join(directory, 'loadtest.db')
+        report = run_load(args.sessions, args.concurrency, args.timeout, args.think_time)
+
+    _print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2, ensure_ascii=False)
+    return 1 if report['errors'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
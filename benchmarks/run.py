@@ -0,0 +1,162 @@
+"""Suite de rendimiento del motor: rendimiento (hogares/s) y memoria pico por caso y escala.
+
+    python -m benchmarks.run                   # compara contra benchmarks/baseline.json
+    python -m benchmarks.run --save            # reescribe la línea base
+    python -m benchmarks.run --scales 1,1000 --cases planner.batch,advisor.batch
+
+Retorna 1 si algún caso pierde más de `--threshold` de rendimiento mediano
+(sin solaparse con las muestras de la línea base) o usa más de esa fracción
+de memoria adicional frente a la línea base.
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+
+from .cases import CASES
+
+DEFAULT_SCALES = (1, 1_000, 100_000, 1_000_000)
+DEFAULT_THRESHOLD = 0.25
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Duración mínima de cada muestra de tiempo
+MIN_SAMPLE_SECONDS = 0.5
+
+# Diferencias de memoria por debajo de esto se consideran ruido del intérprete
+MEMORY_SLACK = 64 * 1024
+
+def measure(run, scale, repeat, sample_seconds=MIN_SAMPLE_SECONDS):
+    """Tiempo mediano por vuelta en `repeat` muestras de al menos `sample_seconds` y memoria pico de una vuelta."""
+    timer = timeit.Timer(run)
+    number, elapsed = timer.autorange()
+    # Cada muestra dura lo suficiente para que el ruido del planificador del sistema se promedie
+    number = max(number, math.ceil(number * sample_seconds / elapsed))
+    times = [t / number for t in timer.repeat(repeat, number)]
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(times)
+    return {
+        'seconds': median,
+        'best_seconds': min(times),
+        'worst_seconds': max(times),
+        'throughput': scale / median,
+        'peak_bytes': peak
+    }
+
+def run_suite(cases, scales, repeat=5, sample_seconds=MIN_SAMPLE_SECONDS, log=None):
+    results = {}
+    for name in cases:
+        setup, max_scale = CASES[name]
+        for scale in scales:
+            if max_scale is not None and scale > max_scale:
+                continue
+            run = setup(scale)
+            results.setdefault(name, {})[str(scale)] = measure(run, scale, repeat, sample_seconds)
+            del run
+            if log:
+                log(name, scale, results[name][str(scale)])
+    return results
+
+def compare(results, baseline, threshold):
+    """Regresiones frente a la línea base: lista de (caso, escala, métrica, base, actual).
+
+    El rendimiento se compara por la mediana, y solo cuenta como regresión si
+    además la mejor muestra actual es más lenta que la peor de la línea base:
+    en los casos dominados por el ruido (los escalares de pocas vueltas) las
+    muestras se solapan y no hacen fallar la corrida.
+    """
+    regressions = []
+    for name, scales in results.items():
+        for scale, current in scales.items():
+            reference = baseline.get(name, {}).get(scale)
+            if reference is None:
+                continue
+            slower = current['throughput'] < reference['throughput'] * (1 - threshold)
+            apart = current['best_seconds'] > reference.get('worst_seconds', reference['seconds'])
+            if slower and apart:
+                regressions.append((name, scale, 'throughput', reference['throughput'], current['throughput']))
+            limit = max(reference['peak_bytes'] * (1 + threshold), reference['peak_bytes'] + MEMORY_SLACK)
+            if current['peak_bytes'] > limit:
+                regressions.append((name, scale, 'peak_bytes', reference['peak_bytes'], current['peak_bytes']))
+    return regressions
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count()
+    }
+
+def _print_result(name, scale, result):
+    print(f"{name:<22} {scale:>9,} {result['throughput']:>16,.0f} hogares/s "
+          f"{result['peak_bytes'] / 2**20:>10.2f} MiB", flush=True)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run', description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', default=','.join(map(str, DEFAULT_SCALES)),
+                        help="Cantidades de hogares separadas por comas")
+    parser.add_argument('--cases', default=','.join(CASES), help="Casos a ejecutar, separados por comas")
+    parser.add_argument('--repeat', type=int, default=5, help="Muestras por caso y escala")
+    parser.add_argument('--sample-seconds', type=float, default=MIN_SAMPLE_SECONDS,
+                        help="Duración mínima de cada muestra")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Fracción de pérdida tolerada antes de fallar")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Archivo JSON de la línea base")
+    parser.add_argument('--save', action='store_true', help="Guarda los resultados como nueva línea base")
+    parser.add_argument('--output', help="Guarda también los resultados de esta corrida en un JSON")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    cases = [name.strip() for name in args.cases.split(',') if name.strip()]
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        print(f"Casos desconocidos: {', '.join(unknown)} (disponibles: {', '.join(CASES)})", file=sys.stderr)
+        return 2
+    scales = [int(scale) for scale in args.scales.split(',')]
+
+    results = run_suite(cases, scales, args.repeat, args.sample_seconds, log=_print_result)
+    report = {'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2)
+
+    if args.save:
+        with open(args.baseline, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2)
+            output.write('\n')
+        print(f"Línea base guardada en {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No hay línea base en {args.baseline}; ejecute con --save para crearla", file=sys.stderr)
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as source:
+        baseline = json.load(source)
+    regressions = compare(results, baseline['results'], args.threshold)
+    for name, scale, metric, reference, current in regressions:
+        print(f"REGRESIÓN {name} @ {int(scale):,}: {metric} {reference:,.0f} -> {current:,.0f}", file=sys.stderr)
+    if baseline.get('environment') != report['environment']:
+        print("Aviso: la línea base se midió en otro entorno", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Motor de cálculo de FinanceFlow-Pro, independiente de Streamlit.
+
+El núcleo (planificador, asesor, plan de compras y crédito) es Python puro.
+Los componentes que requieren NumPy, pandas o Plotly se cargan solo cuando
+se acceden por primera vez.
+"""
+import importlib
+
+from .planner import (
+    FinancialPlanner,
+    CategoryVector,
+    FamilyInfo,
+    NEEDS_CATEGORIES,
+    WANTS_CATEGORIES,
+    RISK_LEVELS,
+    RISK_COLORS,
+    hourly_rate,
+)
+from .advisor import InvestmentAdvisor, InvestmentCatalog, InvestmentOption, CATALOG
+from .purchases import (
+    plan_savings,
+    purchase_plan,
+    loan_quote,
+    loan_schedule,
+    target_date,
+    savings_progress,
+    DEFAULT_ANNUAL_RATE,
+    DEFAULT_MAX_LOAN_MONTHS,
+)
+from .cache import LRUCache, memoize
+
+# Atributos de carga diferida: nombre -> submódulo que lo define
+_LAZY_ATTRIBUTES = {
+    'BatchFinancialPlanner': 'financeflow.batch',
+    'progress_matrix': 'financeflow.progress',
+    'amortization_schedule': 'financeflow.amortization',
+    'rate_sweep': 'financeflow.amortization',
+    'project_option': 'financeflow.montecarlo',
+}
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'financeflow' has no attribute {name!r}")
+
+__all__ = [
+    'FinancialPlanner',
+    'CategoryVector',
+    'FamilyInfo',
+    'InvestmentAdvisor',
+    'InvestmentCatalog',
+    'InvestmentOption',
+    'CATALOG',
+    'NEEDS_CATEGORIES',
+    'WANTS_CATEGORIES',
+    'RISK_LEVELS',
+    'RISK_COLORS',
+    'hourly_rate',
+    'plan_savings',
+    'purchase_plan',
+    'loan_quote',
+    'loan_schedule',
+    'DEFAULT_ANNUAL_RATE',
+    'DEFAULT_MAX_LOAN_MONTHS',
+    'target_date',
+    'savings_progress',
+    'LRUCache',
+    'memoize',
+    *_LAZY_ATTRIBUTES,
+]
@@ -0,0 +1,171 @@
+import math
+from bisect import bisect_right
+
+from .profiling import profiled
+
+class InvestmentOption:
+    """Registro inmutable de una opción de inversión del catálogo.
+
+    Admite `option['name']` además de `option.name` para conservar el acceso
+    tipo dict de versiones anteriores.
+    """
+
+    __slots__ = ('id', 'name', 'risk', 'expected_return', 'description', 'min_amount', 'liquidity', 'tier_from', 'tier_to')
+
+    def __init__(self, id, name, risk, expected_return, description, min_amount, liquidity, tier_from=0, tier_to=math.inf):
+        for slot, value in zip(self.__slots__, (id, name, risk, expected_return, description, min_amount, liquidity, tier_from, tier_to)):
+            object.__setattr__(self, slot, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("InvestmentOption es inmutable")
+
+    # Al ser inmutable, copiar devuelve el mismo registro; pickle lo reconstruye por sus campos
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (InvestmentOption, tuple(getattr(self, slot) for slot in self.__slots__))
+
+    def __getitem__(self, key):
+        if key == 'return':
+            return self.expected_return
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __repr__(self):
+        return f"InvestmentOption(id={self.id}, name={self.name!r})"
+
+    def is_offered_for(self, amount):
+        # Rango de montos anuales [tier_from, tier_to) en el que se recomienda la opción
+        return self.tier_from <= amount < self.tier_to
+
+class InvestmentCatalog:
+    """Catálogo construido una sola vez con índices ordenados para búsquedas por bisección.
+
+    Los umbrales de nivel salen de los rangos `tier_from`/`tier_to` de cada
+    opción; para cada nivel se guarda la tupla de opciones ya resuelta, así que
+    `lookup` no crea listas ni dicts.
+    """
+
+    __slots__ = ('options', 'thresholds', '_tiers', '_min_amounts', '_affordable', '_tables')
+
+    def __init__(self, options):
+        self.options = tuple(options)
+        bounds = {b for option in self.options for b in (option.tier_from, option.tier_to) if math.isfinite(b)}
+        self.thresholds = tuple(sorted(bounds))
+
+        # Representante de cada nivel: el umbral inferior (o -inf para el primero)
+        representatives = (-math.inf,) + self.thresholds
+        self._tiers = tuple(
+            tuple(option for option in self.options if option.is_offered_for(amount))
+            for amount in representatives
+        )
+
+        # Índice por monto mínimo: el prefijo k contiene las opciones con min_amount <= monto
+        by_min_amount = sorted(self.options, key=lambda option: option.min_amount)
+        self._min_amounts = tuple(option.min_amount for option in by_min_amount)
+        self._affordable = tuple(tuple(by_min_amount[:k]) for k in range(len(by_min_amount) + 1))
+        self._tables = None
+
+    def __len__(self):
+        return len(self.options)
+
+    def __getitem__(self, option_id):
+        return self.options[option_id]
+
+    @property
+    def tiers(self):
+        # Tupla de opciones recomendadas por nivel, en orden de umbral
+        return self._tiers
+
+    def tier_index(self, amount):
+        return bisect_right(self.thresholds, amount)
+
+    def lookup(self, amount):
+        # Opciones recomendadas para un monto anual
+        return self._tiers[bisect_right(self.thresholds, amount)]
+
+    def affordable(self, amount):
+        # Opciones cuyo monto mínimo ya se alcanza, ordenadas por monto mínimo
+        return self._affordable[bisect_right(self._min_amounts, amount)]
+
+    def _batch_tables(self):
+        if self._tables is None:
+            import numpy as np
+
+            width = max(len(tier) for tier in self._tiers)
+            ids = np.full((len(self._tiers), width), -1, dtype=np.int16)
+            mask = np.zeros((len(self._tiers), len(self.options)), dtype=bool)
+            for tier, options in enumerate(self._tiers):
+                ids[tier, :len(options)] = [option.id for option in options]
+                mask[tier, [option.id for option in options]] = True
+            ids.setflags(write=False)
+            mask.setflags(write=False)
+            self._tables = (np.asarray(self.thresholds, dtype=np.float64), ids, mask)
+        return self._tables
+
+    def batch_tiers(self, amounts):
+        import numpy as np
+
+        thresholds, _, _ = self._batch_tables()
+        return np.searchsorted(thresholds, np.asarray(amounts, dtype=np.float64), side='right')
+
+    def batch_option_ids(self, amounts):
+        """IDs de opciones recomendadas por monto: matriz (montos x ancho) rellena con -1."""
+        _, ids, _ = self._batch_tables()
+        return ids[self.batch_tiers(amounts)]
+
+    def batch_eligibility(self, amounts):
+        """Matriz booleana (montos x opciones) con las opciones recomendadas para cada monto."""
+        _, _, mask = self._batch_tables()
+        return mask[self.batch_tiers(amounts)]
+
+CATALOG = InvestmentCatalog((
+    # Monto alto
+    InvestmentOption(0, 'CDT a Largo Plazo', 'Bajo', '8-12%',
+                     'Certificados de depósito a término con excelente rentabilidad', 50000, 'Baja', tier_from=50000),
+    InvestmentOption(1, 'Fondos de Inversión Diversificados', 'Medio', '12-18%',
+                     'Portafolio diversificado gestionado profesionalmente', 50000, 'Media', tier_from=50000),
+    InvestmentOption(2, 'Acciones Blue Chip', 'Medio-Alto', '15-25%',
+                     'Acciones de empresas establecidas con dividendos', 100000, 'Alta', tier_from=50000),
+    # Monto medio
+    InvestmentOption(3, 'Fondos Mutuos', 'Medio', '10-15%',
+                     'Inversión colectiva con diversificación automática', 20000, 'Media', tier_from=20000),
+    InvestmentOption(4, 'CDT a Mediano Plazo', 'Bajo', '6-10%',
+                     'Inversión segura con rentabilidad fija', 20000, 'Baja', tier_from=20000),
+    # Monto básico
+    InvestmentOption(5, 'Cuenta de Ahorros Premium', 'Muy Bajo', '4-6%',
+                     'Alta liquidez con mejor rentabilidad que cuentas tradicionales', 5000, 'Alta', tier_from=5000),
+    InvestmentOption(6, 'Fondos de Renta Fija', 'Bajo', '6-9%',
+                     'Inversión conservadora en bonos y títulos de deuda', 10000, 'Media', tier_from=5000),
+    # Opciones para montos pequeños
+    InvestmentOption(7, 'Micro-inversiones', 'Medio', '8-15%',
+                     'Plataformas digitales para pequeños inversionistas', 1000, 'Alta', tier_from=-math.inf, tier_to=20000),
+    InvestmentOption(8, 'Educación Financiera', 'Nulo', 'Invaluable',
+                     'Inversión en conocimiento para mejores decisiones futuras', 0, 'Inmediata', tier_from=-math.inf, tier_to=20000),
+))
+
+class InvestmentAdvisor:
+    catalog = CATALOG
+
+    @staticmethod
+    @profiled('advisor.get_investment_options')
+    def get_investment_options(amount):
+        return CATALOG.lookup(amount)
+
+    @staticmethod
+    def get_investment_options_batch(amounts):
+        return CATALOG.batch_option_ids(amounts)
+
+    @staticmethod
+    def months_to_minimum(min_amount, monthly_amount):
+        # Meses adicionales de ahorro para alcanzar la inversión mínima (0 si ya alcanza)
+        needed = min_amount - monthly_amount * 12
+        if needed <= 0:
+            return 0
+        return math.ceil(needed / monthly_amount)
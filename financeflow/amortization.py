@@ -0,0 +1,152 @@
+"""Motor de amortización: cuotas, cronogramas y barridos de ofertas de crédito con NumPy."""
+import numpy as np
+
+from .profiling import profiled
+
+def annuity_payment(principal, annual_rate, months):
+    """Cuota fija mensual de un crédito; admite arreglos que se combinan por broadcasting."""
+    principal = np.asarray(principal, dtype=np.float64)
+    monthly_rate = np.asarray(annual_rate, dtype=np.float64) / 12
+    months = np.asarray(months, dtype=np.float64)
+
+    # np.where evalúa ambas ramas: las dos quedan dentro de errstate (plazos vacíos dan inf/NaN sin avisos)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = (1 + monthly_rate) ** months
+        payment = principal * monthly_rate * growth / (growth - 1)
+        # Tasa cero: se divide el capital en partes iguales
+        return np.where(monthly_rate > 0, payment, principal / months)
+
+@profiled('amortization.amortization_schedule')
+def amortization_schedule(principal, annual_rate, months, extra_payment=0.0):
+    """Cronograma completo del crédito como columnas de NumPy.
+
+    `annual_rate` puede ser una tasa fija o una secuencia con la tasa de cada
+    mes (tasa variable: en cada cambio de tasa la cuota se recalcula sobre el
+    saldo y el plazo restantes). `extra_payment` es un abono a capital fijo o
+    por mes; si el saldo se cancela antes del plazo, el cronograma termina ese
+    mes.
+    """
+    if int(months) < 1:
+        raise ValueError(f"El plazo del crédito debe ser de al menos un mes (se recibió {months})")
+    rates = np.asarray(annual_rate, dtype=np.float64)
+    extra = np.asarray(extra_payment, dtype=np.float64)
+    if rates.ndim == 0 and extra.ndim == 0:
+        return _fixed_rate_schedule(float(principal), float(rates), int(months), float(extra))
+    rates = np.broadcast_to(rates, (months,))
+    extra = np.broadcast_to(extra, (months,))
+    return _variable_rate_schedule(float(principal), rates, int(months), extra)
+
+def _fixed_rate_schedule(principal, annual_rate, months, extra_payment):
+    # Saldo en forma cerrada: B_k = P·g^k − q·(g^k − 1)/r, con q = cuota + abono
+    monthly_rate = annual_rate / 12
+    installment = float(annuity_payment(principal, annual_rate, months))
+    paid = installment + extra_payment
+    k = np.arange(months + 1, dtype=np.float64)
+
+    if monthly_rate > 0:
+        growth = (1 + monthly_rate) ** k
+        balance = principal * growth - paid * (growth - 1) / monthly_rate
+    else:
+        balance = principal - paid * k
+    balance = np.maximum(balance, 0.0)
+
+    # Mes en que se cancela la deuda (con abonos puede ser antes del plazo)
+    payoff = int(np.argmax(balance <= 1e-6)) if (balance <= 1e-6).any() else months
+    opening = balance[:payoff]
+    interest = opening * monthly_rate
+    payment = np.minimum(paid, opening + interest)
+    return _schedule(payment, interest, balance[1:payoff + 1])
+
+def _variable_rate_schedule(principal, rates, months, extra):
+    # Todo en forma cerrada con productos acumulados de (1 + r) sobre el vector de tasas mensuales.
+    # G_k = Π_{i<k}(1 + r_i) y el saldo es B_k = G_k·(B_s/G_s − Σ_{s≤j<k} q_j/G_{j+1}) dentro de cada tramo.
+    monthly_rates = rates / 12
+    growth = np.r_[1.0, np.cumprod(1 + monthly_rates)]
+    discount = 1 / growth[1:]
+
+    # La cuota se recalcula al empezar cada tramo de tasa constante: es el saldo por el factor de
+    # anualidad del plazo restante, así que el saldo al final de cada tramo es afín en el del inicio
+    starts = np.flatnonzero(np.r_[True, rates[1:] != rates[:-1]])
+    ends = np.r_[starts[1:], months]
+    factor = annuity_payment(1.0, rates[starts], months - starts)
+    scheduled = np.add.reduceat(discount, starts)
+    extras = np.add.reduceat(extra * discount, starts)
+    keep = growth[ends] * (1 / growth[starts] - factor * scheduled)
+    carry = growth[ends] * extras
+
+    # B_{i+1} = keep_i·B_i − carry_i se resuelve igual: B_i = K_i·(P − Σ_{j<i} carry_j/K_{j+1}), K = Π keep
+    # (solo hacen falta los tramos anteriores al último, que nunca cancelan del todo el saldo)
+    kept = np.r_[1.0, np.cumprod(keep[:-1])]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        opening = kept * (principal - np.r_[0.0, np.cumsum(carry[:-1] / kept[1:])])
+
+    segment = np.repeat(np.arange(len(starts)), ends - starts)
+    paid = factor[segment] * opening[segment] + extra
+    settled = np.r_[0.0, np.cumsum(paid * discount)]
+    balance = growth[1:] * (opening[segment] / growth[starts][segment] - (settled[1:] - settled[starts][segment]))
+
+    # Mes en que se cancela la deuda (con abonos puede ser antes del plazo): ahí termina el cronograma
+    paid_off = balance <= 1e-6
+    payoff = int(np.argmax(paid_off)) + 1 if paid_off.any() else months
+    balance = np.maximum(balance[:payoff], 0.0)
+    previous = np.r_[principal, balance[:-1]]
+    interest = previous * monthly_rates[:payoff]
+    payment = np.minimum(paid[:payoff], previous + interest)
+    return _schedule(payment, interest, balance)
+
+def _schedule(payment, interest, balance):
+    return {
+        'month': np.arange(1, len(payment) + 1),
+        'payment': payment,
+        'interest': interest,
+        'principal': payment - interest,
+        'balance': balance
+    }
+
+@profiled('amortization.early_payoff')
+def early_payoff(principal, annual_rate, months, extra_payment):
+    """Efecto de abonar `extra_payment` a capital cada mes frente al crédito normal."""
+    base = amortization_schedule(principal, annual_rate, months)
+    early = amortization_schedule(principal, annual_rate, months, extra_payment)
+    return {
+        'months': len(early['payment']),
+        'months_saved': len(base['payment']) - len(early['payment']),
+        'total_interest': float(early['interest'].sum()),
+        'interest_saved': float(base['interest'].sum() - early['interest'].sum()),
+        'schedule': early
+    }
+
+def rate_sweep(principals, annual_rates, terms):
+    """Evalúa la rejilla completa principal x tasa x plazo en una sola operación.
+
+    Retorna arreglos de forma (len(principals), len(annual_rates), len(terms)).
+    """
+    principals = np.asarray(principals, dtype=np.float64).reshape(-1, 1, 1)
+    annual_rates = np.asarray(annual_rates, dtype=np.float64).reshape(1, -1, 1)
+    terms = np.asarray(terms, dtype=np.float64).reshape(1, 1, -1)
+
+    monthly_payment = annuity_payment(principals, annual_rates, terms)
+    total_paid = monthly_payment * terms
+    return {
+        'monthly_payment': monthly_payment,
+        'total_paid': total_paid,
+        'total_interest': total_paid - principals
+    }
+
+@profiled('amortization.compare_offers')
+def compare_offers(principal, annual_rates, terms, monthly_budget=None):
+    """Tabla de ofertas (tasa x plazo) ordenada por intereses totales."""
+    import pandas as pd
+
+    sweep = rate_sweep(principal, annual_rates, terms)
+    rate_grid, term_grid = np.meshgrid(annual_rates, terms, indexing='ij')
+    offers = pd.DataFrame({
+        'Tasa anual': rate_grid.ravel(),
+        'Plazo (meses)': term_grid.ravel().astype(np.int64),
+        'Cuota mensual': sweep['monthly_payment'][0].ravel(),
+        'Total pagado': sweep['total_paid'][0].ravel(),
+        'Intereses': sweep['total_interest'][0].ravel()
+    })
+    if monthly_budget is not None:
+        offers['Dentro del presupuesto'] = offers['Cuota mensual'] <= monthly_budget
+    return offers.sort_values('Intereses', kind='stable', ignore_index=True)
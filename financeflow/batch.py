@@ -0,0 +1,145 @@
+import numpy as np
+
+from .planner import NEEDS_CATEGORIES, WANTS_CATEGORIES, RISK_LEVELS, RISK_COLORS
+
+_RISK_LEVELS = np.array(RISK_LEVELS)
+_RISK_COLORS = np.array(RISK_COLORS)
+
+# Lotes que se suman fila por fila en Python y filas por bloque al sumar columna por columna
+_SMALL_BATCH = 16
+_ROW_BLOCK = 4096
+
+def _row_totals(matrix):
+    # Columna por columna, en el mismo orden que CategoryVector.total: los totales
+    # coinciden bit a bit con el planificador escalar (sum(axis=1) suma por pares)
+    if len(matrix) <= _SMALL_BATCH:
+        # Con pocas filas cuesta más cada operación de NumPy que la suma misma
+        return np.array([sum(row, 0.0) for row in matrix.tolist()], dtype=np.float64)
+    total = np.zeros(len(matrix))
+    # Por bloques de filas, para que cada bloque siga en caché mientras se recorren sus columnas
+    for start in range(0, len(matrix), _ROW_BLOCK):
+        block = total[start:start + _ROW_BLOCK]
+        for column in matrix[start:start + _ROW_BLOCK].T:
+            block += column
+    return total
+
+class BatchFinancialPlanner:
+    """Versión columnar de FinancialPlanner: una fila por hogar, todo calculado con NumPy.
+
+    `needs` y `wants` aceptan una matriz (hogares x categorías), un dict de
+    columnas o un DataFrame. Los umbrales de riesgo son los mismos de
+    FinancialPlanner.get_risk_analysis (exceso > 10% medio, > 20% alto).
+    """
+
+    def __init__(self, income, needs=None, wants=None):
+        self.income = np.asarray(income, dtype=np.float64).reshape(-1)
+        self.needs = self._as_matrix(needs, len(self.income))
+        self.wants = self._as_matrix(wants, len(self.income))
+
+    @staticmethod
+    def _as_matrix(values, rows):
+        if values is None:
+            return np.zeros((rows, 0))
+        if hasattr(values, 'to_numpy'):  # DataFrame de pandas
+            values = values.to_numpy(dtype=np.float64)
+        elif isinstance(values, dict):
+            values = np.column_stack([np.asarray(v, dtype=np.float64) for v in values.values()]) if values else np.zeros((rows, 0))
+        matrix = np.asarray(values, dtype=np.float64)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(-1, 1)
+        if matrix.shape[0] != rows:
+            raise ValueError(f"Se esperaban {rows} filas de gastos y se recibieron {matrix.shape[0]}")
+        return matrix
+
+    @classmethod
+    def from_frame(cls, df, income_column='income', needs_columns=NEEDS_CATEGORIES, wants_columns=WANTS_CATEGORIES):
+        # Las categorías ausentes en el archivo se toman como gasto cero
+        needs = df.reindex(columns=list(needs_columns), fill_value=0)
+        wants = df.reindex(columns=list(wants_columns), fill_value=0)
+        return cls(df[income_column], needs, wants)
+
+    def __len__(self):
+        return len(self.income)
+
+    def calculate_percentages(self):
+        return {
+            'needs_budget': self.income * 0.50,
+            'wants_budget': self.income * 0.30,
+            'savings_budget': self.income * 0.20
+        }
+
+    def calculate_needs_total(self):
+        return _row_totals(self.needs)
+
+    def calculate_wants_total(self):
+        return _row_totals(self.wants)
+
+    def get_risk_analysis(self):
+        budgets = self.calculate_percentages()
+        needs_total = self.calculate_needs_total()
+        excess = needs_total - budgets['needs_budget']
+
+        # Sin ingresos cualquier exceso cuenta como riesgo alto
+        with np.errstate(divide='ignore', invalid='ignore'):
+            excess_percent = np.where(self.income > 0, (excess / self.income) * 100, np.inf)
+        over_budget = needs_total > budgets['needs_budget']
+
+        level_code = np.zeros(len(self), dtype=np.int8)
+        level_code[over_budget & (excess_percent > 10)] = 1
+        level_code[over_budget & (excess_percent > 20)] = 2
+
+        return {
+            'level_code': level_code,
+            'level': _RISK_LEVELS[level_code],
+            'color': _RISK_COLORS[level_code],
+            'needs_excess': np.maximum(0, excess),
+            'excess_percent': np.where(over_budget, excess_percent, 0.0)
+        }
+
+    def to_frame(self):
+        import pandas as pd
+
+        budgets = self.calculate_percentages()
+        risk = self.get_risk_analysis()
+        return pd.DataFrame({
+            'income': self.income,
+            **budgets,
+            'needs_total': self.calculate_needs_total(),
+            'wants_total': self.calculate_wants_total(),
+            'needs_excess': risk['needs_excess'],
+            'excess_percent': risk['excess_percent'],
+            'risk_level': risk['level']
+        })
+
+def plan_savings_batch(item_price, available_wants, save_percentage):
+    """Versión vectorizada de purchases.plan_savings: mismas reglas, una fila por compra."""
+    item_price, available_wants, save_percentage = np.broadcast_arrays(
+        np.asarray(item_price, dtype=np.float64),
+        np.asarray(available_wants, dtype=np.float64),
+        np.asarray(save_percentage, dtype=np.float64))
+    max_monthly_save = available_wants * save_percentage
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        months_needed = np.where(max_monthly_save > 0, np.ceil(item_price / max_monthly_save), np.inf)
+        finite = np.isfinite(months_needed)
+        monthly_save = np.where(finite, item_price / months_needed, 0.0)
+
+        # La cuota nunca supera el presupuesto disponible
+        over = monthly_save > available_wants
+        monthly_save = np.where(over, available_wants, monthly_save)
+        months_needed = np.where(over, np.ceil(item_price / available_wants), months_needed)
+
+        total_saved = np.where(finite, monthly_save * months_needed, 0.0)
+        shortfall = np.where(finite, np.maximum(0, item_price - total_saved), 0.0)
+        plan_months = months_needed + (shortfall > 0)
+        plan_monthly_save = np.where(shortfall > 0, item_price / plan_months, monthly_save)
+
+    return {
+        'max_monthly_save': max_monthly_save,
+        'monthly_save': monthly_save,
+        'months_needed': months_needed,
+        'total_saved': total_saved,
+        'shortfall': shortfall,
+        'plan_months': plan_months,
+        'plan_monthly_save': plan_monthly_save
+    }
@@ -0,0 +1,270 @@
+"""Constructores de gráficos Plotly. Plotly se importa solo al pedir una figura."""
+import threading
+
+from .cache import memoize
+from .profiling import profiled
+
+# Puntos máximos por serie que se envían al navegador
+MAX_CHART_POINTS = 400
+
+DISTRIBUTION_CATEGORIES = ('Necesidades\n(50%)', 'Deseos\n(30%)', 'Ahorros\n(20%)', 'Sin Asignar')
+
+# Especificación base del análisis de distribución (subgráficos y estilos): se arma una sola vez
+_distribution_spec = None
+_distribution_lock = threading.Lock()
+
+def _build_distribution_figure(actual_values, budget_values):
+    from plotly import graph_objects as go
+    from plotly.subplots import make_subplots
+
+    # Crear gráfico de barras comparativo
+    fig = make_subplots(
+        rows=2, cols=1,
+        subplot_titles=('Distribución Actual vs Recomendada', 'Análisis por Categorías'),
+        specs=[[{"type": "bar"}], [{"type": "pie"}]],
+        vertical_spacing=0.12
+    )
+
+    # Gráfico de barras
+    fig.add_trace(
+        go.Bar(name='Actual', x=DISTRIBUTION_CATEGORIES[:-1], y=actual_values[:-1],
+               marker_color=['#e17055', '#fdcb6e', '#00b894']),
+        row=1, col=1
+    )
+
+    fig.add_trace(
+        go.Bar(name='Recomendado', x=DISTRIBUTION_CATEGORIES[:-1], y=budget_values[:-1],
+               marker_color=['#ff7675', '#ffeaa7', '#55a3ff'], opacity=0.7),
+        row=1, col=1
+    )
+
+    # Gráfico circular
+    fig.add_trace(
+        go.Pie(labels=DISTRIBUTION_CATEGORIES, values=actual_values,
+               marker_colors=['#e17055', '#fdcb6e', '#00b894', '#ddd']),
+        row=2, col=1
+    )
+
+    fig.update_layout(
+        height=800,
+        title_text="Análisis Financiero Detallado",
+        showlegend=True
+    )
+    return fig
+
+def _distribution_base():
+    # make_subplots es lo costoso de la figura; su dict se reutiliza para todas las demás
+    global _distribution_spec
+
+    with _distribution_lock:
+        if _distribution_spec is None:
+            spec = _build_distribution_figure([0, 0, 0, 0], [0, 0, 0, 0]).to_dict()
+            # La plantilla por defecto se vuelve a aplicar al crear cada figura
+            spec['layout'].pop('template', None)
+            _distribution_spec = spec
+        return _distribution_spec
+
+def _distribution_values(income, total_needs, total_wants, needs_budget, wants_budget, savings_budget):
+    actual_values = [
+        total_needs,
+        total_wants,
+        savings_budget,
+        max(0, income - total_needs - total_wants - savings_budget)
+    ]
+    budget_values = [needs_budget, wants_budget, savings_budget, 0]
+    return actual_values, budget_values
+
+def new_distribution_figure():
+    """Figura de distribución vacía (sin montos) para parcharla con distribution_figure(..., figure=fig)."""
+    from plotly import graph_objects as go
+
+    spec = _distribution_base()
+    return go.Figure(data=spec['data'], layout=spec['layout'])
+
+def _patch_distribution(fig, actual_values, budget_values):
+    # Solo cambian los valores: se reemplazan en las trazas existentes, sin volver a armar subgráficos ni estilos
+    actual, budget, pie = fig.data
+    with fig.batch_update():
+        actual.y = actual_values[:-1]
+        budget.y = budget_values[:-1]
+        pie.values = actual_values
+    return fig
+
+@memoize(maxsize=128)
+def _distribution_chart(income, total_needs, total_wants, needs_budget, wants_budget, savings_budget):
+    values = _distribution_values(income, total_needs, total_wants, needs_budget, wants_budget, savings_budget)
+    return _patch_distribution(new_distribution_figure(), *values)
+
+@profiled('charts.distribution_figure')
+def distribution_figure(income, total_needs, total_wants, budgets, figure=None):
+    """Gráfico de barras y torta de la distribución actual frente a la recomendada.
+
+    Con `figure` (creada con new_distribution_figure) se parchan sus trazas en
+    el lugar y se retorna la misma figura: es lo que usa cada sesión de la app.
+    Sin ella, la figura se memoriza por los valores numéricos y es compartida
+    y de solo lectura.
+    """
+    values = (float(income), float(total_needs), float(total_wants),
+              float(budgets['needs_budget']), float(budgets['wants_budget']), float(budgets['savings_budget']))
+    if figure is None:
+        return _distribution_chart(*values)
+    return _patch_distribution(figure, *_distribution_values(*values))
+
+@profiled('charts.progress_figure')
+def progress_figure(df_progress, item_name, max_points=MAX_CHART_POINTS):
+    import plotly.express as px
+    from .progress import downsample_indices
+
+    # Horizontes largos se muestrean para no enviar miles de puntos al navegador
+    if len(df_progress) > max_points:
+        df_progress = df_progress.iloc[downsample_indices(len(df_progress), max_points)]
+
+    fig_progress = px.line(
+        df_progress,
+        x='Mes',
+        y=['Ahorro Acumulado', 'Meta'],
+        title=f"Progreso de Ahorro para {item_name}",
+        color_discrete_map={
+            'Ahorro Acumulado': '#00b894',
+            'Meta': '#e17055'
+        }
+    )
+
+    fig_progress.update_layout(
+        xaxis_title="Meses",
+        yaxis_title="Monto (COP)",
+        height=400
+    )
+    return fig_progress
+
+def _add_percentile_bands(fig, x, bands):
+    from plotly import graph_objects as go
+
+    # Cada banda se dibuja como el borde superior seguido del inferior relleno hasta él
+    for low, high, color, name in ((5, 95, 'rgba(102, 126, 234, 0.15)', 'Rango 5%-95%'),
+                                   (25, 75, 'rgba(102, 126, 234, 0.35)', 'Rango 25%-75%')):
+        if low in bands and high in bands:
+            fig.add_trace(go.Scatter(x=x, y=bands[high], mode='lines', line_width=0,
+                                     showlegend=False, hoverinfo='skip'))
+            fig.add_trace(go.Scatter(x=x, y=bands[low], mode='lines', line_width=0,
+                                     fill='tonexty', fillcolor=color, name=name))
+
+    if 50 in bands:
+        fig.add_trace(go.Scatter(x=x, y=bands[50], mode='lines', name='Mediana',
+                                 line=dict(color='#667eea', width=3)))
+
+@profiled('charts.projection_figure')
+def projection_figure(projection, title):
+    """Bandas de percentiles (5-95 y 25-75), mediana y total aportado de una proyección."""
+    from plotly import graph_objects as go
+
+    years = projection['year']
+    fig = go.Figure()
+    _add_percentile_bands(fig, years, projection['percentiles'])
+    fig.add_trace(go.Scatter(x=years, y=projection['contributed'], mode='lines', name='Total aportado',
+                             line=dict(color='#e17055', dash='dash')))
+
+    fig.update_layout(
+        title=title,
+        xaxis_title="Años",
+        yaxis_title="Monto (COP)",
+        height=450
+    )
+    return fig
+
+@profiled('charts.forecast_figure')
+def forecast_figure(months, bands, title, reference=None, reference_name="Sin cambios"):
+    """Bandas de percentiles entre escenarios de una serie mensual y, opcionalmente, una línea de referencia."""
+    from plotly import graph_objects as go
+
+    x = months.astype(str)
+    fig = go.Figure()
+    _add_percentile_bands(fig, x, bands)
+    if reference is not None:
+        fig.add_trace(go.Scatter(x=x, y=reference, mode='lines', name=reference_name,
+                                 line=dict(color='#e17055', dash='dash')))
+
+    fig.update_layout(
+        title=title,
+        xaxis_title="Mes",
+        yaxis_title="Monto (COP)",
+        height=450
+    )
+    return fig
+
+@profiled('charts.emergency_figure')
+def emergency_figure(simulation):
+    """Bandas del saldo simulado del fondo de emergencia mes a mes frente a la meta."""
+    from plotly import graph_objects as go
+
+    fig = go.Figure()
+    _add_percentile_bands(fig, simulation['month'], simulation['balance_percentiles'])
+    fig.add_hline(y=simulation['target'], line_dash='dash', line_color='#e17055', annotation_text="Meta")
+
+    fig.update_layout(
+        title="Saldo del fondo de emergencia con imprevistos",
+        xaxis_title="Mes",
+        yaxis_title="Saldo (COP)",
+        height=400
+    )
+    return fig
+
+@profiled('charts.scenario_figure')
+def scenario_figure(table, labels):
+    """Meses para la compra frente al sobrante mensual de cada escenario, coloreados por nivel de riesgo."""
+    import numpy as np
+    from plotly import graph_objects as go
+    from .planner import RISK_LEVELS, RISK_COLORS
+
+    labels = np.asarray(labels, dtype=object)
+    # Los escenarios sin presupuesto para ahorrar (meses infinitos) no se grafican
+    months = table['months_needed'].to_numpy(dtype=np.float64)
+    months = np.where(np.isfinite(months), months, np.nan)
+
+    fig = go.Figure()
+    for level, color in zip(RISK_LEVELS, RISK_COLORS):
+        mask = (table['risk_level'] == level).to_numpy()
+        if not mask.any():
+            continue
+        fig.add_trace(go.Scatter(
+            x=months[mask], y=table['remaining_income'].to_numpy()[mask],
+            mode='markers', name=f"Riesgo {level}",
+            marker=dict(color=color, size=10, line=dict(width=1, color='white')),
+            text=labels[mask], customdata=table['loan_total_interest'].to_numpy()[mask],
+            hovertemplate="%{text}<br>Meses: %{x}<br>Sobrante: $%{y:,.0f}"
+                          "<br>Intereses si financia: $%{customdata:,.0f}<extra></extra>"
+        ))
+
+    fig.update_layout(
+        title="Escenarios: tiempo para la compra vs. sobrante mensual",
+        xaxis_title="Meses para la compra",
+        yaxis_title="Sobrante mensual (COP)",
+        height=450
+    )
+    return fig
+
+@profiled('charts.schedule_figure')
+def schedule_figure(allocation, priority):
+    """Aporte mensual del presupuesto compartido, apilado por prioridad de las metas."""
+    import numpy as np
+    from plotly import graph_objects as go
+    from .store import PRIORITIES
+
+    priority = np.asarray(priority, dtype=np.int64)
+    months = np.arange(1, allocation.shape[1] + 1)
+    fig = go.Figure()
+    # Una traza por prioridad y no por meta: con cientos de metas el gráfico sigue liviano
+    for code, (label, color) in enumerate(zip(PRIORITIES, ('#e17055', '#fdcb6e', '#00b894'))):
+        mask = priority == code
+        if mask.any():
+            fig.add_trace(go.Bar(x=months, y=allocation[mask].sum(axis=0), name=f"Prioridad {label}",
+                                 marker_color=color))
+
+    fig.update_layout(
+        barmode='stack',
+        title="Distribución mensual del ahorro entre sus compras",
+        xaxis_title="Mes",
+        yaxis_title="Aporte (COP)",
+        height=400
+    )
+    return fig
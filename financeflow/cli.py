@@ -0,0 +1,194 @@
+"""Ejecución por lotes sin navegador: `python -m financeflow <comando> ENTRADA SALIDA`.
+
+Comandos:
+  plan       análisis 50-30-20 y nivel de riesgo de un archivo de presupuestos
+  advise     opciones de inversión recomendadas según el aporte mensual
+  purchases  plan de ahorro y crédito equivalente de un archivo de compras
+  project    proyección Monte Carlo de aportes mensuales a opciones del catálogo
+  forecast   presupuesto proyectado mes a mes de cada hogar bajo varios escenarios
+
+Las entradas pueden ser CSV, Parquet, JSON Lines, Arrow IPC o un directorio
+de columnas .npy, y la salida se escribe en el formato de su extensión (o el
+indicado con --format). Parquet, Arrow y .npy pasan por
+financeflow.export.ColumnarWriter: guardan los niveles de riesgo como
+códigos con sus categorías, y `advise` agrega la matriz `option_ids`. Arrow y
+.npy se abren después sin copiar con financeflow.export.open_results.
+"""
+import argparse
+import functools
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from .advisor import CATALOG
+from .amortization import annuity_payment
+from .batch import plan_savings_batch
+from .export import EXPORT_FORMATS, advisor_columns, forecast_columns, projection_columns
+from .ingest import (DEFAULT_CHUNKSIZE, EXPENSE_COLUMNS, INCOME_COLUMN, ResultWriter, map_chunks, read_budget_chunks,
+                     run_pipeline, validate_chunk, _file_format)
+from .planner import NEEDS_CATEGORIES, RISK_LEVELS, WANTS_CATEGORIES, FinancialPlanner
+from .purchases import DEFAULT_ANNUAL_RATE, DEFAULT_MAX_LOAN_MONTHS
+
+DEFAULT_PROJECTION_YEARS = 10
+DEFAULT_PROJECTION_PATHS = 2_000
+DEFAULT_FORECAST_YEARS = 5
+
+def advise_chunk(chunk, amount_column='investment_amount', option_ids=False):
+    # El aporte es mensual, como en la pestaña de inversiones; el catálogo trabaja con montos anuales
+    advice = advisor_columns(chunk[amount_column].to_numpy(dtype=np.float64), CATALOG)
+    tiers = advice['tier']
+    names = np.array([' | '.join(option.name for option in tier) for tier in CATALOG.tiers], dtype=object)
+    results = chunk.assign(
+        annual_amount=advice['annual_amount'],
+        tier=tiers,
+        recommended_options=names[tiers],
+        options_count=np.array([len(tier) for tier in CATALOG.tiers])[tiers]
+    )
+    if not option_ids:
+        return results
+    # Las salidas columnares guardan además los IDs de las opciones como matriz (rellena con -1)
+    return {**{name: results[name] for name in results.columns}, 'option_ids': advice['option_ids']}
+
+def _long_format(chunk, keep, pieces):
+    # Une las columnas de cada fila de entrada y repite las columnas que se conservan en cada punto
+    points = [len(next(iter(piece.values()))) for piece in pieces]
+    columns = {name: np.repeat(chunk[name].to_numpy(), points) for name in keep}
+    for name in (pieces[0] if pieces else ()):
+        columns[name] = np.concatenate([piece[name] for piece in pieces])
+    return columns
+
+def project_chunk(chunk, years=DEFAULT_PROJECTION_YEARS, paths=DEFAULT_PROJECTION_PATHS,
+                  option_column='option_id', amount_column='monthly_contribution'):
+    from .montecarlo import project_option
+
+    emergency = (chunk['emergency_contribution'].to_numpy(dtype=np.float64) if 'emergency_contribution' in chunk
+                 else np.zeros(len(chunk)))
+    pieces = [
+        projection_columns(project_option(int(option), float(amount), years, float(extra), paths))
+        for option, amount, extra in zip(chunk[option_column].to_numpy(dtype=np.int64),
+                                         chunk[amount_column].to_numpy(dtype=np.float64), emergency)
+    ]
+    keep = [name for name in chunk.columns if name not in (amount_column, 'emergency_contribution')]
+    return _long_format(chunk, keep, pieces)
+
+def forecast_chunk(chunk, years=DEFAULT_FORECAST_YEARS, salary_growth=(0.05,), inflation_shift=(0.0,),
+                   income_column=INCOME_COLUMN, start=None):
+    from .forecast import forecast_budget
+
+    # Las filas inválidas se descartan como en `plan`; cada hogar se proyecta con la grilla de escenarios
+    valid, _ = validate_chunk(chunk, income_column)
+    salary_growth, inflation_shift = (grid.ravel() for grid in np.meshgrid(salary_growth, inflation_shift))
+    pieces = []
+    for _, row in valid.iterrows():
+        planner = FinancialPlanner()
+        planner.income = float(row[income_column])
+        planner.needs = {name: row[name] for name in NEEDS_CATEGORIES if name in row}
+        planner.wants = {name: row[name] for name in WANTS_CATEGORIES if name in row}
+        pieces.append(forecast_columns(forecast_budget(planner, years, start, salary_growth, inflation_shift)))
+    keep = [name for name in valid.columns if name not in EXPENSE_COLUMNS and name != income_column]
+    columns = _long_format(valid, keep, pieces)
+    if 'risk_level' in columns:
+        # Igual que en `plan`: texto en CSV y JSON, códigos en las salidas columnares
+        columns['risk_level'] = pd.Categorical.from_codes(columns['risk_level'], RISK_LEVELS)
+    return columns
+
+def purchases_chunk(chunk, annual_rate=DEFAULT_ANNUAL_RATE, max_loan_months=DEFAULT_MAX_LOAN_MONTHS):
+    price = chunk['item_price'].to_numpy(dtype=np.float64)
+    save_percentage = chunk['save_percentage'] if 'save_percentage' in chunk else 0.5
+    plan = plan_savings_batch(price, chunk['available_wants'], save_percentage)
+
+    rate = chunk['annual_rate'].to_numpy(dtype=np.float64) if 'annual_rate' in chunk else annual_rate
+    cap = chunk['max_loan_months'].to_numpy(dtype=np.float64) if 'max_loan_months' in chunk else max_loan_months
+    # Sin capacidad de ahorro no hay plan ni cuota de referencia, como en purchase_plan
+    finite = np.isfinite(plan['plan_months'])
+    loan_months = np.where(finite, np.minimum(plan['plan_months'], cap), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        monthly_payment = np.where(finite, annuity_payment(price, rate, loan_months), np.nan)
+    return chunk.assign(
+        monthly_save=plan['plan_monthly_save'],
+        months_needed=plan['plan_months'],
+        loan_months=loan_months,
+        loan_monthly_payment=monthly_payment,
+        loan_total_interest=monthly_payment * loan_months - price
+    )
+
+def _run_transform(args, transform):
+    with ResultWriter(args.output, args.format) as writer:
+        for results in map_chunks(transform, read_budget_chunks(args.input, args.chunksize), args.workers):
+            writer.write(results)
+    return {'rows': writer.rows}
+
+def _rates(text):
+    return tuple(float(value) for value in text.split(','))
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m financeflow',
+        description="Planificador financiero 50-30-20 por lotes"
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_command(name, help):
+        command = commands.add_parser(name, help=help)
+        command.add_argument('input', help="Archivo de entrada (.csv, .parquet, .json, .arrow o directorio .npy)")
+        command.add_argument('output', help="Archivo de salida (.csv, .parquet, .json, .arrow o directorio .npy)")
+        command.add_argument('--format', choices=('csv', 'parquet', 'json', 'arrow', 'npy'),
+                             help="Formato de salida (por defecto según la extensión)")
+        command.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help="Filas por bloque")
+        command.add_argument('--workers', type=int, default=1, help="Procesos en paralelo")
+        return command
+
+    plan = add_command('plan', "Análisis 50-30-20 y riesgo de presupuestos de hogares")
+    plan.add_argument('--income-column', default='income')
+    plan.add_argument('--rejects', help="Archivo donde guardar las filas rechazadas")
+
+    advise = add_command('advise', "Opciones de inversión recomendadas por aporte mensual")
+    advise.add_argument('--amount-column', default='investment_amount')
+
+    purchases = add_command('purchases', "Plan de ahorro y crédito de compras planificadas")
+    purchases.add_argument('--annual-rate', type=float, default=DEFAULT_ANNUAL_RATE)
+    purchases.add_argument('--max-loan-months', type=int, default=DEFAULT_MAX_LOAN_MONTHS)
+
+    project = add_command('project', "Bandas Monte Carlo de aportes mensuales (columnas option_id y monthly_contribution)")
+    project.add_argument('--years', type=int, default=DEFAULT_PROJECTION_YEARS)
+    project.add_argument('--paths', type=int, default=DEFAULT_PROJECTION_PATHS, help="Trayectorias por fila")
+
+    forecast = add_command('forecast', "Presupuesto mes a mes de cada hogar; una fila por (hogar, escenario, mes)")
+    forecast.add_argument('--years', type=int, default=DEFAULT_FORECAST_YEARS)
+    forecast.add_argument('--salary-growth', type=_rates, default=(0.05,),
+                          help="Aumentos anuales de salario separados por comas")
+    forecast.add_argument('--inflation-shift', type=_rates, default=(0.0,),
+                          help="Desplazamientos de la inflación separados por comas")
+    forecast.add_argument('--income-column', default=INCOME_COLUMN)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    started = time.perf_counter()
+
+    if args.command == 'plan':
+        summary = run_pipeline(args.input, args.output, args.chunksize, args.rejects,
+                               args.income_column, args.workers, args.format)
+    elif args.command == 'advise':
+        columnar = (args.format or _file_format(args.output)) in EXPORT_FORMATS
+        summary = _run_transform(args, functools.partial(
+            advise_chunk, amount_column=args.amount_column, option_ids=columnar))
+    elif args.command == 'project':
+        summary = _run_transform(args, functools.partial(project_chunk, years=args.years, paths=args.paths))
+    elif args.command == 'forecast':
+        summary = _run_transform(args, functools.partial(
+            forecast_chunk, years=args.years, salary_growth=args.salary_growth,
+            inflation_shift=args.inflation_shift, income_column=args.income_column))
+    else:
+        summary = _run_transform(args, functools.partial(
+            purchases_chunk, annual_rate=args.annual_rate, max_loan_months=args.max_loan_months))
+
+    summary['command'] = args.command
+    summary['output'] = args.output
+    summary['seconds'] = round(time.perf_counter() - started, 3)
+    json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write('\n')
+    return 0
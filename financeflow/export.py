@@ -0,0 +1,376 @@
+"""Exportación columnar de resultados: directorios de `.npy` mapeables en memoria, Arrow IPC y Parquet.
+
+Los resultados se escriben columna por columna, sin pasar por filas ni
+diccionarios. Un directorio `.npy` guarda un archivo por columna más un
+`manifest.json` con tipos, formas, categorías y metadatos; al abrirlo cada
+columna es un memmap de solo lectura, así que un resultado de varios GB se
+abre al instante y solo se leen del disco las páginas que se usan. Arrow IPC
+también se abre por memory map sin copiar. Parquet ocupa menos espacio pero
+se descomprime al leerlo. pyarrow se importa solo para Arrow y Parquet.
+
+Las columnas con categorías fijas (el nivel de riesgo) se guardan como
+códigos enteros más su lista de categorías, y en Arrow como columnas de
+diccionario. En `.npy` el resto del texto también se codifica, con un
+diccionario que crece entre bloques; en Arrow queda como texto. Las columnas
+2D, como la matriz de opciones del asesor, se guardan tal cual en `.npy` y
+como listas de tamaño fijo en Arrow.
+"""
+import json
+import os
+import re
+import struct
+
+import numpy as np
+
+from .planner import RISK_LEVELS
+
+EXPORT_FORMATS = ('npy', 'arrow', 'parquet')
+MANIFEST = 'manifest.json'
+# Marca de cada formato en el manifiesto o en los metadatos del esquema
+MANIFEST_FORMATS = {'npy': 'financeflow-npy', 'arrow': 'financeflow-arrow', 'parquet': 'financeflow-parquet'}
+
+# Categorías conocidas de antemano: sus columnas llegan como códigos o como texto
+DEFAULT_CATEGORIES = {'risk_level': RISK_LEVELS}
+
+# Encabezado .npy de tamaño fijo: se reescribe al cerrar con la cantidad final de filas
+_NPY_HEADER_SIZE = 128
+
+def export_format(path):
+    """Formato de exportación según la ruta: sin extensión (o `.npy`) es un directorio de columnas."""
+    extension = os.path.splitext(str(path).rstrip('/\\'))[1].lower()
+    if extension in ('', '.npy'):
+        return 'npy'
+    if extension in ('.arrow', '.feather', '.ipc'):
+        return 'arrow'
+    if extension in ('.parquet', '.pq'):
+        return 'parquet'
+    raise ValueError(f"Formato de exportación no soportado: {path!r} (use un directorio, .arrow o .parquet)")
+
+def planner_columns(planner):
+    """Columnas del análisis 50-30-20 de un BatchFinancialPlanner; `risk_level` va como código."""
+    risk = planner.get_risk_analysis()
+    return {
+        'income': planner.income,
+        **planner.calculate_percentages(),
+        'needs_total': planner.calculate_needs_total(),
+        'wants_total': planner.calculate_wants_total(),
+        'needs_excess': risk['needs_excess'],
+        'excess_percent': risk['excess_percent'],
+        'risk_level': risk['level_code']
+    }
+
+def advisor_columns(amounts, catalog=None):
+    """Nivel del catálogo y matriz de IDs de opciones recomendadas (rellena con -1) por aporte mensual."""
+    from .advisor import CATALOG
+
+    catalog = catalog or CATALOG
+    amounts = np.asarray(amounts, dtype=np.float64)
+    # El catálogo trabaja con montos anuales
+    annual = amounts * 12
+    return {
+        'investment_amount': amounts,
+        'annual_amount': annual,
+        'tier': catalog.batch_tiers(annual),
+        'option_ids': catalog.batch_option_ids(annual)
+    }
+
+def projection_columns(projection):
+    """Bandas de una proyección Monte Carlo (montecarlo.project) o del fondo de emergencia, una fila por punto."""
+    if 'balance_percentiles' in projection:
+        columns = {'month': projection['month']}
+        bands = projection['balance_percentiles']
+    else:
+        columns = {'year': projection['year'], 'mean': projection['mean'], 'contributed': projection['contributed']}
+        bands = projection['percentiles']
+    columns.update((f'p{q}', values) for q, values in bands.items())
+    return columns
+
+def forecast_columns(forecast):
+    """Proyección de forecast.forecast_budget en formato largo: una fila por (escenario, mes)."""
+    from .forecast import FORECAST_FIELDS
+
+    scenarios, months = forecast['income'].shape
+    columns = {
+        'scenario': np.repeat(np.arange(scenarios), months),
+        'month': np.tile(forecast['month'], scenarios),
+        **{f'scenario_{name}': np.repeat(values, months) for name, values in forecast['scenarios'].items()}
+    }
+    # ravel de una matriz contigua es una vista: no se copian los montos
+    columns.update((field, forecast[field].ravel()) for field in FORECAST_FIELDS)
+    columns['risk_level'] = forecast['risk_code'].ravel()
+    return columns
+
+def _file_name(name, used):
+    stem = re.sub(r'[^\w.-]', '_', str(name)) or 'column'
+    candidate, suffix = stem, 1
+    while candidate in used:
+        suffix += 1
+        candidate = f"{stem}_{suffix}"
+    used.add(candidate)
+    return f"{candidate}.npy"
+
+def _npy_header(dtype, shape):
+    header = repr({'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': tuple(shape)})
+    size = _NPY_HEADER_SIZE - 10
+    if len(header) >= size:
+        raise ValueError(f"Columna con tipo o forma demasiado larga para exportar: {dtype} {shape}")
+    return np.lib.format.magic(1, 0) + struct.pack('<H', size) + (header.ljust(size - 1) + '\n').encode('latin1')
+
+def _is_text(values):
+    return values.dtype.kind in ('O', 'U', 'S')
+
+def _first_chunk_schema(schema):
+    """Esquema de salida tomado del primer bloque; las columnas todavía sin valores se guardan como texto."""
+    import pyarrow as pa
+
+    for index, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            schema = schema.set(index, field.with_type(pa.string()))
+    return schema
+
+def _conform_table(table, schema):
+    """Ajusta un bloque de Arrow a los tipos del archivo de salida.
+
+    El tipo de una columna puede variar entre bloques aunque los datos sean
+    compatibles: un entero con vacíos llega como float, un texto sin valores
+    como nulo. Si la conversión no es posible se informa la columna.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if table.schema.equals(schema, check_metadata=False):
+        return table
+    columns = []
+    for field in schema:
+        if field.name not in table.column_names:
+            raise ValueError(f"El bloque no trae la columna {field.name!r} del archivo de salida")
+        column = table.column(field.name)
+        if pa.types.is_floating(column.type) and not pa.types.is_floating(field.type):
+            # En los bloques que vienen de NumPy un vacío llega como NaN, incluso en columnas de texto
+            column = pc.if_else(pc.is_nan(column), pa.scalar(None, column.type), column)
+        try:
+            columns.append(column.cast(field.type))
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as error:
+            raise ValueError(
+                f"La columna {field.name!r} cambió de tipo entre bloques ({field.type} en el primero, "
+                f"{column.type} en este) y no se puede convertir: {error}"
+            ) from error
+    return pa.Table.from_arrays(columns, schema=schema)
+
+class ColumnarWriter:
+    """Escribe bloques de columnas (dict de arreglos o DataFrame) en `.npy`, Arrow IPC o Parquet.
+
+    Todos los bloques deben traer las mismas columnas. Las columnas de
+    `categories` (además de DEFAULT_CATEGORIES) pueden llegar como texto o ya
+    como códigos enteros.
+    """
+
+    def __init__(self, path, format=None, categories=None, metadata=None):
+        self.path = str(path)
+        self.format = format or export_format(path)
+        if self.format not in EXPORT_FORMATS:
+            raise ValueError(f"Formato de exportación desconocido: {self.format!r}")
+        self.metadata = metadata or {}
+        self.rows = 0
+        self._categories = {name: list(values) for name, values in {**DEFAULT_CATEGORIES, **(categories or {})}.items()}
+        self._fixed = set(self._categories)
+        self._codes = {name: {value: code for code, value in enumerate(values)}
+                       for name, values in self._categories.items()}
+        self._encoded = set()
+        self._columns = None
+        self._files = {}
+        self._arrow = None
+        self._schema = None
+        if self.format == 'npy':
+            os.makedirs(self.path, exist_ok=True)
+
+    def _encode(self, name, values):
+        # Códigos del bloque contra el diccionario de la columna (-1 = vacío)
+        self._encoded.add(name)
+        if values.dtype.kind in ('i', 'u'):
+            return values
+        import pandas as pd
+
+        local_codes, uniques = pd.factorize(values)
+        mapping = self._codes.setdefault(name, {})
+        categories = self._categories.setdefault(name, [])
+        for value in uniques:
+            if value not in mapping:
+                if name in self._fixed:
+                    raise ValueError(f"Valor {value!r} fuera de las categorías de {name!r}")
+                mapping[value] = len(categories)
+                categories.append(value)
+        lookup = np.array([mapping[value] for value in uniques] + [-1], dtype=np.int32)
+        return lookup[local_codes]
+
+    def _frame_column(self, name, series):
+        # Una categoría con las mismas categorías de la columna ya trae sus códigos: no se decodifica
+        if series.dtype.name == 'category' and list(series.cat.categories) == self._categories.get(name):
+            return series.cat.codes.to_numpy()
+        return series.to_numpy()
+
+    def _prepare(self, columns):
+        if hasattr(columns, 'to_numpy'):  # DataFrame de pandas
+            columns = {name: self._frame_column(name, columns[name]) for name in columns.columns}
+        prepared = {}
+        for name, values in columns.items():
+            name = str(name)
+            values = np.asarray(values)
+            if name in self._fixed or (_is_text(values) and self.format == 'npy'):
+                values = self._encode(name, values)
+            prepared[name] = values
+
+        rows = {len(values) for values in prepared.values()}
+        if len(rows) > 1:
+            raise ValueError("Todas las columnas de un bloque deben tener la misma cantidad de filas")
+        if self._columns is None:
+            self._columns = list(prepared)
+        elif list(prepared) != self._columns:
+            raise ValueError("Los bloques deben traer las mismas columnas en el mismo orden")
+        return prepared, rows.pop() if rows else 0
+
+    def write(self, columns):
+        columns, rows = self._prepare(columns)
+        if self.format == 'npy':
+            self._write_npy(columns)
+        else:
+            self._write_arrow(columns)
+        self.rows += rows
+
+    def _write_npy(self, columns):
+        if not self._files:
+            used = set()
+            for name, values in columns.items():
+                file_name = _file_name(name, used)
+                handle = open(os.path.join(self.path, file_name), 'wb')
+                # Encabezado provisional; la cantidad de filas se completa al cerrar
+                handle.write(_npy_header(values.dtype, values.shape))
+                self._files[name] = (handle, file_name, values.dtype, values.shape[1:])
+        for name, values in columns.items():
+            handle, _, dtype, inner = self._files[name]
+            if values.shape[1:] != inner:
+                raise ValueError(f"La columna {name!r} cambió de forma entre bloques")
+            if dtype.kind in ('i', 'u') and values.dtype.kind == 'f' and not np.all(np.mod(values, 1) == 0):
+                # Un entero con vacíos llega como float; .npy no tiene cómo guardar el vacío
+                raise ValueError(f"La columna {name!r} cambió de tipo entre bloques ({dtype} en el primero, "
+                                 f"{values.dtype} en este) y trae vacíos o decimales que .npy no puede guardar")
+            handle.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+    def _arrow_array(self, name, values):
+        import pyarrow as pa
+
+        if name in self._encoded:
+            return pa.DictionaryArray.from_arrays(pa.array(values, mask=values < 0), pa.array(self._categories[name]))
+        if _is_text(values):
+            return pa.array(values, from_pandas=True)
+        if values.dtype.kind == 'M' and np.datetime_data(values.dtype)[0] in ('Y', 'M', 'W'):
+            values = values.astype('datetime64[D]')
+        if values.ndim == 2:
+            return pa.FixedSizeListArray.from_arrays(pa.array(np.ascontiguousarray(values).reshape(-1)),
+                                                     values.shape[1])
+        return pa.array(values)
+
+    def _write_arrow(self, columns):
+        import pyarrow as pa
+
+        table = pa.table([self._arrow_array(name, values) for name, values in columns.items()],
+                         names=list(columns))
+        if self._arrow is None:
+            # Las categorías y los metadatos viajan en el esquema
+            manifest = {'format': MANIFEST_FORMATS[self.format], 'version': 1,
+                        'categories': {name: self._categories[name] for name in self._encoded},
+                        'metadata': self.metadata}
+            self._schema = _first_chunk_schema(table.schema).with_metadata(
+                {'financeflow': json.dumps(manifest, ensure_ascii=False, default=str)})
+            if self.format == 'parquet':
+                import pyarrow.parquet as pq
+
+                self._arrow = pq.ParquetWriter(self.path, self._schema)
+            else:
+                self._arrow = pa.ipc.new_file(self.path, self._schema)
+        # Los bloques siguientes se ajustan a los tipos del primero
+        self._arrow.write_table(_conform_table(table, self._schema))
+
+    def _manifest(self):
+        return {
+            'format': MANIFEST_FORMATS['npy'],
+            'version': 1,
+            'rows': self.rows,
+            'columns': {},
+            'categories': {name: self._categories[name] for name in self._encoded},
+            'metadata': self.metadata
+        }
+
+    def close(self):
+        if self.format == 'npy' and self._columns is not None:
+            manifest = self._manifest()
+            for name, (handle, file_name, dtype, inner) in self._files.items():
+                shape = (self.rows,) + tuple(inner)
+                handle.seek(0)
+                handle.write(_npy_header(dtype, shape))
+                handle.close()
+                manifest['columns'][name] = {'file': file_name, 'dtype': str(dtype), 'shape': list(shape)}
+            with open(os.path.join(self.path, MANIFEST), 'w', encoding='utf-8') as output:
+                json.dump(manifest, output, indent=2, ensure_ascii=False, default=str)
+            self._files = {}
+            self._columns = None
+        elif self._arrow is not None:
+            self._arrow.close()
+            self._arrow = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def export_columns(path, columns, format=None, categories=None, metadata=None):
+    """Escribe un dict de columnas (o un DataFrame) de una vez; retorna la cantidad de filas."""
+    with ColumnarWriter(path, format, categories, metadata) as writer:
+        writer.write(columns)
+    return writer.rows
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST), encoding='utf-8') as source:
+        manifest = json.load(source)
+    if manifest.get('format') != MANIFEST_FORMATS['npy']:
+        raise ValueError(f"{directory!r} no es una exportación de FinanceFlow")
+    return manifest
+
+def open_npy(directory, columns=None):
+    """Columnas de un directorio `.npy` como memmaps de solo lectura (sin copiar ni leer todo el archivo)."""
+    manifest = read_manifest(directory)
+    names = columns or list(manifest['columns'])
+    return {name: np.load(os.path.join(directory, manifest['columns'][name]['file']), mmap_mode='r')
+            for name in names}
+
+def open_arrow(path):
+    """Tabla de un archivo Arrow IPC mapeada en memoria (sin copiar) o de un Parquet (leída completa)."""
+    import pyarrow as pa
+
+    if export_format(path) == 'parquet':
+        import pyarrow.parquet as pq
+
+        return pq.read_table(path)
+    return pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+
+def open_results(path):
+    """Abre una exportación: dict de memmaps para `.npy`, pyarrow.Table para Arrow y Parquet."""
+    return open_npy(path) if export_format(path) == 'npy' else open_arrow(path)
+
+def categories_of(path):
+    """Categorías de las columnas codificadas de una exportación, en cualquier formato."""
+    if export_format(path) == 'npy':
+        return read_manifest(path)['categories']
+    import pyarrow as pa
+
+    if export_format(path) == 'parquet':
+        import pyarrow.parquet as pq
+
+        metadata = pq.read_schema(path).metadata
+    else:
+        metadata = pa.ipc.open_file(pa.memory_map(str(path))).schema.metadata
+    manifest = json.loads((metadata or {}).get(b'financeflow', b'{}'))
+    if manifest.get('format') != MANIFEST_FORMATS[export_format(path)]:
+        raise ValueError(f"{str(path)!r} no es una exportación de FinanceFlow")
+    return manifest['categories']
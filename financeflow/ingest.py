@@ -0,0 +1,214 @@
+"""Carga masiva de presupuestos por bloques: lectura, validación, análisis 50-30-20 y escritura incremental.
+
+Cada etapa es un generador que recibe y entrega DataFrames de a un bloque,
+así la memoria usada depende del tamaño del bloque y no del archivo.
+"""
+import functools
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .batch import BatchFinancialPlanner
+from .planner import NEEDS_CATEGORIES, WANTS_CATEGORIES, RISK_LEVELS
+
+DEFAULT_CHUNKSIZE = 100_000
+INCOME_COLUMN = 'income'
+EXPENSE_COLUMNS = NEEDS_CATEGORIES + WANTS_CATEGORIES
+
+def _file_format(path):
+    extension = os.path.splitext(str(path).rstrip('/\\'))[1].lower()
+    if extension in ('.parquet', '.pq'):
+        return 'parquet'
+    if extension in ('.csv', '.txt', '.gz'):
+        return 'csv'
+    if extension in ('.json', '.jsonl'):
+        return 'json'
+    if extension in ('.arrow', '.feather', '.ipc'):
+        return 'arrow'
+    if extension in ('', '.npy'):
+        # Directorio de columnas .npy (financeflow.export)
+        return 'npy'
+    raise ValueError(f"Formato de archivo no soportado: {path!r} (use .csv, .parquet, .json, .arrow o un directorio .npy)")
+
+def read_budget_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Genera bloques de `chunksize` filas de un archivo CSV, Parquet, JSON Lines, Arrow IPC o directorio .npy."""
+    if _file_format(path) == 'parquet':
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif _file_format(path) == 'arrow':
+        from .export import open_arrow
+
+        for batch in open_arrow(path).to_batches(max_chunksize=chunksize):
+            yield batch.to_pandas()
+    elif _file_format(path) == 'npy':
+        from .export import open_npy, read_manifest
+
+        categories = read_manifest(path)['categories']
+        # Solo columnas 1D; los memmaps se leen de a un bloque
+        columns = {name: values for name, values in open_npy(path).items() if values.ndim == 1}
+        rows = len(next(iter(columns.values()))) if columns else 0
+        for start in range(0, rows, chunksize):
+            chunk = {name: values[start:start + chunksize] for name, values in columns.items()}
+            for name, names in categories.items():
+                if name in chunk:
+                    chunk[name] = pd.Categorical.from_codes(chunk[name], names)
+            yield pd.DataFrame(chunk)
+    elif _file_format(path) == 'json':
+        # JSON Lines: un objeto por línea
+        yield from pd.read_json(path, lines=True, chunksize=chunksize)
+    else:
+        # low_memory=False evita inferir tipos por sub-bloques; el bloque ya acota la memoria
+        yield from pd.read_csv(path, chunksize=chunksize, low_memory=False)
+
+def validate_chunk(chunk, income_column=INCOME_COLUMN):
+    """Separa un bloque en filas válidas y rechazadas (con la columna `reason`).
+
+    Las categorías ausentes o vacías cuentan como gasto cero; se rechazan
+    ingresos vacíos y valores no numéricos o negativos.
+    """
+    if income_column not in chunk.columns:
+        raise ValueError(f"El archivo no tiene la columna de ingresos {income_column!r}")
+
+    chunk = chunk.copy()
+    reason = pd.Series('', index=chunk.index, dtype=object)
+
+    income = pd.to_numeric(chunk[income_column], errors='coerce')
+    reason[income.isna()] = 'ingreso vacío o no numérico'
+    reason[(income < 0) & (reason == '')] = 'ingreso negativo'
+    chunk[income_column] = income
+
+    for column in EXPENSE_COLUMNS:
+        if column not in chunk.columns:
+            continue
+        raw = chunk[column]
+        values = pd.to_numeric(raw, errors='coerce')
+        reason[values.isna() & raw.notna() & (reason == '')] = f'{column} no numérico'
+        reason[(values < 0) & (reason == '')] = f'{column} negativo'
+        chunk[column] = values.fillna(0)
+
+    valid = (reason == '').to_numpy()
+    rejected = chunk[~valid].assign(reason=reason[~valid])
+    return chunk[valid], rejected
+
+def analyze_chunk(chunk, income_column=INCOME_COLUMN):
+    """Análisis 50-30-20 vectorizado de un bloque; conserva las columnas que no son de gastos (ids, etc.)."""
+    from .export import planner_columns
+
+    columns = planner_columns(BatchFinancialPlanner.from_frame(chunk, income_column=income_column))
+    # El nivel de riesgo viaja como categoría: texto en CSV y JSON, códigos en las salidas columnares
+    columns['risk_level'] = pd.Categorical.from_codes(columns['risk_level'], RISK_LEVELS)
+    results = pd.DataFrame(columns, index=chunk.index)
+    passthrough = [c for c in chunk.columns if c not in EXPENSE_COLUMNS and c != income_column]
+    return pd.concat([chunk[passthrough], results], axis=1)
+
+class ResultWriter:
+    """Escribe bloques de resultados en CSV, JSON Lines, Parquet, Arrow IPC o un directorio .npy a medida que llegan.
+
+    Parquet, Arrow y .npy se escriben con financeflow.export.ColumnarWriter:
+    llevan categorías y metadatos, y los bloques pueden ser DataFrames o
+    dicts de columnas (incluidas matrices). CSV y JSON reciben DataFrames.
+    """
+
+    def __init__(self, path, format=None):
+        self.path = path
+        self.format = format or _file_format(path)
+        self.rows = 0
+        self._columnar = None
+        if self.format in ('parquet', 'arrow', 'npy'):
+            from .export import ColumnarWriter
+
+            self._columnar = ColumnarWriter(path, self.format)
+
+    @property
+    def columnar(self):
+        return self._columnar is not None
+
+    def write(self, frame):
+        if self._columnar is not None:
+            before = self._columnar.rows
+            self._columnar.write(frame)
+            self.rows += self._columnar.rows - before
+            return
+        if not hasattr(frame, 'to_csv'):
+            frame = pd.DataFrame(frame)
+        if self.format == 'json':
+            with open(self.path, 'w' if self.rows == 0 else 'a', encoding='utf-8') as output:
+                frame.to_json(output, orient='records', lines=True, force_ascii=False)
+                output.write('\n')
+        else:
+            frame.to_csv(self.path, mode='w' if self.rows == 0 else 'a', header=self.rows == 0, index=False)
+        self.rows += len(frame)
+
+    def close(self):
+        if self._columnar is not None:
+            self._columnar.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def map_chunks(func, chunks, workers=1):
+    """Aplica `func` a cada bloque conservando el orden.
+
+    Con `workers` > 1 los bloques se reparten en un pool de procesos con a lo
+    sumo dos bloques pendientes por proceso, para que la memoria siga acotada.
+    """
+    if workers <= 1:
+        yield from map(func, chunks)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(func, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _validate_and_analyze(chunk, income_column=INCOME_COLUMN):
+    valid, rejected = validate_chunk(chunk, income_column)
+    return (analyze_chunk(valid, income_column) if len(valid) else None), rejected
+
+def analyze_stream(chunks, income_column=INCOME_COLUMN, rejects=None, workers=1):
+    """Valida y analiza cada bloque; las filas rechazadas se pasan a `rejects` si se indica."""
+    task = functools.partial(_validate_and_analyze, income_column=income_column)
+    for results, rejected in map_chunks(task, chunks, workers):
+        if rejects is not None and len(rejected):
+            rejects.write(rejected)
+        if results is not None:
+            yield results
+
+def run_pipeline(source, destination, chunksize=DEFAULT_CHUNKSIZE, rejects_path=None,
+                 income_column=INCOME_COLUMN, workers=1, format=None):
+    """Procesa `source` completo por bloques y escribe los resultados en `destination`.
+
+    Retorna un resumen con filas procesadas, rechazadas y conteo por nivel de riesgo.
+    """
+    risk_counts = Counter()
+    rejects = ResultWriter(rejects_path) if rejects_path else None
+    chunks = 0
+    try:
+        with ResultWriter(destination, format) as writer:
+            for results in analyze_stream(read_budget_chunks(source, chunksize), income_column, rejects, workers):
+                writer.write(results)
+                risk_counts.update(dict(zip(*np.unique(results['risk_level'], return_counts=True))))
+                chunks += 1
+    finally:
+        if rejects is not None:
+            rejects.close()
+
+    return {
+        'rows': writer.rows,
+        'rejected': rejects.rows if rejects is not None else None,
+        'chunks': chunks,
+        'risk_levels': {level: int(risk_counts.get(level, 0)) for level in RISK_LEVELS}
+    }
@@ -0,0 +1,107 @@
+"""Libro de flujo de caja mes a mes sobre meses reales de calendario.
+
+Los meses son datetime64[M] consecutivos desde el mes de inicio. Cada
+concepto es una columna: un arreglo (meses,) o (hogares, meses) si los
+montos llegan como arreglos por hogar. Compras y créditos se ubican en sus
+meses con operaciones por columnas, sin objetos por evento, así que un libro
+de 30 años para miles de hogares se arma en milisegundos.
+"""
+from datetime import datetime
+
+import numpy as np
+
+from .amortization import annuity_payment
+
+def calendar_months(start, months):
+    """`months` meses de calendario consecutivos (datetime64[M]) desde el mes de `start`."""
+    return np.datetime64(start, 'M') + np.arange(months)
+
+def _monthly(values, months):
+    # La última dimensión son los meses: (meses,) es por mes y (hogares, 1) un monto fijo por hogar
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 0:
+        return np.full(months, float(values))
+    return np.array(np.broadcast_to(values, values.shape[:-1] + (months,)))
+
+def _events(amount, month, months):
+    # Suma de montos por mes de ocurrencia; los eventos fuera del horizonte se ignoran
+    amount = np.asarray(amount, dtype=np.float64).reshape(-1)
+    month = np.asarray(month, dtype=np.int64).reshape(-1)
+    inside = (month >= 0) & (month < months)
+    return np.bincount(month[inside], weights=amount[inside], minlength=months)
+
+def loan_payments(principal, annual_rate, loan_months, start_month, months):
+    """Cuotas de varios créditos de anualidad fija sumadas por mes (arreglo de `months` valores)."""
+    principal = np.asarray(principal, dtype=np.float64).reshape(-1, 1)
+    loan_months = np.asarray(loan_months, dtype=np.int64).reshape(-1, 1)
+    start_month = np.asarray(start_month, dtype=np.int64).reshape(-1, 1)
+    payment = annuity_payment(principal, np.asarray(annual_rate, dtype=np.float64).reshape(-1, 1), loan_months)
+    month = np.arange(months)
+    active = (month >= start_month) & (month < start_month + loan_months)
+    return (payment * active).sum(axis=0)
+
+def cash_flow_ledger(income, needs, wants, savings=0.0, months=12, start=None,
+                     purchase_contributions=0.0, purchases=None, loans=None):
+    """Flujo de caja mensual de uno o muchos hogares durante `months` meses de calendario.
+
+    `income`, `needs`, `wants`, `savings` (aporte a ahorro) y
+    `purchase_contributions` (lo que se aparta para compras, p. ej.
+    `monthly_total` de scheduler.schedule_goals) son montos fijos, por mes
+    (meses,), por hogar (hogares, 1) o por hogar y mes. `purchases` es un
+    dict con `price` y `month` (índice del mes en que se paga desde el fondo
+    de compras) y `loans` uno con `principal`, `annual_rate`, `months` y
+    `start_month`; ambos aplican a todos los hogares.
+
+    Retorna columnas: `month`, cada flujo, `net` (caja libre del mes)
+    y los saldos acumulados `cash_balance`, `savings_balance` y `purchase_fund`.
+    """
+    start = start or datetime.now()
+    calendar = calendar_months(start, months)
+    income = _monthly(income, months)
+    needs = _monthly(needs, months)
+    wants = _monthly(wants, months)
+    savings = _monthly(savings, months)
+    contributions = _monthly(purchase_contributions, months)
+
+    purchase_spend = np.zeros(months)
+    if purchases is not None:
+        purchase_spend = _events(purchases['price'], purchases['month'], months)
+    loan_payment = np.zeros(months)
+    if loans is not None:
+        loan_payment = loan_payments(loans['principal'], loans['annual_rate'], loans['months'],
+                                     loans['start_month'], months)
+
+    net = income - needs - wants - savings - contributions - loan_payment
+    return {
+        'month': calendar,
+        'income': income,
+        'needs': needs,
+        'wants': wants,
+        'savings': savings,
+        'purchase_contributions': contributions,
+        'purchase_spend': purchase_spend,
+        'loan_payment': loan_payment,
+        'net': net,
+        'cash_balance': np.cumsum(net, axis=-1),
+        'savings_balance': np.cumsum(savings, axis=-1),
+        'purchase_fund': np.cumsum(contributions - purchase_spend, axis=-1)
+    }
+
+def ledger_frame(ledger):
+    """Libro de un solo hogar como DataFrame, una fila por mes."""
+    import pandas as pd
+
+    return pd.DataFrame({
+        'Mes': ledger['month'].astype(str),
+        'Ingresos': ledger['income'],
+        'Necesidades': ledger['needs'],
+        'Deseos': ledger['wants'],
+        'Ahorro': ledger['savings'],
+        'Aporte a Compras': ledger['purchase_contributions'],
+        'Compras': ledger['purchase_spend'],
+        'Cuotas de Crédito': ledger['loan_payment'],
+        'Caja Libre': ledger['net'],
+        'Saldo de Caja': ledger['cash_balance'],
+        'Saldo de Ahorro': ledger['savings_balance'],
+        'Fondo de Compras': ledger['purchase_fund']
+    })
@@ -0,0 +1,126 @@
+"""Proyección Monte Carlo de aportes mensuales a las opciones del catálogo de inversión."""
+import math
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .advisor import CATALOG
+from .cache import memoize
+from .profiling import profiled
+
+# Volatilidad anual supuesta para cada nivel de riesgo del catálogo
+RISK_VOLATILITY = {
+    'Nulo': 0.0,
+    'Muy Bajo': 0.01,
+    'Bajo': 0.03,
+    'Medio': 0.10,
+    'Medio-Alto': 0.18,
+    'Alto': 0.25,
+}
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+DEFAULT_SEED = 2024
+# Trayectorias por bloque: cada bloque tiene su propia semilla derivada de la semilla y su posición
+PATH_BLOCK = 4096
+
+# Opción en la que se proyecta el fondo de emergencia (alta liquidez, riesgo muy bajo)
+EMERGENCY_OPTION_ID = 5
+
+_RETURN_RANGE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)\s*%\s*$')
+
+def return_distribution(option):
+    """(media, volatilidad) anuales de una opción, o None si su rentabilidad no es numérica.
+
+    La media es el punto medio del rango publicado; la volatilidad es la del
+    nivel de riesgo, o la cuarta parte del rango si es mayor (rango ≈ ±2σ).
+    """
+    match = _RETURN_RANGE.match(option.expected_return)
+    if match is None:
+        return None
+    low, high = float(match.group(1)) / 100, float(match.group(2)) / 100
+    return (low + high) / 2, max(RISK_VOLATILITY.get(option.risk, 0.10), (high - low) / 4)
+
+def _simulate_shard(allocations, months, paths, seed):
+    # Riqueza de todas las trayectorias al cierre de cada año: matriz (años + 1, trayectorias)
+    rng = np.random.default_rng(seed)
+    years = months // 12
+    half = (paths + 1) // 2
+    checkpoints = np.zeros((years + 1, 2 * half))
+    # Variables antitéticas: la segunda mitad usa los mismos choques con signo contrario,
+    # lo que reduce la varianza y sortea la mitad de los números aleatorios
+    growth = np.empty((2, 12, half), dtype=np.float32)
+    for mean, volatility, contribution, initial in allocations:
+        # Retornos log-normales mensuales con E[crecimiento anual] = 1 + media
+        monthly_sigma = volatility / math.sqrt(12)
+        monthly_mu = math.log1p(mean) / 12 - monthly_sigma ** 2 / 2
+        wealth = np.full((2, half), float(initial))
+        for year in range(years):
+            # Se sortea un año completo de retornos a la vez para amortizar el costo del generador
+            rng.standard_normal(out=growth[0], dtype=np.float32)
+            np.negative(growth[0], out=growth[1])
+            growth *= monthly_sigma
+            growth += monthly_mu
+            np.exp(growth, out=growth)
+            for month in range(12):
+                wealth += contribution
+                wealth *= growth[:, month]
+            checkpoints[year + 1] += wealth.reshape(-1)
+        checkpoints[0] += initial
+    return checkpoints[:, :paths]
+
+def _path_blocks(paths, seed):
+    # Los bloques dependen solo de `paths` y `seed`, no de cuántos procesos los simulan
+    sizes = [min(PATH_BLOCK, paths - start) for start in range(0, paths, PATH_BLOCK)]
+    return sizes, np.random.SeedSequence(seed).spawn(len(sizes))
+
+def simulate_portfolio(allocations, years, paths=10_000, seed=DEFAULT_SEED, workers=1):
+    """Simula aportes mensuales a varias posiciones y retorna la riqueza total por año y trayectoria.
+
+    `allocations` es una secuencia de (media anual, volatilidad anual, aporte
+    mensual, saldo inicial). Las trayectorias se simulan en bloques de
+    PATH_BLOCK con semillas derivadas de `seed`; con `workers` > 1 los bloques
+    se reparten entre procesos y el resultado es el mismo que con uno solo.
+    """
+    allocations = tuple(tuple(float(v) for v in allocation) for allocation in allocations)
+    months = int(years) * 12
+    sizes, seeds = _path_blocks(paths, seed)
+    if workers <= 1 or len(sizes) == 1:
+        results = map(_simulate_shard, [allocations] * len(sizes), [months] * len(sizes), sizes, seeds)
+        return np.concatenate(list(results), axis=1)
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(sizes))) as pool:
+        results = pool.map(_simulate_shard, [allocations] * len(sizes), [months] * len(sizes), sizes, seeds)
+        return np.concatenate(list(results), axis=1)
+
+def project(allocations, years, paths=10_000, seed=DEFAULT_SEED, percentiles=DEFAULT_PERCENTILES, workers=1):
+    """Bandas de percentiles de la riqueza al cierre de cada año (0..years)."""
+    wealth = simulate_portfolio(allocations, years, paths, seed, workers)
+    contributed = sum(12 * contribution for _, _, contribution, _ in allocations)
+    initial = sum(initial for _, _, _, initial in allocations)
+    bands = np.percentile(wealth, percentiles, axis=1)
+    return {
+        'year': np.arange(int(years) + 1),
+        'percentiles': dict(zip(percentiles, bands)),
+        'mean': wealth.mean(axis=1),
+        'contributed': initial + contributed * np.arange(int(years) + 1),
+        'paths': wealth.shape[1]
+    }
+
+@profiled('montecarlo.project_option')
+@memoize(maxsize=64)
+def project_option(option_id, monthly_contribution, years, emergency_contribution=0, paths=10_000, seed=DEFAULT_SEED):
+    """Proyección de aportar cada mes a una opción del catálogo, opcionalmente con el fondo de emergencia.
+
+    El fondo de emergencia se proyecta en la opción EMERGENCY_OPTION_ID y se
+    suma trayectoria a trayectoria. Memorizada por sus entradas.
+    """
+    distribution = return_distribution(CATALOG[option_id])
+    if distribution is None:
+        raise ValueError(f"La opción {CATALOG[option_id].name!r} no tiene una rentabilidad numérica")
+    allocations = [(*distribution, monthly_contribution, 0)]
+    if emergency_contribution > 0:
+        allocations.append((*return_distribution(CATALOG[EMERGENCY_OPTION_ID]), emergency_contribution, 0))
+    return project(allocations, years, paths, seed)
+
+def simulable_options(options):
+    return tuple(option for option in options if return_distribution(option) is not None)
@@ -0,0 +1,340 @@
+import calendar
+import itertools
+import sys
+from array import array
+from datetime import datetime
+
+# Categorías de gastos que maneja la aplicación (mismas claves de planner.needs / planner.wants)
+NEEDS_CATEGORIES = ('rent', 'utilities', 'groceries', 'transport', 'health', 'children', 'pets', 'phone')
+WANTS_CATEGORIES = ('entertainment', 'dining', 'clothing', 'hobbies', 'travel', 'shopping')
+
+# Niveles de riesgo indexados por código (0 = Bajo, 1 = Medio, 2 = Alto)
+RISK_LEVELS = ('Bajo', 'Medio', 'Alto')
+RISK_COLORS = ('#00b894', '#fdcb6e', '#e17055')
+
+# Recomendaciones del análisis de riesgo: tuplas inmutables que comparten
+# todos los planificadores del proceso en lugar de armar listas en cada llamada
+RECOMMENDATIONS_UNDER_BUDGET = (
+    "✅ Gastos básicos bajo control",
+    "💡 Considerar optimizar aún más para aumentar ahorros",
+    "🎯 Mantener disciplina financiera"
+)
+RECOMMENDATIONS_MEDIUM_RISK = (
+    "⚠️ Advertencia: Gastos básicos exceden el presupuesto",
+    "🔍 Identificar gastos reducibles",
+    "📈 Planificar aumento de ingresos"
+)
+RECOMMENDATIONS_HIGH_RISK = (
+    "🚨 Urgente: Reducir gastos básicos o aumentar ingresos",
+    "📊 Revisar todos los gastos y eliminar los no esenciales",
+    "💼 Considerar fuentes de ingresos adicionales"
+)
+
+# Contador global de versiones: cada cambio de un monto toma el siguiente número,
+# así una versión nunca se repite aunque se reemplace el vector completo
+_VERSIONS = itertools.count(1)
+
+class CategoryVector:
+    """Montos por categoría con esquema fijo, guardados en un array('d') contiguo.
+
+    Se usa como un dict (`vector['rent']`, `.get`, `.items`) pero ocupa un
+    solo bloque de 8 bytes por categoría. Las categorías fuera del esquema
+    lanzan KeyError.
+
+    `version` cambia solo cuando un monto cambia de verdad; reasignar el
+    mismo valor no cuenta. El total se suma de nuevo al pedirlo, de izquierda
+    a derecha como BatchFinancialPlanner, y se guarda hasta el siguiente
+    cambio de versión.
+    """
+
+    __slots__ = ('categories', 'version', '_index', '_values', '_total')
+
+    def __init__(self, categories, values=None):
+        self.categories = categories
+        self.version = next(_VERSIONS)
+        self._index = _category_index(categories)
+        self._values = array('d', bytes(8 * len(categories)))
+        self._total = None
+        if values:
+            self.update(values)
+
+    def __getitem__(self, category):
+        return self._values[self._index[category]]
+
+    def __setitem__(self, category, value):
+        index = self._index[category]
+        previous = self._values[index]
+        self._values[index] = value
+        if self._values[index] != previous:
+            self.version = next(_VERSIONS)
+
+    def __contains__(self, category):
+        return category in self._index
+
+    def __iter__(self):
+        return iter(self.categories)
+
+    def __len__(self):
+        return len(self.categories)
+
+    def __eq__(self, other):
+        if isinstance(other, CategoryVector):
+            return self.categories == other.categories and self._values == other._values
+        return NotImplemented
+
+    def __repr__(self):
+        return f"CategoryVector({self.to_dict()!r})"
+
+    def get(self, category, default=None):
+        index = self._index.get(category)
+        return default if index is None else self._values[index]
+
+    def keys(self):
+        return self.categories
+
+    def values(self):
+        return self._values
+
+    def items(self):
+        return zip(self.categories, self._values)
+
+    def update(self, values):
+        for category, value in (values.items() if hasattr(values, 'items') else values):
+            self[category] = value
+
+    def clear(self):
+        self._values = array('d', bytes(8 * len(self.categories)))
+        self.version = next(_VERSIONS)
+
+    def total(self):
+        # Se suma desde los montos actuales (sin errores acumulados) y se guarda junto a su versión
+        if self._total is None or self._total[0] != self.version:
+            self._total = (self.version, sum(self._values, 0.0))
+        return self._total[1]
+
+    def to_dict(self):
+        return dict(zip(self.categories, self._values))
+
+    def nbytes(self):
+        # Memoria propia de la instancia; la tupla de categorías y el índice se comparten
+        return sys.getsizeof(self) + sys.getsizeof(self._values)
+
+_CATEGORY_INDEXES = {}
+
+def _category_index(categories):
+    # Un solo dict categoría -> posición por esquema, compartido por todos los vectores
+    index = _CATEGORY_INDEXES.get(categories)
+    if index is None:
+        index = _CATEGORY_INDEXES.setdefault(categories, {c: i for i, c in enumerate(categories)})
+    return index
+
+class FamilyInfo:
+    """Composición familiar con campos fijos; admite acceso tipo dict por compatibilidad."""
+
+    __slots__ = ('has_children', 'num_children', 'children_ages', 'has_pets', 'num_pets')
+
+    def __init__(self, has_children=False, num_children=0, children_ages="", has_pets=False, num_pets=0):
+        self.has_children = has_children
+        self.num_children = num_children
+        self.children_ages = children_ages
+        self.has_pets = has_pets
+        self.num_pets = num_pets
+
+    def __getitem__(self, field):
+        if field not in self.__slots__:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __setitem__(self, field, value):
+        if field not in self.__slots__:
+            raise KeyError(field)
+        setattr(self, field, value)
+
+    def __eq__(self, other):
+        if isinstance(other, FamilyInfo):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __repr__(self):
+        return f"FamilyInfo({self.to_dict()!r})"
+
+    def get(self, field, default=None):
+        return getattr(self, field) if field in self.__slots__ else default
+
+    def items(self):
+        return ((field, getattr(self, field)) for field in self.__slots__)
+
+    def update(self, values):
+        for field, value in values.items():
+            self[field] = value
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def nbytes(self):
+        # Los bool y los enteros pequeños son objetos compartidos; solo cuentan el registro y el texto
+        return sys.getsizeof(self) + (sys.getsizeof(self.children_ages) if self.children_ages else 0)
+
+class FinancialPlanner:
+    """Presupuesto de un usuario: ingreso, gastos por categoría y composición familiar.
+
+    `needs` y `wants` son CategoryVector con las categorías de NEEDS_CATEGORIES
+    y WANTS_CATEGORIES; asignarles un dict (p. ej. el JSON guardado) lo
+    convierte al esquema fijo.
+
+    Presupuestos, saldo restante y análisis de riesgo se guardan junto a las
+    versiones de las que dependen (`income`, `needs`, `wants`) y solo se
+    recalculan cuando alguna cambia; `derived` ofrece el mismo mecanismo a
+    las vistas.
+    """
+
+    __slots__ = ('savings_investments', 'income_version', '_income', '_needs', '_wants', '_family_info', '_derived')
+
+    def __init__(self):
+        self._income = 0
+        self.income_version = next(_VERSIONS)
+        self._derived = {}
+        self.needs = {}
+        self.wants = {}
+        self.savings_investments = 0
+        self.family_info = {}
+
+    @property
+    def income(self):
+        return self._income
+
+    @income.setter
+    def income(self, value):
+        if value != self._income:
+            self.income_version = next(_VERSIONS)
+        self._income = value
+
+    @property
+    def needs(self):
+        return self._needs
+
+    @needs.setter
+    def needs(self, values):
+        self._needs = CategoryVector(NEEDS_CATEGORIES, values)
+
+    @property
+    def wants(self):
+        return self._wants
+
+    @wants.setter
+    def wants(self, values):
+        self._wants = CategoryVector(WANTS_CATEGORIES, values)
+
+    @property
+    def family_info(self):
+        return self._family_info
+
+    @family_info.setter
+    def family_info(self, values):
+        self._family_info = FamilyInfo()
+        if values:
+            self._family_info.update(values)
+
+    @property
+    def version(self):
+        # Versión del estado completo: cambia con cualquier monto
+        return max(self.income_version, self._needs.version, self._wants.version)
+
+    def versions(self, dependencies):
+        return tuple(self.income_version if name == 'income' else getattr(self, name).version for name in dependencies)
+
+    def derived(self, name, dependencies, compute):
+        """Resultado de `compute()` reutilizado mientras no cambien `dependencies`.
+
+        `dependencies` es una tupla con 'income', 'needs' y/o 'wants'. El
+        resultado se comparte entre llamadas: no debe modificarse.
+        """
+        key = self.versions(dependencies)
+        entry = self._derived.get(name)
+        if entry is None or entry[0] != key:
+            entry = self._derived[name] = (key, compute())
+        return entry[1]
+
+    def memory_footprint(self):
+        """Bytes que ocupa este planificador en la sesión, por componente."""
+        footprint = {
+            'planner': sys.getsizeof(self),
+            'needs': self._needs.nbytes(),
+            'wants': self._wants.nbytes(),
+            'family_info': self._family_info.nbytes(),
+        }
+        footprint['total'] = sum(footprint.values())
+        return footprint
+
+    def calculate_percentages(self):
+        return self.derived('budgets', ('income',), self._calculate_percentages)
+
+    def _calculate_percentages(self):
+        return {
+            'needs_budget': self.income * 0.50,
+            'wants_budget': self.income * 0.30,
+            'savings_budget': self.income * 0.20
+        }
+
+    def calculate_needs_total(self):
+        return self._needs.total()
+
+    def calculate_wants_total(self):
+        return self._wants.total()
+
+    def calculate_remaining_income(self):
+        return self.derived('remaining_income', ('income', 'needs', 'wants'), self._calculate_remaining_income)
+
+    def _calculate_remaining_income(self):
+        # Lo que queda del salario después de necesidades, deseos y el 20% de ahorro
+        budgets = self.calculate_percentages()
+        return self.income - self.calculate_needs_total() - self.calculate_wants_total() - budgets['savings_budget']
+
+    def get_risk_analysis(self):
+        return self.derived('risk_analysis', ('income', 'needs'), self._get_risk_analysis)
+
+    def _get_risk_analysis(self):
+        budgets = self.calculate_percentages()
+        needs_total = self.calculate_needs_total()
+
+        risk_level = "Bajo"
+        risk_color = "#00b894"
+        recommendations = ()
+
+        if needs_total > budgets['needs_budget']:
+            excess = needs_total - budgets['needs_budget']
+            # Sin ingresos cualquier exceso cuenta como riesgo alto, igual que en BatchFinancialPlanner
+            excess_percent = (excess / self.income) * 100 if self.income > 0 else float('inf')
+
+            if excess_percent > 20:
+                risk_level = "Alto"
+                risk_color = "#e17055"
+                recommendations = RECOMMENDATIONS_HIGH_RISK
+            elif excess_percent > 10:
+                risk_level = "Medio"
+                risk_color = "#fdcb6e"
+                recommendations = RECOMMENDATIONS_MEDIUM_RISK
+        else:
+            recommendations = RECOMMENDATIONS_UNDER_BUDGET
+
+        return {
+            'level': risk_level,
+            'color': risk_color,
+            'recommendations': recommendations,
+            'needs_excess': max(0, needs_total - budgets['needs_budget'])
+        }
+
+def hourly_rate(income, hours_per_week, today=None):
+    """Valor de la hora de trabajo según las semanas reales del mes en curso.
+
+    Retorna None si no hay horas o ingresos para dividir.
+    """
+    today = today or datetime.today()
+    # Número de días del mes actual y semanas reales del mes
+    dias_mes = calendar.monthrange(today.year, today.month)[1]
+    horas_mes = hours_per_week * (dias_mes / 7)
+
+    # Evitamos división por cero
+    if horas_mes > 0 and income > 0:
+        return income / horas_mes
+    return None
@@ -0,0 +1,144 @@
+"""Instrumentación opcional: tiempos y contadores por sección de la interfaz y función del motor.
+
+Está apagada salvo que FINANCEFLOW_PROFILE=1 al iniciar el proceso. Apagada,
+`section` retorna un contexto vacío compartido y las funciones decoradas con
+`profiled` solo consultan una bandera antes de ejecutarse.
+"""
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+# Mediciones recientes que se conservan por sección para los percentiles
+DEFAULT_WINDOW = 2048
+QUANTILES = (50, 95, 99)
+
+_NULL_CONTEXT = nullcontext()
+
+def _percentile(ordered, q):
+    # Rango más cercano sobre una lista ya ordenada
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class _Timer:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+
+class Profiler:
+    """Acumula duraciones por sección y contadores de eventos.
+
+    Es segura entre hilos: todas las sesiones de Streamlit del proceso
+    escriben en el mismo perfilador. Por sección guarda el total histórico y
+    una ventana de las últimas `window` mediciones para p50/p95/p99.
+    """
+
+    def __init__(self, enabled=False, window=DEFAULT_WINDOW):
+        self.enabled = enabled
+        self.window = window
+        self._samples = {}
+        self._totals = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def section(self, name):
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return _Timer(self, name)
+
+    def record(self, name, seconds):
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+                self._totals[name] = [0, 0.0]
+            samples.append(seconds)
+            totals = self._totals[name]
+            totals[0] += 1
+            totals[1] += seconds
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            with self._lock:
+                self._counters[name] = self._counters.get(name, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        """Resumen por sección (llamadas, total, media, percentiles y máximo en ms) y contadores."""
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+            totals = {name: tuple(values) for name, values in self._totals.items()}
+            counters = dict(self._counters)
+
+        sections = {}
+        for name in sorted(samples):
+            ordered = samples[name]
+            count, seconds = totals[name]
+            stats = {'count': count, 'total_ms': seconds * 1000, 'mean_ms': seconds / count * 1000}
+            for q in QUANTILES:
+                stats[f'p{q}_ms'] = _percentile(ordered, q) * 1000
+            stats['max_ms'] = ordered[-1] * 1000
+            sections[name] = stats
+        return {'sections': sections, 'counters': dict(sorted(counters.items()))}
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent, ensure_ascii=False)
+
+    def to_prometheus(self, prefix='financeflow'):
+        """Formato de texto de Prometheus: un summary por sección (en segundos) y un counter por evento."""
+        snapshot = self.snapshot()
+        lines = [
+            f'# HELP {prefix}_section_seconds Duración de las secciones instrumentadas.',
+            f'# TYPE {prefix}_section_seconds summary',
+        ]
+        for name, stats in snapshot['sections'].items():
+            section = _label(name)
+            for q in QUANTILES:
+                lines.append(f'{prefix}_section_seconds{{section="{section}",quantile="{q / 100:g}"}} '
+                             f'{stats[f"p{q}_ms"] / 1000:.9g}')
+            lines.append(f'{prefix}_section_seconds_sum{{section="{section}"}} {stats["total_ms"] / 1000:.9g}')
+            lines.append(f'{prefix}_section_seconds_count{{section="{section}"}} {stats["count"]}')
+        lines += [
+            f'# HELP {prefix}_events_total Eventos contados por la aplicación.',
+            f'# TYPE {prefix}_events_total counter',
+        ]
+        for name, value in snapshot['counters'].items():
+            lines.append(f'{prefix}_events_total{{event="{_label(name)}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+PROFILER = Profiler(enabled=os.environ.get('FINANCEFLOW_PROFILE', '') not in ('', '0'))
+
+def profiled(name):
+    """Decorador que mide cada llamada de la función como la sección `name` de PROFILER."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                PROFILER.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
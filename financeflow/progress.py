@@ -0,0 +1,40 @@
+"""Series de ahorro acumulado calculadas en forma cerrada con NumPy."""
+import numpy as np
+
+def progress_matrix(monthly_saves, months_needed, goals, horizon=None):
+    """Ahorro acumulado de varias compras a la vez: matriz (compras x meses 0..horizonte).
+
+    Igual que la serie original, cada mes < months_needed suma una cuota (el
+    mes 0 ya incluye la primera) y el valor nunca supera la meta. Después del
+    plazo de cada compra la serie queda plana.
+    """
+    monthly_saves = np.asarray(monthly_saves, dtype=np.float64).reshape(-1, 1)
+    months_needed = np.asarray(months_needed, dtype=np.int64).reshape(-1, 1)
+    goals = np.asarray(goals, dtype=np.float64).reshape(-1, 1)
+    if horizon is None:
+        horizon = int(months_needed.max()) if months_needed.size else 0
+
+    month = np.arange(horizon + 1)
+    deposits = np.minimum(month + 1, months_needed)
+    return np.minimum(deposits * monthly_saves, goals)
+
+def progress_columns(monthly_save, months_needed, item_price):
+    """Columnas (arreglos de NumPy) del ahorro acumulado mes a mes hacia la meta."""
+    months_needed = int(months_needed)
+    return {
+        'Mes': np.arange(months_needed + 1),
+        'Ahorro Acumulado': progress_matrix(monthly_save, months_needed, item_price)[0],
+        'Meta': np.full(months_needed + 1, float(item_price))
+    }
+
+def savings_progress(monthly_save, months_needed, item_price):
+    """DataFrame columnar con el ahorro acumulado mes a mes hacia la meta."""
+    import pandas as pd
+
+    return pd.DataFrame(progress_columns(monthly_save, months_needed, item_price))
+
+def downsample_indices(length, max_points):
+    """Índices equiespaciados (incluye el primero y el último) para graficar series largas."""
+    if length <= max_points:
+        return np.arange(length)
+    return np.unique(np.linspace(0, length - 1, max_points).round().astype(np.int64))
@@ -0,0 +1,139 @@
+import calendar
+import math
+import os
+from datetime import datetime
+from types import MappingProxyType
+
+from .cache import memoize
+from .profiling import profiled
+
+# Condiciones de la simulación de crédito de referencia
+DEFAULT_ANNUAL_RATE = 0.24
+DEFAULT_MAX_LOAN_MONTHS = 36
+
+# Cantidad de planes de compra distintos que se recuerdan en el proceso
+PLAN_CACHE_SIZE = int(os.environ.get('FINANCEFLOW_PLAN_CACHE_SIZE', 512))
+
+def plan_savings(item_price, available_wants, save_percentage):
+    """Plan de ahorro para una compra con el porcentaje del presupuesto de deseos elegido."""
+    # 1. Calcular el monto máximo mensual disponible
+    max_monthly_save = available_wants * save_percentage
+
+    # 2. Calcular meses necesarios (redondeado hacia arriba)
+    months_needed = math.ceil(item_price / max_monthly_save) if max_monthly_save > 0 else float('inf')
+
+    # 3. Calcular la cuota mensual exacta para obtener meses enteros
+    monthly_save = item_price / months_needed if months_needed < float('inf') else 0
+
+    # Verificar que la cuota calculada no exceda el presupuesto disponible
+    if monthly_save > available_wants:
+        # Si excede, recalcular con el máximo disponible
+        monthly_save = available_wants
+        months_needed = math.ceil(item_price / monthly_save)
+
+    # Validación: si por redondeo faltara dinero se agrega un mes adicional
+    # Sin presupuesto para ahorrar no hay plan: nada ahorrado ni faltante
+    finite = months_needed < float('inf')
+    total_saved = monthly_save * months_needed if finite else 0
+    shortfall = max(0, item_price - total_saved) if finite else 0
+    plan_months = months_needed + 1 if shortfall > 0 else months_needed
+    plan_monthly_save = item_price / plan_months if shortfall > 0 else monthly_save
+
+    return {
+        'max_monthly_save': max_monthly_save,
+        'monthly_save': monthly_save,
+        'months_needed': months_needed,
+        'total_saved': total_saved,
+        'shortfall': shortfall,
+        'plan_months': plan_months,
+        'plan_monthly_save': plan_monthly_save
+    }
+
+def add_months(start, months):
+    """Misma fecha `months` meses de calendario después; el día se ajusta al último del mes si no existe."""
+    index = start.year * 12 + start.month - 1 + int(months)
+    year, month = divmod(index, 12)
+    return start.replace(year=year, month=month + 1, day=min(start.day, calendar.monthrange(year, month + 1)[1]))
+
+def target_date(months_needed, start=None):
+    return add_months(start or datetime.now(), months_needed)
+
+@profiled('purchases.savings_progress')
+def savings_progress(monthly_save, months_needed, item_price):
+    """DataFrame con el ahorro acumulado mes a mes hacia la meta."""
+    from .progress import savings_progress as _savings_progress
+
+    return _savings_progress(monthly_save, months_needed, item_price)
+
+def loan_quote(principal, months_needed, annual_rate=DEFAULT_ANNUAL_RATE, max_months=DEFAULT_MAX_LOAN_MONTHS):
+    """Cuota de un crédito de anualidad fija por el mismo plazo del ahorro (con tope de meses)."""
+    monthly_rate = annual_rate / 12
+    loan_months = min(months_needed, max_months)
+
+    if monthly_rate > 0:
+        monthly_payment = (principal * monthly_rate * (1 + monthly_rate)**loan_months) / ((1 + monthly_rate)**loan_months - 1)
+        total_interest = (monthly_payment * loan_months) - principal
+    else:
+        monthly_payment = principal / loan_months
+        total_interest = 0
+
+    return {
+        'monthly_payment': monthly_payment,
+        'loan_months': loan_months,
+        'total_paid': monthly_payment * loan_months,
+        'total_interest': total_interest,
+        'annual_rate': annual_rate
+    }
+
+def schedule_columns(principal, annual_rate, months):
+    """Columnas (arreglos de NumPy) de la tabla de amortización del crédito."""
+    from .amortization import amortization_schedule
+
+    schedule = amortization_schedule(principal, annual_rate, months)
+    return {
+        'Mes': schedule['month'],
+        'Cuota': schedule['payment'],
+        'Intereses': schedule['interest'],
+        'Abono a Capital': schedule['principal'],
+        'Saldo': schedule['balance']
+    }
+
+@profiled('purchases.loan_schedule')
+def loan_schedule(principal, annual_rate, months):
+    """Tabla de amortización del crédito como DataFrame columnar."""
+    import pandas as pd
+
+    return pd.DataFrame(schedule_columns(principal, annual_rate, months))
+
+def _read_only(columns):
+    # Los arreglos son propios del plan: se marcan como no modificables en lugar de copiarlos
+    for values in columns.values():
+        values.flags.writeable = False
+    return MappingProxyType(columns)
+
+@profiled('purchases.purchase_plan')
+@memoize(maxsize=PLAN_CACHE_SIZE)
+def purchase_plan(item_price, available_wants, save_percentage,
+                  annual_rate=DEFAULT_ANNUAL_RATE, max_loan_months=DEFAULT_MAX_LOAN_MONTHS):
+    """Plan de ahorro, progreso y crédito equivalente de una compra, memorizado por sus entradas.
+
+    Streamlit vuelve a ejecutar la vista en cada interacción; con las mismas
+    entradas el resultado sale de la caché (`purchase_plan.cache.stats()`).
+    El resultado es de solo lectura porque se comparte entre sesiones:
+    `progress` y `schedule` son columnas (arreglos de NumPy no modificables)
+    con las que cada sesión arma su propio DataFrame (`pd.DataFrame(dict(...))`).
+    """
+    from .progress import progress_columns
+
+    savings = plan_savings(item_price, available_wants, save_percentage)
+    months = savings['plan_months']
+    finite = months < float('inf')
+
+    loan = MappingProxyType(loan_quote(item_price, months, annual_rate, max_loan_months)) if finite else None
+
+    return MappingProxyType({
+        'savings': MappingProxyType(savings),
+        'progress': _read_only(progress_columns(savings['plan_monthly_save'], months, item_price)) if finite else None,
+        'loan': loan,
+        'schedule': _read_only(schedule_columns(item_price, annual_rate, loan['loan_months'])) if finite else None
+    })
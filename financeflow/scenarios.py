@@ -0,0 +1,108 @@
+"""Comparación de escenarios "¿y si...?": muchas variantes del presupuesto evaluadas a la vez con NumPy.
+
+Un escenario son las entradas del planificador (salario, cada categoría de
+gasto) más las de una compra (precio, porcentaje de ahorro, tasa y plazo
+máximo del crédito). Las variantes se arman como columnas, una fila por
+escenario, y se evalúan en una sola pasada vectorizada con las mismas reglas
+que FinancialPlanner, plan_savings y loan_quote.
+"""
+import numpy as np
+
+from .amortization import annuity_payment
+from .batch import BatchFinancialPlanner, plan_savings_batch
+from .planner import NEEDS_CATEGORIES, WANTS_CATEGORIES
+from .purchases import DEFAULT_ANNUAL_RATE, DEFAULT_MAX_LOAN_MONTHS
+
+PURCHASE_FIELDS = ('item_price', 'save_percentage', 'annual_rate', 'max_loan_months')
+SCENARIO_FIELDS = ('income',) + NEEDS_CATEGORIES + WANTS_CATEGORIES + PURCHASE_FIELDS
+
+def scenario_inputs(planner, item_price=0, save_percentage=0.5,
+                    annual_rate=DEFAULT_ANNUAL_RATE, max_loan_months=DEFAULT_MAX_LOAN_MONTHS):
+    """Entradas de un escenario tomadas del planificador actual y de la compra indicada."""
+    return {
+        'income': planner.income,
+        **planner.needs.to_dict(),
+        **planner.wants.to_dict(),
+        'item_price': item_price,
+        'save_percentage': save_percentage,
+        'annual_rate': annual_rate,
+        'max_loan_months': max_loan_months
+    }
+
+def _base_columns(base, rows):
+    unknown = set(base) - set(SCENARIO_FIELDS)
+    if unknown:
+        raise ValueError(f"Campos de escenario desconocidos: {', '.join(sorted(unknown))}")
+    return {field: np.full(rows, float(base.get(field, 0))) for field in SCENARIO_FIELDS}
+
+def scenario_grid(base, **axes):
+    """Todas las combinaciones de los valores de `axes` sobre las entradas `base`.
+
+    `scenario_grid(base, income=[3e6, 4e6], rent=[1e6, 1.2e6])` arma 4
+    escenarios. Retorna un dict de columnas con un valor por escenario.
+    """
+    unknown = set(axes) - set(SCENARIO_FIELDS)
+    if unknown:
+        raise ValueError(f"Campos de escenario desconocidos: {', '.join(sorted(unknown))}")
+    grids = np.meshgrid(*(np.asarray(values, dtype=np.float64) for values in axes.values()), indexing='ij')
+    columns = _base_columns(base, grids[0].size if grids else 1)
+    for field, grid in zip(axes, grids):
+        columns[field] = grid.ravel()
+    return columns
+
+def scenario_variants(base, variants):
+    """Un escenario por cada dict de `variants`, con los campos que cambia respecto a `base`."""
+    columns = _base_columns(base, len(variants))
+    for row, variant in enumerate(variants):
+        for field, value in variant.items():
+            if field not in columns:
+                raise ValueError(f"Campo de escenario desconocido: {field!r}")
+            columns[field][row] = value
+    return columns
+
+def evaluate_scenarios(columns):
+    """Presupuestos, riesgo, plan de ahorro y crédito equivalente de cada escenario.
+
+    Retorna un DataFrame con una fila por escenario: las entradas seguidas de
+    los resultados. Un escenario sin presupuesto de deseos disponible queda
+    con meses infinitos y sin crédito; uno sin compra (`item_price` <= 0), con
+    ahorro y meses en cero y sin crédito.
+    """
+    import pandas as pd
+
+    income = np.asarray(columns['income'], dtype=np.float64)
+    needs = np.column_stack([columns[category] for category in NEEDS_CATEGORIES])
+    wants = np.column_stack([columns[category] for category in WANTS_CATEGORIES])
+    planner = BatchFinancialPlanner(income, needs, wants)
+    budgets = planner.calculate_percentages()
+    needs_total = planner.calculate_needs_total()
+    wants_total = planner.calculate_wants_total()
+    risk = planner.get_risk_analysis()
+
+    item_price = np.asarray(columns['item_price'], dtype=np.float64)
+    # Sin compra no hay nada que ahorrar ni financiar (0 / 0 daría NaN en la cuota)
+    purchase = item_price > 0
+    plan = plan_savings_batch(np.where(purchase, item_price, 1.0), budgets['wants_budget'] - wants_total,
+                              columns['save_percentage'])
+    monthly_save = np.where(purchase, plan['plan_monthly_save'], 0.0)
+    months_needed = np.where(purchase, plan['plan_months'], 0.0)
+    finite = purchase & np.isfinite(months_needed)
+    loan_months = np.where(finite, np.minimum(months_needed, columns['max_loan_months']), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payment = np.where(finite, annuity_payment(item_price, columns['annual_rate'], loan_months), np.nan)
+
+    return pd.DataFrame({
+        **{field: np.asarray(columns[field], dtype=np.float64) for field in SCENARIO_FIELDS},
+        'needs_total': needs_total,
+        'wants_total': wants_total,
+        **budgets,
+        'remaining_income': income - needs_total - wants_total - budgets['savings_budget'],
+        'risk_level': risk['level'],
+        'risk_color': risk['color'],
+        'needs_excess': risk['needs_excess'],
+        'monthly_save': monthly_save,
+        'months_needed': months_needed,
+        'loan_months': loan_months,
+        'loan_monthly_payment': payment,
+        'loan_total_interest': payment * loan_months - item_price
+    })
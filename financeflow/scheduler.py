@@ -0,0 +1,115 @@
+"""Calendario de ahorro para varias compras que comparten el presupuesto mensual.
+
+Las metas se financian en orden de prioridad y, dentro de cada prioridad, de
+fecha límite más cercana (EDF). Cada mes el presupuesto completo va a la
+primera meta pendiente y lo que sobra pasa a la siguiente. Con un solo
+presupuesto compartido ese orden minimiza el retraso máximo dentro de cada
+prioridad, y el calendario queda en forma cerrada: la meta k se completa
+cuando el presupuesto acumulado alcanza el costo acumulado de las metas
+anteriores más el suyo. Ordenar cuesta O(n log n) y la matriz de aportes
+se arma por columnas, así que cientos de metas a varios años son inmediatas.
+"""
+from datetime import date, datetime
+
+import numpy as np
+
+from .store import PRIORITIES
+
+# Meses que se cubren cuando el presupuesto nunca alcanza para todas las metas
+MAX_HORIZON = 120
+
+def months_until(deadline, start):
+    """Meses completos de calendario entre `start` y `deadline` (mínimo 0)."""
+    if isinstance(deadline, str):
+        deadline = date.fromisoformat(deadline[:10])
+    months = (deadline.year - start.year) * 12 + deadline.month - start.month
+    # Una fecha límite a mitad de mes solo alcanza el aporte de ese mes si llega a su día
+    if deadline.day < start.day:
+        months -= 1
+    return max(0, months)
+
+def _cumulative_budget(budget, horizon):
+    budget = np.asarray(budget, dtype=np.float64)
+    if budget.ndim == 0:
+        return budget * np.arange(1, horizon + 1)
+    # Presupuesto por mes; después del último mes dado se repite el último valor
+    monthly = np.concatenate([budget[:horizon], np.full(max(0, horizon - len(budget)), budget[-1])])
+    return np.cumsum(monthly)
+
+def _horizon(budget, total):
+    # Meses hasta cubrir `total` con el presupuesto dado (el último valor se repite)
+    budget = np.atleast_1d(np.asarray(budget, dtype=np.float64))
+    cumulative = np.cumsum(budget)
+    if total <= 0:
+        return 0
+    if cumulative[-1] >= total:
+        return int(np.searchsorted(cumulative, total - 1e-6)) + 1
+    if budget[-1] <= 0:
+        return MAX_HORIZON
+    return min(MAX_HORIZON, len(budget) + int(np.ceil((total - cumulative[-1]) / budget[-1])))
+
+def schedule_goals(price, budget, priority=None, deadline=None, saved=None, horizon=None):
+    """Aportes mes a mes del presupuesto compartido y mes de cumplimiento de cada meta.
+
+    `price`, `priority` (0 = Alta), `deadline` (meses desde hoy) y `saved` son
+    arreglos con una posición por meta. `budget` es el aporte mensual total,
+    fijo o por mes. Sin `horizon` se cubre hasta completar todas las metas
+    (a lo sumo MAX_HORIZON meses). Retorna un dict con el orden de
+    financiación, `completion_month` (aportes mensuales necesarios; 0 si ya
+    está pagada, inf si no se completa en el horizonte), `late`, la matriz
+    `allocation` (metas x meses) y el total aportado por mes.
+    """
+    price = np.asarray(price, dtype=np.float64).reshape(-1)
+    goals = len(price)
+    priority = np.zeros(goals, dtype=np.int64) if priority is None else np.asarray(priority, dtype=np.int64)
+    deadline = np.full(goals, np.inf) if deadline is None else np.asarray(deadline, dtype=np.float64)
+    saved = np.zeros(goals) if saved is None else np.asarray(saved, dtype=np.float64)
+    remaining = np.maximum(price - saved, 0)
+
+    # Prioridad, luego fecha límite, luego el orden de entrada (lexsort usa la última clave como principal)
+    order = np.lexsort((np.arange(goals), deadline, priority))
+    cumulative_cost = np.cumsum(remaining[order])
+    total = cumulative_cost[-1] if goals else 0.0
+
+    if horizon is None:
+        horizon = _horizon(budget, total)
+    cumulative_budget = _cumulative_budget(budget, horizon)
+
+    # Mes en que el presupuesto acumulado cubre el costo acumulado (1-based); las metas ya pagadas cierran en 0
+    completion_sorted = np.searchsorted(cumulative_budget, cumulative_cost - 1e-6, side='left') + 1.0
+    completion_sorted[completion_sorted > horizon] = np.inf
+    completion_sorted[remaining[order] == 0] = 0
+    completion = np.empty(goals)
+    completion[order] = completion_sorted
+
+    # Financiado acumulado de cada meta al cierre de cada mes: recorte del presupuesto acumulado
+    previous_cost = (cumulative_cost - remaining[order])[:, None]
+    funded = np.clip(cumulative_budget[None, :] - previous_cost, 0, remaining[order][:, None])
+    allocation_sorted = np.diff(funded, axis=1, prepend=0.0)
+    allocation = np.empty_like(allocation_sorted)
+    allocation[order] = allocation_sorted
+
+    return {
+        'order': order,
+        'completion_month': completion,
+        'deadline_month': deadline,
+        'late': completion > deadline,
+        'allocation': allocation,
+        'monthly_total': allocation.sum(axis=0),
+        'horizon': horizon
+    }
+
+def schedule_plans(plans, budget, start=None, horizon=None):
+    """Calendario de las compras guardadas (columnas de PlanStore.load_plans).
+
+    La fecha objetivo de cada compra se usa como fecha límite. Retorna el
+    resultado de schedule_goals más `start`.
+    """
+    start = start or datetime.now()
+    deadline = [months_until(target, start) for target in plans['target_date']]
+    schedule = schedule_goals(plans['price'], budget, plans['priority'], deadline, plans['saved'], horizon)
+    schedule['start'] = start
+    return schedule
+
+def priority_labels(priority):
+    return np.asarray(PRIORITIES, dtype=object)[np.asarray(priority, dtype=np.int64)]
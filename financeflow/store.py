@@ -0,0 +1,248 @@
+"""Persistencia local en SQLite del planificador y las compras planificadas."""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from .planner import FinancialPlanner, FamilyInfo, NEEDS_CATEGORIES, WANTS_CATEGORIES
+from .profiling import profiled
+
+# Los datos viven junto a la app (no en el directorio desde el que se lanza) salvo que se configure otro
+DATA_DIR = os.environ.get('FINANCEFLOW_DATA_DIR') or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.path.join(DATA_DIR, os.environ.get('FINANCEFLOW_DB', 'financeflow.db'))
+
+# Prioridades de compra en el orden en que se guardan (0 = Alta)
+PRIORITIES = ('Alta', 'Media', 'Baja')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS planners (
+    user_id     TEXT PRIMARY KEY,
+    income      NUMERIC NOT NULL,  -- NUMERIC conserva los enteros que esperan los widgets
+    needs       TEXT NOT NULL,
+    wants       TEXT NOT NULL,
+    family_info TEXT NOT NULL,
+    updated_at  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS purchase_plans (
+    id           INTEGER PRIMARY KEY,
+    user_id      TEXT NOT NULL,
+    product      TEXT NOT NULL,
+    price        REAL NOT NULL,
+    monthly_save REAL NOT NULL,
+    saved        REAL NOT NULL DEFAULT 0,
+    priority     INTEGER NOT NULL,
+    target_date  TEXT NOT NULL,
+    created_at   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_plans_user_priority_target
+    ON purchase_plans (user_id, priority, target_date);
+CREATE INDEX IF NOT EXISTS idx_plans_target_date
+    ON purchase_plans (target_date);
+"""
+
+# Sentencias fijas: sqlite3 las prepara una vez y las reutiliza en la conexión compartida
+_UPSERT_PLANNER = """
+INSERT INTO planners (user_id, income, needs, wants, family_info, updated_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (user_id) DO UPDATE SET
+    income = excluded.income,
+    needs = excluded.needs,
+    wants = excluded.wants,
+    family_info = excluded.family_info,
+    updated_at = excluded.updated_at
+"""
+_SELECT_PLANNER = "SELECT income, needs, wants, family_info FROM planners WHERE user_id = ?"
+_INSERT_PLAN = """
+INSERT INTO purchase_plans (user_id, product, price, monthly_save, saved, priority, target_date, created_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SELECT_PLANS = """
+SELECT id, product, price, monthly_save, saved, priority, target_date
+FROM purchase_plans
+WHERE user_id = ?
+ORDER BY priority, target_date
+"""
+_DELETE_PLAN = "DELETE FROM purchase_plans WHERE user_id = ? AND id = ?"
+# El ahorro acumulado queda entre 0 y el precio de la compra
+_ADD_SAVED = """
+UPDATE purchase_plans SET saved = MIN(price, MAX(0, saved + ?))
+WHERE user_id = ? AND id = ?
+"""
+_SET_SAVED = "UPDATE purchase_plans SET saved = MIN(price, MAX(0, ?)) WHERE user_id = ? AND id = ?"
+
+PLAN_COLUMNS = ('id', 'product', 'price', 'monthly_save', 'saved', 'priority', 'target_date')
+
+# Clave mínima y costo de derivarla: adivinar la clave de otro usuario debe ser caro
+MIN_SECRET_LENGTH = 8
+ACCOUNT_KEY_ITERATIONS = 200_000
+
+def account_key(user_name, secret):
+    """Identificador con que se guardan los datos de un usuario, derivado de su nombre y su clave.
+
+    Quien escribe el nombre de otra persona sin su clave llega a una cuenta
+    vacía: no puede leer ni sobrescribir sus datos. La base no guarda ni el
+    nombre ni la clave, solo el resultado de PBKDF2.
+    """
+    if len(secret) < MIN_SECRET_LENGTH:
+        raise ValueError(f"La clave debe tener al menos {MIN_SECRET_LENGTH} caracteres")
+    digest = hashlib.pbkdf2_hmac('sha256', secret.encode('utf-8'), f"financeflow:{user_name}".encode('utf-8'),
+                                 ACCOUNT_KEY_ITERATIONS)
+    return f"key:{digest.hex()}"
+
+def _known_keys(values, keys):
+    return {key: value for key, value in values.items() if key in keys}
+
+class PlanStore:
+    """Almacén SQLite en modo WAL con una sola conexión compartida por todos los hilos.
+
+    Streamlit ejecuta cada recarga en un hilo nuevo; con una conexión por hilo
+    cada recarga abría otra y perdía las sentencias ya preparadas. La conexión
+    se abre una vez, sus sentencias preparadas se reutilizan y un candado
+    serializa el acceso (las consultas de una sesión toman milisegundos).
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, cached_statements=64, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connection(self):
+        # Acceso exclusivo a la conexión; con `with connection` cada escritura es una transacción
+        with self._lock:
+            if self._db is None:
+                raise sqlite3.ProgrammingError("El almacén está cerrado")
+            yield self._db
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    @profiled('store.save_planner')
+    def save_planner(self, user_id, planner):
+        with self._connection() as connection, connection:
+            connection.execute(_UPSERT_PLANNER, (
+                user_id,
+                planner.income,
+                json.dumps(planner.needs.to_dict()),
+                json.dumps(planner.wants.to_dict()),
+                json.dumps(planner.family_info.to_dict()),
+                datetime.now().isoformat(timespec='seconds')
+            ))
+
+    @profiled('store.load_planner')
+    def load_planner(self, user_id, planner=None):
+        with self._connection() as connection:
+            row = connection.execute(_SELECT_PLANNER, (user_id,)).fetchone()
+        if row is None:
+            return None
+        planner = planner or FinancialPlanner()
+        planner.income = row[0]
+        # Claves fuera del esquema actual (versiones anteriores) se descartan
+        planner.needs = _known_keys(json.loads(row[1]), NEEDS_CATEGORIES)
+        planner.wants = _known_keys(json.loads(row[2]), WANTS_CATEGORIES)
+        planner.family_info = _known_keys(json.loads(row[3]), FamilyInfo.__slots__)
+        return planner
+
+    @profiled('store.add_plan')
+    def add_plan(self, user_id, product, price, monthly_save, priority, target_date, saved=0):
+        created_at = datetime.now().isoformat(timespec='seconds')
+        with self._connection() as connection, connection:
+            cursor = connection.execute(_INSERT_PLAN, self._plan_row(
+                (user_id, product, price, monthly_save, saved, priority, target_date), created_at))
+            return cursor.lastrowid
+
+    def add_plans(self, plans):
+        """Inserta muchas compras en una sola transacción.
+
+        `plans` es un iterable de tuplas
+        (user_id, product, price, monthly_save, saved, priority, target_date).
+        """
+        created_at = datetime.now().isoformat(timespec='seconds')
+        with self._connection() as connection, connection:
+            connection.executemany(_INSERT_PLAN, (self._plan_row(plan, created_at) for plan in plans))
+
+    @staticmethod
+    def _plan_row(plan, created_at):
+        user_id, product, price, monthly_save, saved, priority, target_date = plan
+        if isinstance(priority, str):
+            priority = PRIORITIES.index(priority)
+        if hasattr(target_date, 'strftime'):
+            target_date = target_date.strftime('%Y-%m-%d')
+        return (user_id, product, float(price), float(monthly_save), float(saved), int(priority),
+                target_date, created_at)
+
+    def delete_plan(self, user_id, plan_id):
+        with self._connection() as connection, connection:
+            connection.execute(_DELETE_PLAN, (user_id, plan_id))
+
+    @profiled('store.add_contribution')
+    def add_contribution(self, user_id, plan_id, amount):
+        """Suma un aporte (o un retiro, si es negativo) al ahorro acumulado de una compra.
+
+        Retorna False si la compra no existe para ese usuario.
+        """
+        with self._connection() as connection, connection:
+            return connection.execute(_ADD_SAVED, (float(amount), user_id, plan_id)).rowcount > 0
+
+    def update_saved(self, user_id, plan_id, saved):
+        """Fija el ahorro acumulado de una compra; retorna False si no existe para ese usuario."""
+        with self._connection() as connection, connection:
+            return connection.execute(_SET_SAVED, (float(saved), user_id, plan_id)).rowcount > 0
+
+    def load_plans(self, user_id):
+        """Compras de un usuario como columnas (dict de listas), ordenadas por prioridad y fecha."""
+        with self._connection() as connection:
+            rows = connection.execute(_SELECT_PLANS, (user_id,)).fetchall()
+        columns = tuple(zip(*rows)) if rows else ((),) * len(PLAN_COLUMNS)
+        return dict(zip(PLAN_COLUMNS, map(list, columns)))
+
+    @profiled('store.load_plans_frame')
+    def load_plans_frame(self, user_id):
+        """Compras de un usuario como DataFrame con progreso y meses restantes calculados por columnas."""
+        import numpy as np
+        import pandas as pd
+
+        plans = pd.DataFrame(self.load_plans(user_id))
+        price = plans['price'].to_numpy(dtype=np.float64)
+        saved = plans['saved'].to_numpy(dtype=np.float64)
+        monthly_save = plans['monthly_save'].to_numpy(dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            progress = np.where(price > 0, np.minimum(saved / price, 1.0), 0.0)
+            remaining = np.where(monthly_save > 0, np.ceil(np.maximum(price - saved, 0) / monthly_save), 0)
+        return pd.DataFrame({
+            'id': plans['id'],
+            'Producto': plans['product'],
+            'Prioridad': np.asarray(PRIORITIES, dtype=object)[plans['priority'].to_numpy(dtype=np.int64)],
+            'Precio': price,
+            'Ahorro Mensual': monthly_save,
+            'Meses Restantes': remaining.astype(np.int64),
+            'Fecha Objetivo': plans['target_date'],
+            'Progreso': progress
+        })
+
+    def count_plans(self, user_id=None):
+        with self._connection() as connection:
+            if user_id is None:
+                return connection.execute("SELECT COUNT(*) FROM purchase_plans").fetchone()[0]
+            return connection.execute(
+                "SELECT COUNT(*) FROM purchase_plans WHERE user_id = ?", (user_id,)).fetchone()[0]
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+def default_store():
+    """Almacén compartido por todo el proceso en DEFAULT_DB_PATH."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = PlanStore()
+        return _default_store
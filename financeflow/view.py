@@ -0,0 +1,49 @@
+"""Resultados derivados del planificador para una recarga de la interfaz, calculados al primer acceso."""
+from functools import cached_property
+
+class PlannerView:
+    """Vista perezosa de un FinancialPlanner.
+
+    Cada resultado se calcula la primera vez que se pide y se reutiliza en el
+    resto de la recarga, así las secciones que no se muestran no pagan por él.
+    Los montos cambian entre recargas: cree una vista nueva en cada una, y
+    después de los widgets que modifican los gastos que va a leer.
+    """
+
+    def __init__(self, planner):
+        self.planner = planner
+
+    @cached_property
+    def budgets(self):
+        return self.planner.calculate_percentages()
+
+    @cached_property
+    def needs_total(self):
+        return self.planner.calculate_needs_total()
+
+    @cached_property
+    def wants_total(self):
+        return self.planner.calculate_wants_total()
+
+    @cached_property
+    def available_wants(self):
+        return self.budgets['wants_budget'] - self.wants_total
+
+    @cached_property
+    def remaining_income(self):
+        return self.planner.calculate_remaining_income()
+
+    @cached_property
+    def risk_analysis(self):
+        return self.planner.get_risk_analysis()
+
+    @cached_property
+    def distribution_figure(self):
+        from .charts import distribution_figure, new_distribution_figure
+
+        # Cada sesión arma su figura una vez; si cambian ingreso o gastos solo se parchan sus trazas
+        figure = self.planner.derived('distribution_base', (), new_distribution_figure)
+        return self.planner.derived(
+            'distribution_figure', ('income', 'needs', 'wants'),
+            lambda: distribution_figure(self.planner.income, self.needs_total, self.wants_total, self.budgets,
+                                        figure=figure))
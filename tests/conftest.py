@@ -0,0 +1,13 @@
+"""Datos compartidos por las pruebas de escritura por bloques."""
+import numpy as np
+import pandas as pd
+import pytest
+
+@pytest.fixture
+def drifting_chunks():
+    # Id entero que llega como float por un vacío, texto que llega vacío y columna nula que luego trae texto
+    return [
+        pd.DataFrame({'household_id': [1, 2], 'city': ['Cali', 'Bogotá'], 'note': [None, None], 'income': [1.0, 2.0]}),
+        pd.DataFrame({'household_id': [3, np.nan], 'city': [np.nan, np.nan], 'note': ['a', None], 'income': [3.0, 4.0]}),
+        pd.DataFrame({'household_id': [5, 6], 'city': [None, 'Pasto'], 'note': ['b', 'c'], 'income': [5.0, 6.0]}),
+    ]
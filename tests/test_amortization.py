@@ -0,0 +1,75 @@
+"""Cronogramas en forma cerrada frente a la amortización mes a mes."""
+import math
+import warnings
+
+import numpy as np
+import pytest
+
+from financeflow.amortization import amortization_schedule, annuity_payment, early_payoff
+
+def manual_schedule(principal, rates, months, extra=0.0):
+    # Referencia directa: cuota recalculada en cada cambio de tasa, abono a capital y fin al cancelar
+    rates = np.broadcast_to(np.asarray(rates, dtype=np.float64), (months,))
+    extra = np.broadcast_to(np.asarray(extra, dtype=np.float64), (months,))
+    rows = []
+    remaining = principal
+    for month in range(months):
+        if remaining <= 1e-6:
+            break
+        if month == 0 or rates[month] != rates[month - 1]:
+            rate = rates[month] / 12
+            term = months - month
+            installment = remaining * rate / (1 - (1 + rate) ** -term) if rate > 0 else remaining / term
+        interest = remaining * rates[month] / 12
+        payment = min(installment + extra[month], remaining + interest)
+        remaining = max(remaining + interest - payment, 0.0)
+        rows.append((payment, interest, remaining))
+    return np.array(rows).reshape(-1, 3)
+
+def assert_matches(schedule, expected, principal):
+    assert len(schedule['payment']) == len(expected)
+    np.testing.assert_array_equal(schedule['month'], np.arange(1, len(expected) + 1))
+    for column, name in enumerate(('payment', 'interest', 'balance')):
+        np.testing.assert_allclose(schedule[name], expected[:, column], rtol=1e-9, atol=principal * 1e-11)
+    np.testing.assert_allclose(schedule['principal'], schedule['payment'] - schedule['interest'])
+
+@pytest.mark.parametrize('rate, months, extra', [(0.24, 36, 0.0), (0.0, 12, 0.0), (0.18, 60, 150_000.0),
+                                                 (0.3, 1, 0.0), (0.12, 24, 5_000_000.0)])
+def test_fixed_rate_closed_form_matches_loop(rate, months, extra):
+    principal = 10_000_000.0
+    schedule = amortization_schedule(principal, rate, months, extra)
+    assert_matches(schedule, manual_schedule(principal, rate, months, extra), principal)
+    assert math.isclose(schedule['principal'].sum(), principal)
+
+def test_variable_rate_matches_loop():
+    principal = 50_000_000.0
+    rng = np.random.default_rng(7)
+    monthly = rng.uniform(0.0, 0.35, 120)
+    steps = np.repeat([0.12, 0.0, 0.2, 0.2, 0.15], 24)
+    extras = rng.uniform(0, 400_000, 120)
+    for rates, extra in ((monthly, 0.0), (steps, 0.0), (steps, 300_000.0), (monthly, extras)):
+        assert_matches(amortization_schedule(principal, rates, 120, extra),
+                       manual_schedule(principal, rates, 120, extra), principal)
+
+def test_early_payoff_totals():
+    principal, rate, months, extra = 20_000_000.0, 0.24, 48, 200_000.0
+    payoff = early_payoff(principal, rate, months, extra)
+    base = manual_schedule(principal, rate, months)
+    early = manual_schedule(principal, rate, months, extra)
+
+    assert payoff['months'] == len(early) < months
+    assert payoff['months_saved'] == months - len(early)
+    assert math.isclose(payoff['total_interest'], early[:, 1].sum())
+    assert math.isclose(payoff['interest_saved'], base[:, 1].sum() - early[:, 1].sum())
+    assert math.isclose(payoff['schedule']['principal'].sum(), principal)
+
+@pytest.mark.parametrize('months', [0, -3])
+def test_schedule_rejects_empty_term(months):
+    with pytest.raises(ValueError, match='al menos un mes'):
+        amortization_schedule(1_000_000.0, 0.2, months)
+
+def test_annuity_payment_without_warnings():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        payment = annuity_payment(1_000_000.0, [0.0, 0.0, 0.24], [0, 10, 0])
+    assert np.isinf(payment[0]) and payment[1] == 100_000.0
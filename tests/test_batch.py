@@ -0,0 +1,84 @@
+"""Paridad entre BatchFinancialPlanner / plan_savings_batch y sus versiones escalares."""
+import numpy as np
+import pytest
+
+from financeflow import FinancialPlanner, NEEDS_CATEGORIES, WANTS_CATEGORIES, plan_savings
+from financeflow.batch import BatchFinancialPlanner, plan_savings_batch
+
+def random_cohort(n, seed):
+    # Montos en pesos enteros, con parte de los hogares sobre el presupuesto de necesidades
+    rng = np.random.default_rng(seed)
+    income = rng.uniform(800_000, 15_000_000, n).round()
+    needs = (income[:, None] * rng.dirichlet(np.ones(len(NEEDS_CATEGORIES)), n)
+             * rng.uniform(0.2, 0.9, (n, 1))).round()
+    wants = (income[:, None] * rng.dirichlet(np.ones(len(WANTS_CATEGORIES)), n)
+             * rng.uniform(0.0, 0.5, (n, 1))).round()
+    return income, needs, wants
+
+def edge_cohort():
+    # Sin ingresos, necesidades justo en el 50%, y excesos en y alrededor de los límites del 10% y el 20%
+    income = np.array([0, 0, 4_000_000, 4_000_000, 4_000_000, 4_000_000, 4_000_000, 4_000_000, 4_000_000])
+    needs_total = np.array([0, 1_000, 2_000_000, 2_000_001, 2_400_000, 2_400_001, 2_800_000, 2_800_001, 100])
+    needs = np.zeros((len(income), len(NEEDS_CATEGORIES)))
+    needs[:, 0] = needs_total
+    wants = np.zeros((len(income), len(WANTS_CATEGORIES)))
+    wants[:, 1] = 300_000
+    return income.astype(np.float64), needs, wants
+
+def threshold_cohort(n, seed):
+    # Montos con decimales cuyo total de necesidades cae justo en el 50%, 60% o 70% del ingreso
+    rng = np.random.default_rng(seed)
+    income = rng.uniform(800_000, 15_000_000, n)
+    share = rng.choice([0.5, 0.6, 0.7], n) + rng.integers(-3, 4, n) * np.finfo(np.float64).eps
+    needs = (income * share)[:, None] * rng.dirichlet(np.ones(len(NEEDS_CATEGORIES)), n)
+    wants = income[:, None] * rng.dirichlet(np.ones(len(WANTS_CATEGORIES)), n) * rng.uniform(0.0, 0.5, (n, 1))
+    return income, needs, wants
+
+def scalar_results(income, needs, wants):
+    rows = []
+    for i in range(len(income)):
+        planner = FinancialPlanner()
+        planner.income = income[i]
+        planner.needs = dict(zip(NEEDS_CATEGORIES, needs[i]))
+        planner.wants = dict(zip(WANTS_CATEGORIES, wants[i]))
+        rows.append((planner.calculate_percentages(), planner.calculate_needs_total(),
+                     planner.calculate_wants_total(), planner.get_risk_analysis()))
+    return rows
+
+@pytest.mark.parametrize('cohort', [random_cohort(20_000, 7), random_cohort(5_000, 11), edge_cohort(),
+                                    threshold_cohort(30_000, 13)],
+                         ids=['random-20k', 'random-5k', 'edges', 'float-thresholds'])
+def test_planner_matches_scalar(cohort):
+    income, needs, wants = cohort
+    batch = BatchFinancialPlanner(income, needs, wants)
+    budgets = batch.calculate_percentages()
+    needs_total = batch.calculate_needs_total()
+    wants_total = batch.calculate_wants_total()
+    risk = batch.get_risk_analysis()
+
+    scalar = scalar_results(income, needs, wants)
+    for name in ('needs_budget', 'wants_budget', 'savings_budget'):
+        np.testing.assert_array_equal(budgets[name], [row[0][name] for row in scalar])
+    np.testing.assert_array_equal(needs_total, [row[1] for row in scalar])
+    np.testing.assert_array_equal(wants_total, [row[2] for row in scalar])
+    np.testing.assert_array_equal(risk['level'], [row[3]['level'] for row in scalar])
+    np.testing.assert_array_equal(risk['color'], [row[3]['color'] for row in scalar])
+    np.testing.assert_array_equal(risk['needs_excess'], [row[3]['needs_excess'] for row in scalar])
+
+def test_edge_levels():
+    levels = BatchFinancialPlanner(*edge_cohort()).get_risk_analysis()['level']
+    assert list(levels) == ['Bajo', 'Alto', 'Bajo', 'Bajo', 'Bajo', 'Medio', 'Medio', 'Alto', 'Bajo']
+
+def test_plan_savings_matches_scalar():
+    rng = np.random.default_rng(3)
+    n = 20_000
+    price = rng.uniform(100_000, 30_000_000, n).round()
+    available = rng.uniform(0, 3_000_000, n).round()
+    available[:200] = 0
+    percentage = rng.choice([0.1, 0.3, 0.5, 0.7, 1.0], n)
+    batch = plan_savings_batch(price, available, percentage)
+
+    for i in range(n):
+        plan = plan_savings(price[i], available[i], percentage[i])
+        for name, value in plan.items():
+            assert batch[name][i] == value, (name, i, batch[name][i], value)
@@ -0,0 +1,46 @@
+"""Plan de compras por lotes frente a purchase_plan, y el plan memorizado de solo lectura."""
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from financeflow.cli import purchases_chunk
+from financeflow.purchases import purchase_plan
+
+def test_purchases_chunk_matches_purchase_plan():
+    chunk = pd.DataFrame({
+        'item_price': [2_400_000.0, 5_000_000.0, 1_000_000.0, 800_000.0],
+        'available_wants': [400_000.0, 0.0, 0.0, 1_000_000.0],
+        'save_percentage': [0.5, 0.5, 0.7, 1.0],
+    })
+    results = purchases_chunk(chunk)
+
+    for i, row in chunk.iterrows():
+        plan = purchase_plan(row['item_price'], row['available_wants'], row['save_percentage'])
+        assert results['months_needed'][i] == plan['savings']['plan_months']
+        if plan['loan'] is None:
+            # Sin capacidad de ahorro no se cotiza el crédito
+            assert np.isnan(results.loc[i, ['loan_months', 'loan_monthly_payment', 'loan_total_interest']]
+                            .to_numpy(dtype=np.float64)).all()
+        else:
+            assert results['loan_months'][i] == plan['loan']['loan_months']
+            assert math.isclose(results['loan_monthly_payment'][i], plan['loan']['monthly_payment'])
+            assert math.isclose(results['loan_total_interest'][i], plan['loan']['total_interest'])
+
+def test_memoized_plan_is_read_only():
+    plan = purchase_plan(3_000_000.0, 500_000.0, 0.5)
+    for name in ('progress', 'schedule'):
+        columns = plan[name]
+        with pytest.raises(TypeError):
+            columns['Mes'] = None
+        for values in columns.values():
+            assert not values.flags.writeable
+            with pytest.raises(ValueError):
+                values[0] = -1
+
+    # Cada sesión arma su propio DataFrame; modificarlo no toca el plan compartido
+    progress = pd.DataFrame(dict(plan['progress']))
+    progress.loc[0, 'Ahorro Acumulado'] = -1
+    assert purchase_plan(3_000_000.0, 500_000.0, 0.5)['progress']['Ahorro Acumulado'][0] > 0
+    assert list(pd.DataFrame(dict(plan['schedule'])).columns) == ['Mes', 'Cuota', 'Intereses', 'Abono a Capital', 'Saldo']
@@ -0,0 +1,52 @@
+"""Fondo de emergencia con semillas fijas: agotamiento, pérdida de empleo y tiempo a la meta."""
+import numpy as np
+import pytest
+
+from financeflow.emergency import months_to_target, simulate_emergency_fund
+
+NO_EVENTS = {'job_loss_rate': 0.0, 'medical_rate': 0.0, 'income_shock_rate': 0.0}
+
+def test_without_events_reaches_target_on_schedule():
+    result = simulate_emergency_fund(300_000.0, 1_000_000.0, months=36, paths=500, **NO_EVENTS)
+    assert result['expected_months'] == months_to_target(6_000_000.0, 300_000.0) == 20
+
+    assert result['depletion_probability'] == 0 and result['job_loss_probability'] == 0
+    assert result['adequacy_probability'] == 1
+    assert result['adequacy_percentiles'] == {50: 20, 90: 20}
+    # El aporte se detiene al completar la meta
+    np.testing.assert_allclose(result['balance_percentiles'][50], np.minimum(np.arange(37) * 300_000.0, 6e6))
+
+def test_depletion_counts_match_job_losses_without_a_fund():
+    # Sin fondo ni aporte, cada pérdida de empleo agota el fondo en su primer mes y nada más lo agota
+    paths = 20_000
+    result = simulate_emergency_fund(0.0, 1_000_000.0, months=60, paths=paths, seed=7, job_loss_rate=0.08,
+                                     medical_rate=0.0, income_shock_rate=0.0)
+    depleted = round(result['depletion_probability'] * paths)
+    lost_job = round(result['job_loss_probability'] * paths)
+
+    assert depleted == lost_job > 0
+    assert result['depletion_given_job_loss'] == 1
+    # Probabilidad de una primera pérdida en 5 años: 1 − 0.92⁵
+    assert result['job_loss_probability'] == pytest.approx(1 - 0.92 ** 5, abs=0.015)
+    assert result['mean_shortfall'] >= 1_000_000.0
+
+def test_large_fund_is_never_depleted():
+    result = simulate_emergency_fund(100_000.0, 1_000_000.0, 400_000.0, income=4_000_000.0,
+                                     initial_balance=60_000_000.0, months=60, paths=2_000, seed=3)
+    assert result['job_loss_probability'] > 0
+    assert result['depletion_probability'] == 0 and result['mean_shortfall'] == 0
+    assert result['adequacy_percentiles'][90] == 0
+
+def test_same_seed_same_counts():
+    simulate_emergency_fund.cache.clear()
+    arguments = (200_000.0, 1_500_000.0, 300_000.0, 5_000_000.0, 1_000_000.0)
+    first = simulate_emergency_fund(*arguments, paths=3_000, seed=11)
+    simulate_emergency_fund.cache.clear()
+    again = simulate_emergency_fund(*arguments, paths=3_000, seed=11)
+    other = simulate_emergency_fund(*arguments, paths=3_000, seed=12)
+
+    assert first is not again
+    for key in ('depletion_probability', 'job_loss_probability', 'adequacy_probability', 'mean_shortfall'):
+        assert first[key] == again[key]
+    np.testing.assert_array_equal(first['balance_percentiles'][50], again['balance_percentiles'][50])
+    assert other['depletion_probability'] != first['depletion_probability']
@@ -0,0 +1,129 @@
+"""Exportación columnar: escritura por bloques, columnas de cada módulo y apertura sin copiar."""
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from financeflow.advisor import CATALOG
+from financeflow.batch import BatchFinancialPlanner
+from financeflow.cli import main
+from financeflow.export import (ColumnarWriter, advisor_columns, categories_of, export_columns, forecast_columns,
+                                open_npy, open_results, planner_columns, projection_columns, read_manifest)
+from financeflow.forecast import FORECAST_FIELDS, forecast_budget
+from financeflow.planner import FinancialPlanner, RISK_LEVELS
+
+@pytest.mark.parametrize('name', ['out.arrow', 'out.parquet'])
+def test_columnar_writer_conforms_drifting_chunks(tmp_path, name, drifting_chunks):
+    path = tmp_path / name
+    with ColumnarWriter(path) as writer:
+        for chunk in drifting_chunks:
+            writer.write(chunk)
+
+    table = open_results(path)
+    assert writer.rows == table.num_rows == 6
+    assert table.column('household_id').to_pylist() == [1, 2, 3, None, 5, 6]
+    assert table.column('city').to_pylist() == ['Cali', 'Bogotá', None, None, None, 'Pasto']
+    assert table.column('note').to_pylist() == [None, None, 'a', None, 'b', 'c']
+
+@pytest.mark.parametrize('name, tag', [('out', 'financeflow-npy'), ('out.arrow', 'financeflow-arrow'),
+                                       ('out.parquet', 'financeflow-parquet')])
+def test_format_tags(tmp_path, name, tag):
+    path = tmp_path / name
+    with ColumnarWriter(path) as writer:
+        writer.write({'risk_level': ['Bajo', 'Alto'], 'income': [1.0, 2.0]})
+
+    if tag == 'financeflow-npy':
+        manifest = read_manifest(path)
+    elif tag == 'financeflow-parquet':
+        manifest = json.loads(pq.read_schema(path).metadata[b'financeflow'])
+    else:
+        manifest = json.loads(open_results(path).schema.metadata[b'financeflow'])
+    assert manifest['format'] == tag
+    assert categories_of(path) == {'risk_level': ['Bajo', 'Medio', 'Alto']}
+
+def test_npy_writer_names_column_with_gaps(tmp_path):
+    with ColumnarWriter(tmp_path / 'out') as writer:
+        writer.write({'household_id': np.array([1, 2]), 'income': [1.0, 2.0]})
+        writer.write({'household_id': np.array([3.0, 4.0]), 'income': [3.0, 4.0]})
+        with pytest.raises(ValueError, match="'household_id'"):
+            writer.write({'household_id': np.array([5.0, np.nan]), 'income': [5.0, 6.0]})
+
+def _planner(income, rent, entertainment):
+    planner = FinancialPlanner()
+    planner.income = income
+    planner.needs = {'rent': rent}
+    planner.wants = {'entertainment': entertainment}
+    return planner
+
+def test_planner_columns_match_scalar_planner():
+    frame = pd.DataFrame({'income': [3_000_000.0, 2_000_000.0, 0.0],
+                          'rent': [1_000_000.0, 1_300_000.0, 500_000.0],
+                          'entertainment': [200_000.0, 0.0, 0.0]})
+    columns = planner_columns(BatchFinancialPlanner.from_frame(frame))
+
+    for i, row in frame.iterrows():
+        planner = _planner(row['income'], row['rent'], row['entertainment'])
+        for name, value in planner.calculate_percentages().items():
+            assert columns[name][i] == value
+        assert columns['needs_total'][i] == planner.calculate_needs_total()
+        assert columns['wants_total'][i] == planner.calculate_wants_total()
+        assert RISK_LEVELS[columns['risk_level'][i]] == planner.get_risk_analysis()['level']
+
+def test_advisor_columns_match_catalog():
+    amounts = np.array([0.0, 50_000.0, 400_000.0, 2_000_000.0])
+    columns = advisor_columns(amounts)
+
+    assert columns['option_ids'].shape == (len(amounts), max(len(tier) for tier in CATALOG.tiers))
+    for amount, tier, ids in zip(amounts, columns['tier'], columns['option_ids']):
+        assert tier == CATALOG.tier_index(amount * 12)
+        expected = [option.id for option in CATALOG.lookup(amount * 12)]
+        assert list(ids[:len(expected)]) == expected
+        assert (ids[len(expected):] == -1).all()
+
+def test_projection_columns_one_row_per_point():
+    projection = {'year': np.arange(3), 'mean': np.array([0.0, 1.0, 2.0]), 'contributed': np.zeros(3),
+                  'percentiles': {5: np.zeros(3), 95: np.ones(3)}, 'paths': 10}
+    assert list(projection_columns(projection)) == ['year', 'mean', 'contributed', 'p5', 'p95']
+
+    emergency = {'month': np.arange(4), 'balance_percentiles': {50: np.arange(4.0)}, 'target': 1.0}
+    columns = projection_columns(emergency)
+    assert list(columns) == ['month', 'p50']
+    np.testing.assert_array_equal(columns['p50'], np.arange(4.0))
+
+def test_forecast_columns_long_format():
+    forecast = forecast_budget(_planner(3_000_000.0, 1_000_000.0, 200_000.0), years=2,
+                               salary_growth=np.array([0.03, 0.06]))
+    columns = forecast_columns(forecast)
+    scenarios, months = forecast['income'].shape
+
+    assert all(len(values) == scenarios * months for values in columns.values())
+    np.testing.assert_array_equal(columns['scenario'], np.repeat([0, 1], months))
+    np.testing.assert_array_equal(columns['scenario_salary_growth'], np.repeat([0.03, 0.06], months))
+    for field in FORECAST_FIELDS:
+        np.testing.assert_array_equal(columns[field].reshape(scenarios, months), forecast[field])
+    np.testing.assert_array_equal(columns['risk_level'], forecast['risk_code'].ravel())
+
+def test_npy_round_trip_is_read_only_memmap(tmp_path):
+    columns = {'income': np.linspace(1.0, 2.0, 1_000), 'risk_level': np.array(['Bajo', 'Alto'] * 500),
+               'option_ids': np.arange(3_000, dtype=np.int16).reshape(1_000, 3)}
+    assert export_columns(tmp_path / 'out', columns) == 1_000
+
+    opened = open_npy(tmp_path / 'out')
+    for values in opened.values():
+        assert isinstance(values, np.memmap)
+        assert not values.flags.writeable
+    np.testing.assert_array_equal(opened['income'], columns['income'])
+    np.testing.assert_array_equal(opened['option_ids'], columns['option_ids'])
+    levels = np.array(categories_of(tmp_path / 'out')['risk_level'])
+    np.testing.assert_array_equal(levels[opened['risk_level']], columns['risk_level'])
+
+def test_cli_parquet_output_carries_categories(tmp_path):
+    source = tmp_path / 'in.csv'
+    pd.DataFrame({'household_id': [1, 2], 'income': [3_000_000.0, 1_000_000.0],
+                  'rent': [1_000_000.0, 900_000.0]}).to_csv(source, index=False)
+    main(['plan', str(source), str(tmp_path / 'out.parquet')])
+
+    assert categories_of(tmp_path / 'out.parquet') == {'risk_level': list(RISK_LEVELS)}
+    assert pq.read_table(tmp_path / 'out.parquet').column('risk_level').to_pylist() == ['Bajo', 'Alto']
@@ -0,0 +1,58 @@
+"""Reajustes del presupuesto proyectado: arriendo por aniversario y salario mínimo cada enero."""
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from financeflow.forecast import (CATEGORY_INFLATION, MINIMUM_WAGE, forecast_budget, minimum_wage,
+                                  price_factors)
+from financeflow.ledger import calendar_months
+from financeflow.planner import FinancialPlanner, NEEDS_CATEGORIES
+
+def _planner():
+    planner = FinancialPlanner()
+    planner.income = 4_000_000.0
+    planner.needs = {'rent': 1_000_000.0, 'groceries': 600_000.0}
+    planner.wants = {'dining': 200_000.0}
+    return planner
+
+def test_rent_steps_only_on_contract_anniversaries():
+    # El contrato empieza en mayo: el arriendo no cambia en enero, sí a los 12 y 24 meses
+    forecast = forecast_budget(_planner(), years=3, start=datetime(2025, 5, 10))
+    rent = price_factors(NEEDS_CATEGORIES, 36)[0, :, NEEDS_CATEGORIES.index('rent')]
+
+    steps = np.flatnonzero(np.diff(rent)) + 1
+    np.testing.assert_array_equal(steps, [12, 24])
+    assert str(forecast['month'][12]) == '2026-05'
+    assert rent[12] / rent[11] == pytest.approx(1 + CATEGORY_INFLATION['rent'])
+    assert (rent[:12] == 1).all()
+
+    groceries = price_factors(NEEDS_CATEGORIES, 36)[0, :, NEEDS_CATEGORIES.index('groceries')]
+    assert (np.diff(groceries) > 0).all()
+    assert groceries[12] == pytest.approx(1 + CATEGORY_INFLATION['groceries'])
+
+    # La variación de necesidades en los aniversarios incluye el salto del arriendo
+    needs = forecast['needs_total'][0]
+    monthly_groceries = 600_000.0 * np.diff(groceries)
+    np.testing.assert_allclose(np.diff(needs) - monthly_groceries,
+                               np.where(np.arange(1, 36) % 12 == 0, 1_000_000.0 * np.diff(rent), 0), atol=1e-6)
+
+def test_minimum_wage_steps_each_january():
+    months = calendar_months(datetime(2025, 10, 1), 16)
+    wage = minimum_wage(months)
+
+    np.testing.assert_array_equal(wage[:3], MINIMUM_WAGE)
+    np.testing.assert_allclose(wage[3:15], MINIMUM_WAGE * 1.07)
+    assert str(months[15]) == '2027-01'
+    assert wage[15] == pytest.approx(MINIMUM_WAGE * 1.07 ** 2)
+
+def test_income_indexed_to_minimum_wage_and_salary_raises():
+    start = datetime(2025, 11, 1)
+    indexed = forecast_budget(_planner(), years=1, start=start, index_to_minimum_wage=True,
+                              minimum_wage_growth=[0.05, 0.1])
+    np.testing.assert_allclose(indexed['income'][:, :2], 4_000_000.0)
+    np.testing.assert_allclose(indexed['income'][:, 2:], np.repeat([[4_200_000.0], [4_400_000.0]], 10, axis=1))
+
+    raised = forecast_budget(_planner(), years=2, start=start, salary_growth=0.04)
+    years = np.array([str(month)[:4] for month in raised['month']]).astype(int) - 2025
+    np.testing.assert_allclose(raised['income'][0], 4_000_000.0 * 1.04 ** years)
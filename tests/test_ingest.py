@@ -0,0 +1,43 @@
+"""Escritura por bloques cuando el tipo de una columna cambia entre bloques."""
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from financeflow.ingest import ResultWriter, run_pipeline
+
+def test_parquet_writer_conforms_drifting_chunks(tmp_path, drifting_chunks):
+    path = tmp_path / 'out.parquet'
+    with ResultWriter(path) as writer:
+        for chunk in drifting_chunks:
+            writer.write(chunk)
+
+    table = pq.read_table(path)
+    assert writer.rows == table.num_rows == 6
+    assert table.column('household_id').to_pylist() == [1, 2, 3, None, 5, 6]
+    assert table.column('city').to_pylist() == ['Cali', 'Bogotá', None, None, None, 'Pasto']
+    assert table.column('note').to_pylist() == [None, None, 'a', None, 'b', 'c']
+
+def test_parquet_writer_names_incompatible_column(tmp_path):
+    with ResultWriter(tmp_path / 'out.parquet') as writer:
+        writer.write(pd.DataFrame({'code': [1, 2], 'income': [1.0, 2.0]}))
+        with pytest.raises(ValueError, match="'code'"):
+            writer.write(pd.DataFrame({'code': ['x', 'y'], 'income': [1.0, 2.0]}))
+
+@pytest.mark.parametrize('output', ['out.parquet', 'out.arrow', 'out.csv'])
+def test_pipeline_small_chunks(tmp_path, output):
+    # Ids con un vacío en un solo bloque, como el caso de `plan in.csv out.parquet --chunksize 50`
+    n = 230
+    frame = pd.DataFrame({
+        'household_id': pd.array(np.arange(n), dtype='Int64'),
+        'segment': ['a'] * 50 + [None] * 50 + ['b'] * 130,
+        'income': np.full(n, 3_000_000.0),
+        'rent': np.full(n, 1_200_000.0),
+    })
+    frame.loc[120, 'household_id'] = None
+    source = tmp_path / 'in.csv'
+    frame.to_csv(source, index=False)
+
+    summary = run_pipeline(source, tmp_path / output, chunksize=50)
+    assert summary['rows'] == n
+    assert summary['chunks'] == 5
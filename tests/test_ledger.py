@@ -0,0 +1,53 @@
+"""Meses de calendario y libro de flujo de caja."""
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from financeflow.ledger import calendar_months, cash_flow_ledger
+from financeflow.purchases import add_months, target_date
+
+@pytest.mark.parametrize('start, months, expected', [
+    (datetime(2025, 1, 31), 1, datetime(2025, 2, 28)),
+    (datetime(2024, 1, 31), 1, datetime(2024, 2, 29)),
+    (datetime(2024, 2, 29), 12, datetime(2025, 2, 28)),
+    (datetime(2024, 2, 29), 48, datetime(2028, 2, 29)),
+    (datetime(2025, 3, 31), 1, datetime(2025, 4, 30)),
+    (datetime(2025, 8, 31), 4, datetime(2025, 12, 31)),
+    (datetime(2025, 11, 30), 3, datetime(2026, 2, 28)),
+    (datetime(2025, 12, 15), 1, datetime(2026, 1, 15)),
+    (datetime(2025, 5, 31), 0, datetime(2025, 5, 31)),
+    (datetime(2025, 5, 31), 120, datetime(2035, 5, 31)),
+])
+def test_add_months_clamps_to_month_end(start, months, expected):
+    assert add_months(start, months) == expected
+
+def test_add_months_keeps_time_of_day():
+    assert add_months(datetime(2023, 12, 31, 18, 30), 2) == datetime(2024, 2, 29, 18, 30)
+    assert target_date(2, datetime(2023, 12, 31)) == datetime(2024, 2, 29)
+
+def test_calendar_months_cross_years():
+    months = calendar_months(datetime(2023, 11, 30), 5)
+    assert months.dtype == np.dtype('datetime64[M]')
+    assert [str(month) for month in months] == ['2023-11', '2023-12', '2024-01', '2024-02', '2024-03']
+    # Con cualquier día del mes de inicio el calendario es el mismo
+    np.testing.assert_array_equal(calendar_months(datetime(2024, 2, 29), 13), calendar_months('2024-02', 13))
+    assert str(calendar_months(datetime(2024, 2, 29), 13)[-1]) == '2025-02'
+
+def test_calendar_months_match_add_months():
+    start = datetime(2024, 1, 31)
+    months = calendar_months(start, 30)
+    expected = [np.datetime64(add_months(start, k), 'M') for k in range(30)]
+    np.testing.assert_array_equal(months, expected)
+
+def test_ledger_balances_accumulate_flows():
+    ledger = cash_flow_ledger(3_000_000.0, 1_500_000.0, 600_000.0, savings=400_000.0, months=6,
+                              start=datetime(2024, 12, 1), purchase_contributions=200_000.0,
+                              purchases={'price': [500_000.0], 'month': [2]},
+                              loans={'principal': [1_200_000.0], 'annual_rate': [0.0], 'months': [3],
+                                     'start_month': [1]})
+    assert str(ledger['month'][0]) == '2024-12' and str(ledger['month'][1]) == '2025-01'
+    np.testing.assert_array_equal(ledger['loan_payment'], [0, 400_000, 400_000, 400_000, 0, 0])
+    np.testing.assert_array_equal(ledger['net'], 300_000.0 - ledger['loan_payment'])
+    np.testing.assert_array_equal(ledger['cash_balance'], np.cumsum(ledger['net']))
+    np.testing.assert_array_equal(ledger['purchase_fund'], [200_000, 400_000, 100_000, 300_000, 500_000, 700_000])
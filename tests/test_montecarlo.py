@@ -0,0 +1,35 @@
+"""Proyección Monte Carlo frente a la esperanza analítica y con varios procesos."""
+import numpy as np
+
+from financeflow.montecarlo import PATH_BLOCK, project, simulate_portfolio
+
+def expected_wealth(mean, contribution, years):
+    # Aporte al inicio de cada mes y crecimiento mensual esperado g = (1 + media)^(1/12)
+    growth = (1 + mean) ** (1 / 12)
+    months = np.arange(int(years) + 1) * 12
+    return contribution * growth * (growth ** months - 1) / (growth - 1)
+
+def test_antithetic_mean_matches_expectation():
+    allocations = [(0.10, 0.25, 500_000.0, 0.0), (0.06, 0.01, 100_000.0, 0.0)]
+    result = project(allocations, 10, paths=20_000, seed=11)
+    expected = expected_wealth(0.10, 500_000.0, 10) + expected_wealth(0.06, 100_000.0, 10)
+
+    np.testing.assert_allclose(result['mean'], expected, rtol=0.01)
+    np.testing.assert_allclose(result['contributed'], 12 * 600_000.0 * np.arange(11))
+    bands = np.array([result['percentiles'][q] for q in (5, 25, 50, 75, 95)])
+    assert (np.diff(bands[:, 1:], axis=0) > 0).all()
+
+def test_without_volatility_is_deterministic():
+    wealth = simulate_portfolio([(0.08, 0.0, 200_000.0, 1_000_000.0)], 5, paths=101)
+    expected = expected_wealth(0.08, 200_000.0, 5) + 1_000_000.0 * 1.08 ** np.arange(6)
+    np.testing.assert_allclose(wealth, np.repeat(expected[:, None], 101, axis=1), rtol=1e-5)
+
+def test_workers_give_the_same_paths():
+    allocations = [(0.12, 0.18, 300_000.0, 50_000.0)]
+    paths = 3 * PATH_BLOCK + 17
+    serial = simulate_portfolio(allocations, 3, paths, seed=5)
+
+    assert serial.shape == (4, paths)
+    np.testing.assert_array_equal(simulate_portfolio(allocations, 3, paths, seed=5, workers=2), serial)
+    np.testing.assert_array_equal(simulate_portfolio(allocations, 3, paths, seed=5, workers=4), serial)
+    assert not np.array_equal(simulate_portfolio(allocations, 3, paths, seed=6), serial)
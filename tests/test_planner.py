@@ -0,0 +1,37 @@
+"""Total de CategoryVector frente a NaN, cancelaciones y muchas actualizaciones."""
+import math
+import random
+
+from financeflow.planner import NEEDS_CATEGORIES, CategoryVector
+
+def test_total_recovers_after_nan():
+    vector = CategoryVector(NEEDS_CATEGORIES, {'rent': 1_000_000, 'utilities': 200_000})
+    vector['groceries'] = float('nan')
+    assert math.isnan(vector.total())
+    vector['groceries'] = 300_000
+    assert vector.total() == 1_500_000
+
+def test_total_survives_cancellation():
+    vector = CategoryVector(NEEDS_CATEGORIES, {'utilities': 3})
+    vector['rent'] = 1e17
+    assert vector.total() == 1e17 + 3
+    vector['rent'] = 0
+    assert vector.total() == 3
+
+def test_total_has_no_residual_after_many_updates():
+    rng = random.Random(5)
+    vector = CategoryVector(NEEDS_CATEGORIES)
+    for _ in range(100_000):
+        vector[rng.choice(NEEDS_CATEGORIES)] = rng.uniform(0, 5_000_000) * rng.choice((1, 0.1, 1e-3))
+        vector.total()
+    for category in NEEDS_CATEGORIES:
+        vector[category] = 0.1
+    assert vector.total() == CategoryVector(NEEDS_CATEGORIES, dict.fromkeys(NEEDS_CATEGORIES, 0.1)).total()
+
+def test_total_follows_version():
+    vector = CategoryVector(NEEDS_CATEGORIES, {'rent': 10})
+    assert vector.total() == 10
+    vector.clear()
+    assert vector.total() == 0
+    vector.update({'rent': 4, 'pets': 6})
+    assert vector.total() == 10
@@ -0,0 +1,63 @@
+"""Percentiles, ventana y exportación del perfilador."""
+import json
+import math
+
+import pytest
+
+from financeflow.profiling import Profiler
+
+def test_nearest_rank_percentiles():
+    profiler = Profiler(enabled=True)
+    # 1..100 ms en desorden: el rango más cercano da exactamente p50 = 50, p95 = 95, p99 = 99
+    for ms in range(100, 0, -1):
+        profiler.record('render', ms / 1000)
+    stats = profiler.snapshot()['sections']['render']
+
+    assert stats['count'] == 100
+    assert stats['p50_ms'] == pytest.approx(50)
+    assert stats['p95_ms'] == pytest.approx(95)
+    assert stats['p99_ms'] == pytest.approx(99)
+    assert stats['max_ms'] == pytest.approx(100)
+    assert stats['total_ms'] == pytest.approx(5050)
+    assert stats['mean_ms'] == pytest.approx(50.5)
+
+def test_percentiles_use_the_window_and_totals_the_history():
+    profiler = Profiler(enabled=True, window=3)
+    for ms in (1000, 1, 2, 3):
+        profiler.record('query', ms / 1000)
+    stats = profiler.snapshot()['sections']['query']
+
+    assert stats['count'] == 4 and stats['total_ms'] == pytest.approx(1006)
+    assert stats['max_ms'] == pytest.approx(3)
+    assert stats['p50_ms'] == pytest.approx(2)
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler.section('render'):
+        pass
+    profiler.count('rerun')
+    assert profiler.snapshot() == {'sections': {}, 'counters': {}}
+
+def test_prometheus_text_format():
+    profiler = Profiler(enabled=True)
+    profiler.record('ui."tab"\n1', 0.002)
+    profiler.record('ui."tab"\n1', 0.004)
+    profiler.count('cache_hit', 3)
+    lines = profiler.to_prometheus().splitlines()
+
+    assert lines[:2] == ['# HELP financeflow_section_seconds Duración de las secciones instrumentadas.',
+                         '# TYPE financeflow_section_seconds summary']
+    label = 'section="ui.\\"tab\\"\\n1"'
+    assert f'financeflow_section_seconds{{{label},quantile="0.5"}} 0.002' in lines
+    assert f'financeflow_section_seconds{{{label},quantile="0.99"}} 0.004' in lines
+    assert f'financeflow_section_seconds_sum{{{label}}} 0.006' in lines
+    assert f'financeflow_section_seconds_count{{{label}}} 2' in lines
+    assert '# TYPE financeflow_events_total counter' in lines
+    assert lines[-1] == 'financeflow_events_total{event="cache_hit"} 3'
+
+def test_json_export_matches_snapshot():
+    profiler = Profiler(enabled=True)
+    profiler.record('render', 0.01)
+    exported = json.loads(profiler.to_json())
+    assert exported['sections']['render']['count'] == 1
+    assert math.isclose(exported['sections']['render']['p95_ms'], 10)
@@ -0,0 +1,47 @@
+"""Escenarios vectorizados frente al planificador y purchase_plan escalares."""
+import math
+
+import numpy as np
+
+from financeflow.planner import FinancialPlanner
+from financeflow.purchases import purchase_plan
+from financeflow.scenarios import evaluate_scenarios, scenario_grid, scenario_inputs
+
+def _planner(income, rent):
+    planner = FinancialPlanner()
+    planner.income = income
+    planner.needs = {'rent': rent, 'utilities': 250_000.0}
+    planner.wants = {'entertainment': 150_000.0}
+    return planner
+
+def test_scenario_grid_matches_scalar_plans():
+    base = scenario_inputs(_planner(4_000_000.0, 1_200_000.0), item_price=2_500_000.0, annual_rate=0.24,
+                           max_loan_months=12)
+    scenarios = evaluate_scenarios(scenario_grid(
+        base, income=[3_000_000.0, 4_000_000.0, 5_500_000.0], rent=[900_000.0, 1_200_000.0, 1_900_000.0],
+        save_percentage=[0.1, 0.5, 1.0]))
+    assert len(scenarios) == 27
+
+    for row in scenarios.itertuples():
+        planner = _planner(row.income, row.rent)
+        risk = planner.get_risk_analysis()
+        assert row.risk_level == risk['level']
+        assert row.needs_total == planner.calculate_needs_total()
+        assert row.remaining_income == planner.calculate_remaining_income()
+
+        available_wants = planner.calculate_percentages()['wants_budget'] - planner.calculate_wants_total()
+        plan = purchase_plan(row.item_price, available_wants, row.save_percentage, 0.24, 12)
+        assert row.months_needed == plan['savings']['plan_months']
+        assert math.isclose(row.monthly_save, plan['savings']['plan_monthly_save'])
+        assert row.loan_months == plan['loan']['loan_months']
+        assert math.isclose(row.loan_monthly_payment, plan['loan']['monthly_payment'])
+        assert math.isclose(row.loan_total_interest, plan['loan']['total_interest'])
+
+def test_scenarios_without_purchase_have_no_nan():
+    base = scenario_inputs(_planner(4_000_000.0, 1_200_000.0))
+    scenarios = evaluate_scenarios(scenario_grid(base, save_percentage=[0.3, 1.0]))
+
+    assert (scenarios['monthly_save'] == 0).all()
+    assert (scenarios['months_needed'] == 0).all()
+    assert scenarios[['loan_months', 'loan_monthly_payment', 'loan_total_interest']].isna().all().all()
+    assert not scenarios.drop(columns=['loan_months', 'loan_monthly_payment', 'loan_total_interest']).isna().any().any()
@@ -0,0 +1,77 @@
+"""Calendario de varias compras: orden por prioridad y fecha límite, atrasos y horizonte."""
+from datetime import date
+
+import numpy as np
+
+from financeflow.scheduler import MAX_HORIZON, months_until, schedule_goals, schedule_plans
+
+def test_orders_by_priority_then_deadline():
+    schedule = schedule_goals(
+        price=[300, 200, 100, 400],
+        budget=100,
+        priority=[1, 0, 0, 0],
+        deadline=[3, 8, 2, np.inf])
+    assert schedule['order'].tolist() == [2, 1, 3, 0]
+    # Completa cuando el presupuesto acumulado cubre las metas anteriores más la suya
+    assert schedule['completion_month'].tolist() == [10, 3, 1, 7]
+    assert schedule['horizon'] == 10
+    allocation = schedule['allocation']
+    np.testing.assert_array_equal(allocation.sum(axis=1), [300, 200, 100, 400])
+    np.testing.assert_array_equal(schedule['monthly_total'], np.full(10, 100))
+    # Cada mes el presupuesto va completo a la primera meta pendiente
+    assert allocation[:, 0].tolist() == [0, 0, 100, 0]
+    assert allocation[:, 1].tolist() == [0, 100, 0, 0]
+
+def test_splits_a_month_between_consecutive_goals():
+    schedule = schedule_goals([150, 100], budget=100)
+    assert schedule['completion_month'].tolist() == [2, 3]
+    assert schedule['allocation'].tolist() == [[100, 50, 0], [0, 50, 50]]
+
+def test_deadline_misses_and_saved_goals():
+    schedule = schedule_goals(
+        price=[500, 300, 200],
+        budget=100,
+        deadline=[4, 1, 10],
+        saved=[0, 300, 0])
+    # La meta ya pagada cierra en el mes 0 y no recibe aportes
+    assert schedule['completion_month'].tolist() == [5, 0, 7]
+    assert schedule['late'].tolist() == [True, False, False]
+    assert schedule['allocation'][1].sum() == 0
+
+def test_horizon_truncation():
+    # Sin presupuesto nada se completa: el calendario se corta en MAX_HORIZON
+    schedule = schedule_goals([100, 200], budget=0, deadline=[12, 24])
+    assert schedule['horizon'] == MAX_HORIZON
+    assert np.isinf(schedule['completion_month']).all()
+    assert schedule['late'].all()
+
+    # Un horizonte fijo corta las metas que terminan después
+    schedule = schedule_goals([100, 200, 300], budget=50, horizon=4)
+    assert schedule['allocation'].shape == (3, 4)
+    assert schedule['completion_month'].tolist() == [2, np.inf, np.inf]
+    assert schedule['allocation'].sum() == 200
+
+    # Un presupuesto demasiado pequeño tampoco pasa de MAX_HORIZON
+    schedule = schedule_goals([1_000_000], budget=1)
+    assert schedule['horizon'] == MAX_HORIZON
+    assert np.isinf(schedule['completion_month'][0])
+
+def test_budget_per_month_repeats_last_value():
+    schedule = schedule_goals([400], budget=[50, 50, 100])
+    assert schedule['horizon'] == 5
+    assert schedule['allocation'][0].tolist() == [50, 50, 100, 100, 100]
+
+def test_months_until_respects_day_of_month():
+    start = date(2026, 1, 31)
+    assert months_until('2026-02-28', start) == 0
+    assert months_until('2026-03-31', start) == 2
+    assert months_until(date(2025, 12, 1), start) == 0
+
+def test_schedule_plans_uses_target_dates():
+    plans = {'price': [1_000, 1_000], 'priority': [0, 0], 'saved': [0, 0],
+             'target_date': ['2026-06-15', '2026-03-15']}
+    schedule = schedule_plans(plans, 500, start=date(2026, 1, 15))
+    assert schedule['deadline_month'].tolist() == [5, 2]
+    assert schedule['order'].tolist() == [1, 0]
+    assert schedule['completion_month'].tolist() == [4, 2]
+    assert not schedule['late'].any()
@@ -0,0 +1,76 @@
+"""Persistencia SQLite del planificador y las compras planificadas."""
+from datetime import date
+
+import pytest
+
+from financeflow import FinancialPlanner
+from financeflow.store import PlanStore, account_key
+
+@pytest.fixture
+def store(tmp_path):
+    store = PlanStore(str(tmp_path / 'financeflow.db'))
+    yield store
+    store.close()
+
+def test_planner_round_trip(store):
+    planner = FinancialPlanner()
+    planner.income = 4_500_000
+    planner.needs = {'rent': 1_300_000, 'groceries': 650_000.5}
+    planner.wants = {'travel': 200_000}
+    planner.family_info = {'has_pets': True, 'num_pets': 2}
+    store.save_planner('ana', planner)
+
+    loaded = store.load_planner('ana')
+    assert loaded.income == 4_500_000 and isinstance(loaded.income, int)
+    assert loaded.needs == planner.needs
+    assert loaded.wants == planner.wants
+    assert loaded.family_info == planner.family_info
+    assert store.load_planner('otra') is None
+
+def test_bulk_insert_orders_by_priority_and_target_date(store):
+    store.add_plans([
+        ('ana', 'Viaje', 3_000_000, 250_000, 0, 'Baja', '2026-03-01'),
+        ('ana', 'Laptop', 5_000_000, 500_000, 0, 'Alta', date(2026, 9, 1)),
+        ('ana', 'Nevera', 2_000_000, 400_000, 0, 'Alta', '2026-05-01'),
+        ('bruno', 'Moto', 8_000_000, 600_000, 0, 'Alta', '2026-01-01'),
+        ('ana', 'Sofá', 1_500_000, 300_000, 0, 'Media', '2026-02-01'),
+    ])
+    assert store.count_plans() == 5
+    assert store.count_plans('ana') == 4
+
+    plans = store.load_plans('ana')
+    assert plans['product'] == ['Nevera', 'Laptop', 'Sofá', 'Viaje']
+    assert plans['priority'] == [0, 0, 1, 2]
+    assert plans['target_date'] == ['2026-05-01', '2026-09-01', '2026-02-01', '2026-03-01']
+
+def test_plans_query_uses_user_index(store):
+    with store._connection() as connection:
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM purchase_plans WHERE user_id = ? ORDER BY priority, target_date",
+            ('ana',)).fetchall()
+    detail = ' '.join(row[-1] for row in plan)
+    assert 'idx_plans_user_priority_target' in detail
+    assert 'TEMP B-TREE' not in detail
+
+def test_contributions_stay_within_price(store):
+    plan_id = store.add_plan('ana', 'TV', 2_000_000, 500_000, 'Media', '2026-06-01')
+    assert store.add_contribution('ana', plan_id, 1_500_000)
+    assert store.add_contribution('ana', plan_id, 1_500_000)
+    assert store.load_plans('ana')['saved'] == [2_000_000]
+    assert store.add_contribution('ana', plan_id, -3_000_000)
+    assert store.load_plans('ana')['saved'] == [0]
+    # Otro usuario no puede tocar la compra
+    assert not store.add_contribution('bruno', plan_id, 100)
+
+    frame = store.load_plans_frame('ana')
+    assert frame['Meses Restantes'].tolist() == [4]
+    assert frame['Progreso'].tolist() == [0]
+
+def test_account_key_depends_on_name_and_secret():
+    key = account_key('ana', 'clave-larga')
+    assert key == account_key('ana', 'clave-larga')
+    assert key != account_key('ana', 'otra-clave')
+    assert key != account_key('anna', 'clave-larga')
+    assert 'ana' not in key
+    with pytest.raises(ValueError):
+        account_key('ana', 'corta')